@@ -1,32 +1,10 @@
+import sys
 import yfinance as yf
 import pandas as pd
 import json
 import os
-
-# Collect Barrick Gold data with correct symbol
-ticker = yf.Ticker('ABX.TO')
-
-print("Collecting Barrick Gold (ABX) data...")
-
-# Historical prices
-hist_5y = ticker.history(period='5y')
-print(f"Price data range: {hist_5y.index[0]} to {hist_5y.index[-1]}")
-print(f"Latest price: ${hist_5y['Close'].iloc[-1]:.2f}")
-
-# Company info
-info = ticker.info
-
-# Financial statements
-try:
-    financials = ticker.financials
-    balance_sheet = ticker.balance_sheet
-    cashflow = ticker.cashflow
-    print("Financial statements collected successfully")
-except Exception as e:
-    print(f"Error collecting financials: {e}")
-
-# Save data
-hist_5y.to_csv('data/raw/abx_daily_prices.csv')
+from src.price_history import update_price_history
+from src.universe import company_name, info_dataset, price_dataset
 
 # Save company info with proper JSON handling
 def json_serializer(obj):
@@ -37,11 +15,45 @@ def json_serializer(obj):
     else:
         return str(obj)
 
-with open('data/raw/abx_company_info.json', 'w') as f:
-    json.dump(info, f, indent=2, default=json_serializer)
-
-print("Data collection completed!")
-print(f"Company: {info.get('longName', 'N/A')}")
-print(f"Sector: {info.get('sector', 'N/A')}")
-print(f"Industry: {info.get('industry', 'N/A')}")
-print(f"Market Cap: ${info.get('marketCap', 0):,}")
\ No newline at end of file
+def collect_symbol(symbol: str):
+    """Collect price history and company info for one symbol into data/raw"""
+    ticker = yf.Ticker(symbol)
+
+    print(f"Collecting {company_name(symbol)} ({symbol}) data...")
+
+    # Historical prices: append new bars to the stored history, full 5 years on first run
+    def fetch_prices(start_date):
+        if start_date is None:
+            return ticker.history(period='5y')
+        return ticker.history(start=start_date.strftime('%Y-%m-%d'))
+
+    hist_5y, update_mode = update_price_history(f'data/raw/{price_dataset(symbol)}.csv', fetch_prices)
+    print(f"Price history {update_mode} update")
+    print(f"Price data range: {hist_5y.index[0]} to {hist_5y.index[-1]}")
+    print(f"Latest price: ${hist_5y['Close'].iloc[-1]:.2f}")
+
+    # Company info
+    info = ticker.info
+
+    # Financial statements
+    try:
+        financials = ticker.financials
+        balance_sheet = ticker.balance_sheet
+        cashflow = ticker.cashflow
+        print("Financial statements collected successfully")
+    except Exception as e:
+        print(f"Error collecting financials: {e}")
+
+    with open(f'data/raw/{info_dataset(symbol)}.json', 'w') as f:
+        json.dump(info, f, indent=2, default=json_serializer)
+
+    print("Data collection completed!")
+    print(f"Company: {info.get('longName', 'N/A')}")
+    print(f"Sector: {info.get('sector', 'N/A')}")
+    print(f"Industry: {info.get('industry', 'N/A')}")
+    print(f"Market Cap: ${info.get('marketCap', 0):,}")
+
+if __name__ == "__main__":
+    # Barrick Gold by default; pass symbols to collect other miners, e.g. NEM AEM K.TO
+    for symbol in sys.argv[1:] or ['ABX.TO']:
+        collect_symbol(symbol)
@@ -1,89 +1,71 @@
+import os
+import sys
+import argparse
 import yfinance as yf
 import pandas as pd
 import json
+from src.data_store import PeerPriceStore, read_json, write_peer_prices
+from src.instrumentation import instrumented
+from src.models.peer_metrics import compute_peer_metrics, stored_price_panels
+from src.peer_collector import clear_checkpoint, collect_concurrently, download_prices_batched, load_checkpoint
+from src.universe import PEER_UNIVERSE
 
 # Gold mining peer companies
-peers = {
-    'ABX.TO': 'Barrick Gold Corporation',
-    'NEM': 'Newmont Corporation', 
-    'AEM': 'Agnico Eagle Mines Limited',
-    'AEM.TO': 'Agnico Eagle Mines Limited (TSX)',
-    'KGC': 'Kinross Gold Corporation',
-    'K.TO': 'Kinross Gold Corporation (TSX)',
-    'AU': 'AngloGold Ashanti Limited',
-    'EGO': 'Eldorado Gold Corporation',
-    'FNV': 'Franco-Nevada Corporation',
-    'FNV.TO': 'Franco-Nevada Corporation (TSX)',
-    'WPM': 'Wheaton Precious Metals Corp',
-    'WPM.TO': 'Wheaton Precious Metals Corp (TSX)'
-}
-
-peer_data = {}
-print("Collecting peer group data for gold mining companies...")
-
-for symbol, company_name in peers.items():
-    try:
-        print(f"Collecting data for {symbol} - {company_name}")
-        ticker = yf.Ticker(symbol)
-        
-        # Get company info
-        info = ticker.info
-        
-        # Get price data (2 years)
-        hist = ticker.history(period='2y')
-        
-        if hist.empty:
-            print(f"  No price data for {symbol}")
+peers = PEER_UNIVERSE
+
+# Finished symbols are appended here, so an interrupted run resumes where it stopped
+CHECKPOINT_PATH = 'data/raw/peer_comparison_data.checkpoint.jsonl'
+
+# Price-derived fields of each peer entry, computed from the stored price panel
+PRICE_METRICS = ['current_price', 'year_high', 'year_low', 'returns_1m', 'returns_3m', 'returns_1y',
+                 'volatility_annualized']
+
+def download_prices(symbols):
+    """One multi-symbol request for a chunk of symbols (2 years of daily bars)"""
+    return yf.download(symbols, period='2y', group_by='ticker', auto_adjust=True, actions=False,
+                       progress=False, timeout=30)
+
+def peer_fundamentals(symbol, info):
+    """Valuation and company fields for one peer from its info"""
+    return {
+        'company_name': PEER_UNIVERSE.get(symbol, info.get('longName', symbol)),
+        'market_cap': info.get('marketCap', 0),
+        'enterprise_value': info.get('enterpriseValue', 0),
+        'pe_ratio': info.get('forwardPE', info.get('trailingPE', 0)),
+        'pb_ratio': info.get('priceToBook', 0),
+        'ps_ratio': info.get('priceToSalesTrailing12Months', 0),
+        'debt_to_equity': info.get('debtToEquity', 0),
+        'roe': info.get('returnOnEquity', 0),
+        'profit_margin': info.get('profitMargins', 0),
+        'operating_margin': info.get('operatingMargins', 0),
+        'revenue_growth': info.get('revenueGrowth', 0),
+        'earnings_growth': info.get('earningsGrowth', 0),
+        'avg_volume': info.get('averageVolume', 0),
+        'dividend_yield': info.get('dividendYield', 0),
+        'beta': info.get('beta', 0),
+        'sector': info.get('sector', ''),
+        'industry': info.get('industry', ''),
+        'country': info.get('country', ''),
+        'full_time_employees': info.get('fullTimeEmployees', 0)
+    }
+
+@instrumented('peer_metrics')
+def price_metrics(symbols):
+    """Returns, year range and volatility for every symbol, computed from the stored prices in one pass"""
+    metrics = compute_peer_metrics(**stored_price_panels('peer_comparison_data', symbols))
+    # Too little history for a return is recorded as 0, as before
+    return metrics[PRICE_METRICS].round(2).fillna({name: 0 for name in PRICE_METRICS if name.startswith('returns_')})
+
+def peer_records(fundamentals, metrics):
+    """Peer comparison entries for the symbols that have both fundamentals and prices"""
+    peer_data = {}
+    for symbol, fields in fundamentals.items():
+        if symbol not in metrics.index or pd.isna(metrics.loc[symbol, 'current_price']):
             continue
-            
-        # Calculate key metrics
-        current_price = hist['Close'].iloc[-1]
-        year_high = hist['High'].max()
-        year_low = hist['Low'].min()
-        
-        # Calculate returns
-        returns_1m = (hist['Close'].iloc[-1] / hist['Close'].iloc[-22] - 1) * 100 if len(hist) > 22 else 0
-        returns_3m = (hist['Close'].iloc[-1] / hist['Close'].iloc[-66] - 1) * 100 if len(hist) > 66 else 0
-        returns_1y = (hist['Close'].iloc[-1] / hist['Close'].iloc[-252] - 1) * 100 if len(hist) > 252 else 0
-        
-        # Calculate volatility (annualized)
-        daily_returns = hist['Close'].pct_change().dropna()
-        volatility = daily_returns.std() * (252**0.5) * 100
-        
-        peer_data[symbol] = {
-            'company_name': company_name,
-            'current_price': round(current_price, 2),
-            'market_cap': info.get('marketCap', 0),
-            'enterprise_value': info.get('enterpriseValue', 0),
-            'pe_ratio': info.get('forwardPE', info.get('trailingPE', 0)),
-            'pb_ratio': info.get('priceToBook', 0),
-            'ps_ratio': info.get('priceToSalesTrailing12Months', 0),
-            'debt_to_equity': info.get('debtToEquity', 0),
-            'roe': info.get('returnOnEquity', 0),
-            'profit_margin': info.get('profitMargins', 0),
-            'operating_margin': info.get('operatingMargins', 0),
-            'revenue_growth': info.get('revenueGrowth', 0),
-            'earnings_growth': info.get('earningsGrowth', 0),
-            'year_high': round(year_high, 2),
-            'year_low': round(year_low, 2),
-            'returns_1m': round(returns_1m, 2),
-            'returns_3m': round(returns_3m, 2),
-            'returns_1y': round(returns_1y, 2),
-            'volatility_annualized': round(volatility, 2),
-            'avg_volume': info.get('averageVolume', 0),
-            'dividend_yield': info.get('dividendYield', 0),
-            'beta': info.get('beta', 0),
-            'sector': info.get('sector', ''),
-            'industry': info.get('industry', ''),
-            'country': info.get('country', ''),
-            'full_time_employees': info.get('fullTimeEmployees', 0)
-        }
-        
-        print(f"  Successfully collected data - Market Cap: ${peer_data[symbol]['market_cap']:,}")
-        
-    except Exception as e:
-        print(f"  Error collecting {symbol}: {e}")
-        continue
+        record = dict(fields)
+        record.update({name: float(value) for name, value in metrics.loc[symbol].items()})
+        peer_data[symbol] = record
+    return peer_data
 
 # Save peer data
 def json_serializer(obj):
@@ -94,17 +76,63 @@ def json_serializer(obj):
     else:
         return str(obj)
 
-with open('data/raw/peer_comparison_data.json', 'w') as f:
-    json.dump(peer_data, f, indent=2, default=json_serializer)
+@instrumented('collect', dataset='peer_comparison_data')
+def collect_peers(symbols, max_workers=16):
+    """Collect prices and metrics for every symbol, resuming from the checkpoint if there is one"""
+    print(f"Collecting peer group data for {len(symbols)} gold mining companies...")
+    done = load_checkpoint(CHECKPOINT_PATH)
+
+    # Prices: a few multi-symbol downloads, each chunk stored as soon as it lands.
+    # yf.download keeps module-level state, so chunks run one at a time and
+    # yfinance parallelizes the symbols inside each chunk.
+    prices, missing = download_prices_batched(
+        [symbol for symbol in symbols if symbol not in done], download_prices, max_workers=1,
+        on_chunk=lambda frames: write_peer_prices('peer_comparison_data', frames, merge=True))
+    for symbol in missing:
+        print(f"  No price data for {symbol}")
+
+    # Company info: one request per symbol, many in flight at once
+    def collect_symbol(symbol):
+        fields = peer_fundamentals(symbol, yf.Ticker(symbol).info)
+        print(f"  {symbol} - {fields['company_name']}: Market Cap ${fields['market_cap']:,}")
+        return fields
+
+    fundamentals, failures = collect_concurrently(
+        [symbol for symbol in symbols if symbol in prices or symbol in done], collect_symbol,
+        max_workers=max_workers, checkpoint_path=CHECKPOINT_PATH)
+    for symbol, error in failures.items():
+        print(f"  Error collecting {symbol}: {error}")
+    return peer_records(fundamentals, price_metrics(list(fundamentals)))
+
+def recompute_from_store():
+    """Refresh the price metrics of the saved peer document from stored prices, without the network"""
+    store = PeerPriceStore('peer_comparison_data')
+    if not store.symbols or not os.path.exists('data/raw/peer_comparison_data.json'):
+        sys.exit(f"No stored peer prices in {store.directory}; run a collection first")
+    saved = read_json('peer_comparison_data')
+    return peer_records(saved, price_metrics(list(saved)))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collect gold mining peer data")
+    parser.add_argument('symbols', nargs='*', help="symbols to collect (default: the whole peer universe)")
+    parser.add_argument('--from-store', action='store_true',
+                        help="recompute price metrics from stored prices instead of downloading")
+    args = parser.parse_args()
+
+    peer_data = recompute_from_store() if args.from_store else collect_peers(args.symbols or list(peers))
+
+    with open('data/raw/peer_comparison_data.json', 'w') as f:
+        json.dump(peer_data, f, indent=2, default=json_serializer)
+    clear_checkpoint(CHECKPOINT_PATH)
 
-print(f"\nPeer data collection completed! Collected data for {len(peer_data)} companies.")
-print("Data saved to data/raw/peer_comparison_data.json")
+    print(f"\nPeer data collection completed! Collected data for {len(peer_data)} companies.")
+    print("Data saved to data/raw/peer_comparison_data.json")
 
-# Quick summary
-print("\n=== PEER GROUP SUMMARY ===")
-for symbol, data in peer_data.items():
-    print(f"{symbol}: {data['company_name']}")
-    print(f"  Market Cap: ${data['market_cap']:,}")
-    print(f"  P/E Ratio: {data['pe_ratio']}")
-    print(f"  1Y Return: {data['returns_1y']}%")
-    print()
\ No newline at end of file
+    # Quick summary
+    print("\n=== PEER GROUP SUMMARY ===")
+    for symbol, data in peer_data.items():
+        print(f"{symbol}: {data['company_name']}")
+        print(f"  Market Cap: ${data['market_cap']:,}")
+        print(f"  P/E Ratio: {data['pe_ratio']}")
+        print(f"  1Y Return: {data['returns_1y']}%")
+        print()
@@ -0,0 +1,197 @@
+"""
+Investment memos and charts for a whole ticker universe
+
+Each symbol's analysis, memo, HTML charts and PNG figures are built in a
+worker process and written to their own directory (reports/universe/NEM/...).
+A manifest next to the outputs records a fingerprint of the inputs the
+reports were built from, so an interrupted or repeated run skips symbols
+whose price history, company info and peer data have not changed.
+
+Usage:
+    python generate_batch_reports.py                      # every symbol in the peer universe
+    python generate_batch_reports.py NEM AEM KGC --workers 4
+    python generate_batch_reports.py ABX.TO --force       # rebuild even if up to date
+
+Symbols need collected data first: python collect_abx_data.py NEM AEM KGC
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.data_loader import load_json, _file_hash
+from src.data_store import _raw_path, _store_path
+from src.models.financial_models import FinancialAnalysisEngine, symbol_datasets
+from src.universe import PEER_UNIVERSE, company_name
+
+DEFAULT_OUTPUT_DIR = 'reports/universe'
+MANIFEST = 'manifest.json'
+
+# Bump when the report templates change so every symbol is rebuilt
+REPORT_VERSION = 2
+
+def input_files(symbol: str) -> Dict[str, Optional[str]]:
+    """Source file of each dataset a symbol's reports read (None when not collected)"""
+    price, info, peers = symbol_datasets(symbol)
+    candidates = {
+        price: [_raw_path(price, 'csv'), _store_path(price)],
+        info: [_raw_path(info, 'json')],
+        peers: [_raw_path(peers, 'json')],
+    }
+    return {name: next((p for p in paths if os.path.exists(p)), None) for name, paths in candidates.items()}
+
+def input_fingerprint(files: Dict[str, str]) -> str:
+    digest = hashlib.sha256(f"v{REPORT_VERSION};".encode())
+    for name in sorted(files):
+        digest.update(f"{name}:{_file_hash(files[name])};".encode())
+    return digest.hexdigest()
+
+def symbol_dir(output_dir: str, symbol: str) -> str:
+    return os.path.join(output_dir, symbol)
+
+def read_manifest(directory: str) -> Dict[str, Any]:
+    try:
+        with open(os.path.join(directory, MANIFEST), 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def write_manifest(directory: str, manifest: Dict[str, Any]):
+    """Write the manifest atomically, so an interrupted run never leaves a partial one"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, MANIFEST)
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump(manifest, f, indent=2, default=str)
+    os.replace(f"{path}.tmp", path)
+
+def build_reports(symbol: str, directory: str) -> Dict[str, Any]:
+    """Analysis, memo, HTML charts and PNG figures for one symbol (runs in a worker)"""
+    # Imported here so the parent only loads the plotting stack when it builds in-process
+    from generate_investment_memo import InvestmentMemoGenerator
+    from create_png_visualizations import ProfessionalVisualizationEngine
+    from src.visualization.charts import ProfessionalChartEngine
+
+    os.makedirs(directory, exist_ok=True)
+    timings = {}
+    with open(os.path.join(directory, 'build.log'), 'w') as log, contextlib.redirect_stdout(log):
+        start = time.perf_counter()
+        analyzer = FinancialAnalysisEngine(symbol, company_name(symbol))
+        if analyzer.data_version is None:
+            raise RuntimeError(f"could not load data for {symbol}")
+        thesis = analyzer.generate_investment_thesis()
+        timings['analysis'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        memo = InvestmentMemoGenerator(analyzer, directory)
+        memo.generate_comprehensive_memo()
+        memo.generate_executive_summary()
+        timings['memo'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        charts = ProfessionalChartEngine(symbol, directory)
+        charts.create_comprehensive_dashboard()
+        charts.create_executive_summary_chart()
+        charts.create_peer_benchmark_analysis()
+        charts.create_dcf_sensitivity_heatmap(analyzer)
+        timings['charts'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        # The thesis target and rating, so the figures agree with the memo and manifest
+        figures = ProfessionalVisualizationEngine(
+            symbol, directory, dcf_target=thesis['price_target'], recommendation=thesis['recommendation'])
+        figures.render_figures(workers=1)
+        timings['figures'] = time.perf_counter() - start
+
+    return {
+        'recommendation': thesis['recommendation'],
+        'price_target': thesis['price_target'],
+        'timings': timings,
+        'outputs': sorted(f for f in os.listdir(directory) if f != MANIFEST),
+    }
+
+def _pool_context():
+    # Forked workers inherit the peer dataset the parent already parsed
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+def run_batch(symbols: List[str], output_dir: str = DEFAULT_OUTPUT_DIR, workers: Optional[int] = None,
+              force: bool = False) -> Dict[str, Dict[str, Any]]:
+    """Build reports for every symbol whose inputs changed; returns each symbol's manifest"""
+    results, pending = {}, {}
+    for symbol in symbols:
+        directory = symbol_dir(output_dir, symbol)
+        files = input_files(symbol)
+        missing = [name for name, path in files.items() if path is None]
+        if missing:
+            results[symbol] = {'symbol': symbol, 'status': 'missing', 'missing': missing}
+            continue
+
+        fingerprint = input_fingerprint(files)
+        manifest = read_manifest(directory)
+        if not force and manifest.get('status') == 'complete' and manifest.get('inputs') == fingerprint:
+            results[symbol] = dict(manifest, status='unchanged')
+            continue
+        pending[symbol] = (directory, fingerprint)
+
+    if pending:
+        load_json('peer_comparison_data')
+        workers = max(1, min(workers or os.cpu_count() or 1, len(pending)))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+            futures = {pool.submit(build_reports, symbol, directory): symbol
+                       for symbol, (directory, _) in pending.items()}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                directory, fingerprint = pending[symbol]
+                manifest = {'symbol': symbol, 'inputs': fingerprint,
+                            'built_at': datetime.now().isoformat(timespec='seconds')}
+                try:
+                    manifest.update(future.result(), status='complete')
+                except Exception as e:
+                    manifest.update(status='failed', error=f"{type(e).__name__}: {e}")
+                write_manifest(directory, manifest)
+                results[symbol] = manifest
+                print(f"  {symbol}: {manifest['status']}")
+    return {symbol: results[symbol] for symbol in symbols}
+
+def _summary_line(symbol: str, result: Dict[str, Any]) -> str:
+    status = result['status']
+    if status == 'missing':
+        return f"{symbol:<8} missing data ({', '.join(result['missing'])})"
+    if status == 'failed':
+        return f"{symbol:<8} failed: {result['error']}"
+    total = sum(result.get('timings', {}).values())
+    return (f"{symbol:<8} {status:<9} {result.get('recommendation', ''):<12} "
+            f"target ${result.get('price_target', 0):.2f}  {total:.1f}s")
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('symbols', nargs='*', help='symbols to report on (default: the peer universe)')
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--force', action='store_true', help='rebuild symbols whose inputs are unchanged')
+    args = parser.parse_args(argv)
+
+    symbols = args.symbols or list(PEER_UNIVERSE)
+    print(f"Building reports for {len(symbols)} symbols into {args.output_dir}...")
+    start = time.perf_counter()
+    results = run_batch(symbols, args.output_dir, args.workers, args.force)
+
+    print(f"\nBatch completed in {time.perf_counter() - start:.1f}s")
+    for symbol, result in results.items():
+        print(_summary_line(symbol, result))
+    missing = [s for s, r in results.items() if r['status'] == 'missing']
+    if missing:
+        print(f"\nCollect missing data with: python collect_abx_data.py {' '.join(missing)}")
+    return 1 if any(r['status'] == 'failed' for r in results.values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,29 +1,92 @@
-import json
+import os
 import pandas as pd
 from datetime import datetime
+from typing import Optional
+from src.models.dcf import PARAMETER_LABELS
 from src.models.financial_models import FinancialAnalysisEngine
+from src.data_loader import load_json
+from src.instrumentation import instrumented
+from src.universe import peer_group, short_name
+
+# Company-specific memo text; other symbols get a profile from their collected company info
+COMPANY_PROFILES = {
+    'ABX.TO': {
+        'listing': 'NYSE: ABX, TSX: ABX.TO',
+        'summary_listing': 'ABX.TO (TSX) / ABX (NYSE)',
+        'overview': """Barrick Gold Corporation is a leading international gold mining company with operations across multiple continents. The company operates high-quality, long-life assets with a focus on responsible mining practices.
+
+### Business Segments:
+- **Gold Mining Operations**: Primary revenue driver with diversified geographical exposure
+- **Copper Operations**: Complementary revenue stream providing portfolio diversification
+- **Exploration & Development**: Ongoing investment in future growth opportunities""",
+    },
+}
 
 class InvestmentMemoGenerator:
     """Generate professional investment memo and analysis report"""
     
-    def __init__(self):
-        self.analyzer = FinancialAnalysisEngine()
+    def __init__(self, analyzer: Optional[FinancialAnalysisEngine] = None, output_dir: str = 'reports'):
+        self.analyzer = analyzer or FinancialAnalysisEngine()
+        self.output_dir = output_dir
+        self.stage_cache = []
         
+    @property
+    def profile(self):
+        """Listing and overview text for the analyzed company"""
+        symbol = self.analyzer.symbol
+        if symbol in COMPANY_PROFILES:
+            return COMPANY_PROFILES[symbol]
+        info = self.analyzer.company_info
+        overview = info.get('longBusinessSummary') or (
+            f"{self.analyzer.company_name} operates in the {info.get('industry', 'gold mining')} industry"
+            f"{' and is based in ' + info['country'] if info.get('country') else ''}."
+        )
+        return {'listing': symbol, 'summary_listing': symbol, 'overview': overview}
+        
+    def _output_path(self, filename: str) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        return os.path.join(self.output_dir, filename)
+        
+    def _sensitivity_table(self, grid) -> str:
+        """Markdown table of DCF value per share, rows and columns from a 2-D sensitivity grid"""
+        row_param, col_param = grid['parameters']
+        columns = grid['axes'][col_param]
+        lines = [f"| {PARAMETER_LABELS[row_param]} vs {PARAMETER_LABELS[col_param]} | " + " | ".join(f"{c*100:.1f}%" for c in columns) + " |",
+                 "|" + "---|" * (len(columns) + 1)]
+        for value, row in zip(grid['axes'][row_param], grid['values']):
+            cells = " | ".join(f"${v:.2f}" if v == v else "n/a" for v in row)
+            lines.append(f"| **{value*100:.1f}%** | {cells} |")
+        return "\n".join(lines)
+        
+    def _track_stages(self, start: int):
+        """Record which analysis stages since ``start`` were served from the engine cache"""
+        self.stage_cache.extend(self.analyzer.stage_log[start:])
+        
+    @instrumented('memo', report='investment_memorandum')
     def generate_comprehensive_memo(self):
         """Generate complete investment memorandum"""
+        log_start = len(self.analyzer.stage_log)
         
         # Generate analysis
         thesis = self.analyzer.generate_investment_thesis()
         valuation = self.analyzer.perform_valuation_analysis()
         risk_analysis = self.analyzer.risk_analysis()
+        discount_sensitivity = self._sensitivity_table(self.analyzer.dcf_sensitivity(('wacc', 'terminal_growth')))
+        operating_sensitivity = self._sensitivity_table(self.analyzer.dcf_sensitivity(('revenue_growth', 'operating_margin')))
+        correlation = risk_analysis['market_risk']['correlation_vs_peers']
+        peer_correlation = (f"{correlation:.2f} average 1Y daily return correlation" if correlation == correlation
+                            else "n/a (no peer price history collected)")
         
         # Load peer data for benchmarking
-        with open('data/raw/peer_comparison_data.json', 'r') as f:
-            peer_data = json.load(f)
+        peer_data = load_json('peer_comparison_data')
+        
+        symbol = self.analyzer.symbol
+        company = self.analyzer.company_name
+        profile = self.profile
         
         memo_content = f"""
 # INVESTMENT MEMORANDUM
-## Barrick Gold Corporation (NYSE: ABX, TSX: ABX.TO)
+## {company} ({profile['listing']})
 
 **Analysis Date:** {thesis['analysis_date']}  
 **Analyst:** Professional Finance Consultant  
@@ -36,7 +99,7 @@ class InvestmentMemoGenerator:
 
 ## EXECUTIVE SUMMARY
 
-Barrick Gold Corporation presents a **{thesis['recommendation']}** investment opportunity in the gold mining sector with significant upside potential of **{thesis['upside_potential']:.1f}%** to our price target of **${thesis['price_target']:.2f}**.
+{company} presents a **{thesis['recommendation']}** investment opportunity in the gold mining sector with significant upside potential of **{thesis['upside_potential']:.1f}%** to our price target of **${thesis['price_target']:.2f}**.
 
 ### Key Investment Highlights:
 - **Strong Market Position**: Market cap of ${thesis['key_metrics']['market_cap_bn']:.1f}B, making it one of the largest gold miners globally
@@ -48,19 +111,14 @@ Barrick Gold Corporation presents a **{thesis['recommendation']}** investment op
 
 ## COMPANY OVERVIEW
 
-Barrick Gold Corporation is a leading international gold mining company with operations across multiple continents. The company operates high-quality, long-life assets with a focus on responsible mining practices.
-
-### Business Segments:
-- **Gold Mining Operations**: Primary revenue driver with diversified geographical exposure
-- **Copper Operations**: Complementary revenue stream providing portfolio diversification
-- **Exploration & Development**: Ongoing investment in future growth opportunities
+{profile['overview']}
 
 ---
 
 ## FINANCIAL ANALYSIS
 
 ### Valuation Metrics
-| Metric | ABX.TO | Peer Median | Relative |
+| Metric | {symbol} | Peer Median | Relative |
 |--------|--------|-------------|----------|
 | **P/E Ratio** | {thesis['key_metrics']['pe_ratio']:.1f}x | {thesis['peer_comparison']['peer_median_pe']:.1f}x | {("Discount" if thesis['key_metrics']['pe_ratio'] < thesis['peer_comparison']['peer_median_pe'] else "Premium")} |
 | **P/B Ratio** | {thesis['key_metrics']['pb_ratio']:.1f}x | {thesis['peer_comparison']['peer_median_pb']:.1f}x | {("Discount" if thesis['key_metrics']['pb_ratio'] < thesis['peer_comparison']['peer_median_pb'] else "Premium")} |
@@ -75,6 +133,12 @@ Our discounted cash flow analysis indicates fair value of **${valuation['dcf_val
 - Revenue Growth: {valuation['dcf_valuation']['assumptions']['revenue_growth']*100:.1f}%
 - Operating Margin: {valuation['dcf_valuation']['assumptions']['operating_margin']*100:.1f}%
 
+**Sensitivity of DCF Value per Share:**
+
+{discount_sensitivity}
+
+{operating_sensitivity}
+
 ---
 
 ## PEER COMPARISON ANALYSIS
@@ -83,7 +147,7 @@ Our discounted cash flow analysis indicates fair value of **${valuation['dcf_val
 """
 
         # Add peer comparison table
-        main_peers = ['ABX.TO', 'NEM', 'AEM', 'KGC', 'AU']
+        main_peers = peer_group(symbol, 5)
         
         memo_content += "\n| Company | Symbol | Market Cap ($B) | P/E Ratio | 1Y Return | Volatility |\n"
         memo_content += "|---------|--------|----------------|-----------|-----------|------------|\n"
@@ -125,9 +189,11 @@ Our discounted cash flow analysis indicates fair value of **${valuation['dcf_val
 ### Risk Metrics
 - **Beta**: {thesis['key_metrics']['beta']:.2f} ({"Less volatile" if thesis['key_metrics']['beta'] < 1 else "More volatile"} than market)
 - **Annual Volatility**: {thesis['key_metrics']['annual_volatility']:.1f}%
+- **Correlation vs Peers**: {peer_correlation}
 - **Maximum Drawdown**: {risk_analysis['drawdowns']['max_drawdown']:.1f}%
-- **Current Drawdown**: {risk_analysis['drawdowns']['current_drawdown']:.1f}%
+- **Current Drawdown**: {risk_analysis['drawdowns']['current_drawdown']:.1f}% ({risk_analysis['drawdowns']['current_duration_days']} trading days below the peak; longest {risk_analysis['drawdowns']['max_duration_days']})
 - **Value at Risk (95%)**: {risk_analysis['volatility']['var_95']:.1f}% daily
+- **Expected Shortfall (95% CVaR)**: {risk_analysis['volatility']['cvar_95']:.1f}% daily
 
 ### Key Risk Factors
 """
@@ -192,7 +258,7 @@ Our discounted cash flow analysis indicates fair value of **${valuation['dcf_val
 
 ## CONCLUSION
 
-Barrick Gold Corporation represents an attractive investment opportunity in the gold mining sector. With a **{thesis['recommendation']}** recommendation and price target of **${thesis['price_target']:.2f}**, the stock offers **{thesis['upside_potential']:.1f}%** upside potential from current levels.
+{company} represents an attractive investment opportunity in the gold mining sector. With a **{thesis['recommendation']}** recommendation and price target of **${thesis['price_target']:.2f}**, the stock offers **{thesis['upside_potential']:.1f}%** upside potential from current levels.
 
 The investment thesis is supported by:
 - Attractive valuation relative to peers
@@ -200,7 +266,7 @@ The investment thesis is supported by:
 - Positive technical momentum
 - Favorable sector dynamics
 
-**Risk-Adjusted Return**: Given the risk profile and upside potential, ABX.TO offers attractive risk-adjusted returns for investors seeking exposure to precious metals.
+**Risk-Adjusted Return**: Given the risk profile and upside potential, {self.analyzer.symbol} offers attractive risk-adjusted returns for investors seeking exposure to precious metals.
 
 ---
 
@@ -212,23 +278,30 @@ The investment thesis is supported by:
         """
         
         # Save the memo
-        with open('reports/investment_memorandum.md', 'w') as f:
+        path = self._output_path('investment_memorandum.md')
+        with open(path, 'w') as f:
             f.write(memo_content)
+        self._track_stages(log_start)
             
         print("Investment memorandum generated successfully!")
-        print("Saved to: reports/investment_memorandum.md")
+        print(f"Saved to: {path}")
         
         return memo_content
         
+    @instrumented('memo', report='executive_summary')
     def generate_executive_summary(self):
         """Generate executive summary for quick review"""
+        log_start = len(self.analyzer.stage_log)
         thesis = self.analyzer.generate_investment_thesis()
+        self._track_stages(log_start)
+        
+        company = self.analyzer.company_name
         
         summary = f"""
-# EXECUTIVE SUMMARY - BARRICK GOLD CORPORATION
+# EXECUTIVE SUMMARY - {company.upper()}
 
 **Date:** {datetime.now().strftime('%B %d, %Y')}
-**Symbol:** ABX.TO (TSX) / ABX (NYSE)
+**Symbol:** {self.profile['summary_listing']}
 **Sector:** Basic Materials - Gold Mining
 
 ## INVESTMENT RECOMMENDATION: {thesis['recommendation']}
@@ -253,10 +326,10 @@ The investment thesis is supported by:
 - Operational and regulatory risks
 
 ### Bottom Line
-Barrick Gold offers compelling value with significant upside potential for investors seeking exposure to gold mining sector.
+{short_name(company)} offers compelling value with significant upside potential for investors seeking exposure to gold mining sector.
         """
         
-        with open('reports/executive_summary.md', 'w') as f:
+        with open(self._output_path('executive_summary.md'), 'w') as f:
             f.write(summary)
             
         return summary
@@ -270,6 +343,11 @@ if __name__ == "__main__":
     print("Generating executive summary...")
     summary = generator.generate_executive_summary()
     
+    hits = [stage for stage, outcome in generator.stage_cache if outcome == 'hit']
+    misses = [stage for stage, outcome in generator.stage_cache if outcome == 'miss']
+    print(f"Analysis stages computed: {', '.join(misses) or 'none'}")
+    print(f"Analysis stages served from cache: {', '.join(hits) or 'none'}")
+    
     print("\nAnalysis completed successfully!")
     print("Files generated:")
     print("- reports/investment_memorandum.md")
@@ -8,11 +8,22 @@ from .polygon_client import PolygonClient
 from .fmp_client import FMPClient
 from .fred_client import FREDClient
 from .news_client import NewsClient
+from .async_client import AsyncAPIClient
+from .rate_limiter import TokenBucketRateLimiter
+from .response_cache import ResponseCache, response_cache
+from .session import SessionPool, session_pool, connection_stats
 
 __all__ = [
     'AlphaVantageClient',
     'PolygonClient', 
     'FMPClient',
     'FREDClient',
-    'NewsClient'
+    'NewsClient',
+    'AsyncAPIClient',
+    'TokenBucketRateLimiter',
+    'ResponseCache',
+    'response_cache',
+    'SessionPool',
+    'session_pool',
+    'connection_stats'
 ]
\ No newline at end of file
@@ -1,12 +1,35 @@
 import pandas as pd
-from typing import Dict, Any
+from datetime import datetime
+from typing import Dict, Any, Optional
 from .base_client import BaseAPIClient
+from .response_cache import HOUR, DAY, UNTIL_MARKET_CLOSE
 
 class AlphaVantageClient(BaseAPIClient):
     """Alpha Vantage API client for stock data and fundamentals"""
     
-    def __init__(self, api_key: str):
-        super().__init__(api_key, "https://www.alphavantage.co/query", rate_limit=12.0)
+    # Every call goes to the same endpoint, so TTLs are keyed by 'function'
+    cache_ttls = {
+        'OVERVIEW': DAY,
+        'TIME_SERIES_DAILY_ADJUSTED': UNTIL_MARKET_CLOSE,
+        'INCOME_STATEMENT': 7 * DAY,
+        'BALANCE_SHEET': 7 * DAY,
+        'CASH_FLOW': 7 * DAY,
+        'EARNINGS': 12 * HOUR
+    }
+    
+    def __init__(self, api_key: str, base_url: str = "https://www.alphavantage.co/query", **kwargs):
+        super().__init__(api_key, base_url, rate_limit=12.0,
+                         quotas=[(5, 60), (500, 86400)], **kwargs)
+        
+    def _cache_ttl(self, endpoint: str, params: Dict[str, Any]):
+        """TTL rule for the requested Alpha Vantage function"""
+        return self.cache_ttls.get(params.get('function'))
+        
+    def _is_cacheable(self, data: Any) -> bool:
+        """Skip throttling notices and error payloads, which arrive with HTTP 200"""
+        if not data or not isinstance(data, dict):
+            return bool(data)
+        return not any(key in data for key in ('Note', 'Information', 'Error Message'))
         
     def get_company_overview(self, symbol: str) -> Dict[str, Any]:
         """Get company overview and fundamental data"""
@@ -16,12 +39,16 @@ class AlphaVantageClient(BaseAPIClient):
         }
         return self._make_request('', params)
         
-    def get_price_data(self, symbol: str, period: str = "1year") -> pd.DataFrame:
-        """Get daily price data"""
+    def get_price_data(self, symbol: str, period: str = "1year", start_date: Optional[datetime] = None) -> pd.DataFrame:
+        """Get daily price data, only from ``start_date`` onwards when given"""
+        start = pd.Timestamp(start_date).tz_localize(None) if start_date is not None else None
+        
+        # 'compact' returns the latest 100 bars, enough for recent incremental updates
+        compact = start is not None and (pd.Timestamp.now() - start).days < 130
         params = {
             'function': 'TIME_SERIES_DAILY_ADJUSTED',
             'symbol': symbol,
-            'outputsize': 'full'
+            'outputsize': 'compact' if compact else 'full'
         }
         
         data = self._make_request('', params)
@@ -38,6 +65,9 @@ class AlphaVantageClient(BaseAPIClient):
         df.index = pd.to_datetime(df.index)
         df = df.sort_index()
         
+        if start is not None:
+            df = df[df.index >= start]
+        
         return df
         
     def get_income_statement(self, symbol: str) -> Dict[str, Any]:
@@ -0,0 +1,54 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from .base_client import BaseAPIClient
+
+class AsyncAPIClient:
+    """Asyncio front-end for any BaseAPIClient
+
+    Every public client method becomes awaitable and runs on a small thread
+    pool bound to the wrapped client, so requests for one provider overlap
+    while the client's own rate limiter still spaces them out.
+    """
+
+    def __init__(self, client: BaseAPIClient, max_concurrency: Optional[int] = None):
+        self.client = client
+        self.max_concurrency = max_concurrency or client.session_pool.pool_maxsize
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix=type(client).__name__
+        )
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking callable on this client's worker threads"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def call(self, method: str, *args, **kwargs) -> Any:
+        """Run ``client.<method>(*args, **kwargs)`` without blocking the event loop"""
+        return await self.run(getattr(self.client, method), *args, **kwargs)
+
+    def __getattr__(self, name: str):
+        # Only reached for attributes not found on the wrapper itself
+        if name.startswith('_') or 'client' not in self.__dict__:
+            raise AttributeError(name)
+
+        attr = getattr(self.client, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await self.call(name, *args, **kwargs)
+        return method
+
+    def close(self):
+        """Release the worker threads"""
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
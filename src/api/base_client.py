@@ -1,50 +1,135 @@
 import requests
-import time
-from typing import Dict, Any, Optional
+import json
+from datetime import datetime
+from typing import Dict, Any, Optional, Sequence, Tuple
 import pandas as pd
 from abc import ABC, abstractmethod
+from .session import SessionPool, session_pool as default_session_pool
+from .rate_limiter import TokenBucketRateLimiter, DEFAULT_STATE_PATH, quotas_from_interval
+from .response_cache import ResponseCache, response_cache as default_response_cache
 
 class BaseAPIClient(ABC):
     """Base class for all financial API clients"""
     
-    def __init__(self, api_key: str, base_url: str, rate_limit: float = 1.0):
+    # Endpoint prefix -> TTL in seconds (or UNTIL_MARKET_CLOSE); unlisted endpoints are not cached
+    cache_ttls: Dict[str, Any] = {}
+    
+    def __init__(self, api_key: str, base_url: str, rate_limit: float = 1.0,
+                 quotas: Optional[Sequence[Tuple[float, float]]] = None,
+                 session_pool: Optional[SessionPool] = None,
+                 rate_limit_state: str = DEFAULT_STATE_PATH,
+                 response_cache: Optional[ResponseCache] = None,
+                 use_cache: bool = True):
         self.api_key = api_key
         self.base_url = base_url
         self.rate_limit = rate_limit
-        self.last_request_time = 0
         
-    def _rate_limit_check(self):
-        """Enforce rate limiting between API calls"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.rate_limit:
-            time.sleep(self.rate_limit - time_since_last)
-        self.last_request_time = time.time()
+        # Quotas are shared with every thread and process using the same key
+        quotas = quotas if quotas is not None else quotas_from_interval(rate_limit)
+        self.rate_limiter = (
+            TokenBucketRateLimiter(type(self).__name__, api_key, quotas, rate_limit_state)
+            if quotas else None
+        )
         
-    def _make_request(self, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Make HTTP request with error handling and rate limiting"""
-        self._rate_limit_check()
+        # Keep-alive connections are shared with every client on the same host
+        self.session_pool = session_pool or default_session_pool
+        
+        # Responses are cached on disk and shared across runs
+        self.response_cache = (response_cache or default_response_cache) if use_cache else None
+        
+    @property
+    def session(self) -> requests.Session:
+        """Pooled session for this client's host"""
+        return self.session_pool.get_session(self.base_url)
+        
+    def connection_stats(self) -> Dict[str, int]:
+        """Connection reuse counters for this client's host"""
+        host = self.session_pool.host_key(self.base_url)
+        return self.session_pool.connection_stats().get(
+            host, {'requests': 0, 'connections_opened': 0, 'connections_reused': 0}
+        )
+        
+    def _rate_limit_check(self) -> float:
+        """Wait for the provider quota to allow another call; returns seconds waited"""
+        if self.rate_limiter is None:
+            return 0.0
+        return self.rate_limiter.acquire()
+        
+    def rate_limit_stats(self) -> Dict[str, float]:
+        """How many calls went through the rate limiter and how long they waited"""
+        if self.rate_limiter is None:
+            return {'calls': 0, 'waited_calls': 0, 'total_wait': 0.0, 'max_wait': 0.0, 'avg_wait': 0.0}
+        return self.rate_limiter.stats()
         
+    def _cache_ttl(self, endpoint: str, params: Dict[str, Any]) -> Optional[Any]:
+        """TTL rule for an endpoint, or None when its responses should not be cached"""
+        for prefix, ttl in self.cache_ttls.items():
+            if endpoint.startswith(prefix):
+                return ttl
+        return None
+        
+    def _is_cacheable(self, data: Any) -> bool:
+        """Whether a decoded response is worth caching (not empty or an error payload)"""
+        return bool(data)
+        
+    def _make_request(self, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Make HTTP request with caching, error handling and rate limiting"""
         url = f"{self.base_url}/{endpoint}"
         if params is None:
             params = {}
             
+        ttl = self._cache_ttl(endpoint, params) if self.response_cache else None
+        cache_key = entry = None
+        headers = {}
+        if ttl is not None:
+            cache_key = self.response_cache.make_key(url, params)
+            entry = self.response_cache.lookup(cache_key)
+            if entry is not None:
+                if entry['fresh']:
+                    return json.loads(entry['body'])
+                    
+                # Stale entry: let the provider answer 304 if nothing changed
+                if entry['etag']:
+                    headers['If-None-Match'] = entry['etag']
+                if entry['last_modified']:
+                    headers['If-Modified-Since'] = entry['last_modified']
+                    
+        self._rate_limit_check()
+        
         params['apikey'] = self.api_key
         
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = self.session.get(url, params=params, headers=headers, timeout=30)
+            if response.status_code == 304 and entry is not None:
+                self.response_cache.refresh(cache_key, ttl)
+                return json.loads(entry['body'])
+                
             response.raise_for_status()
-            return response.json()
+            data = response.json()
         except requests.exceptions.RequestException as e:
             print(f"API request failed: {e}")
             return {}
             
+        if cache_key is not None and self._is_cacheable(data):
+            self.response_cache.put(
+                cache_key, url, response.content, ttl,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified')
+            )
+        return data
+        
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss statistics of the response cache used by this client"""
+        if self.response_cache is None:
+            return {}
+        return self.response_cache.stats()
+        
     @abstractmethod
     def get_company_overview(self, symbol: str) -> Dict[str, Any]:
         """Get company fundamental data"""
         pass
         
     @abstractmethod
-    def get_price_data(self, symbol: str, period: str = "1year") -> pd.DataFrame:
-        """Get historical price data"""
+    def get_price_data(self, symbol: str, period: str = "1year", start_date: Optional[datetime] = None) -> pd.DataFrame:
+        """Get historical price data, only from ``start_date`` onwards when given"""
         pass
\ No newline at end of file
@@ -1,12 +1,29 @@
 import pandas as pd
-from typing import Dict, Any, List
+from datetime import datetime
+from typing import Dict, Any, List, Optional
 from .base_client import BaseAPIClient
+from .response_cache import DAY, UNTIL_MARKET_CLOSE
 
 class FMPClient(BaseAPIClient):
     """Financial Modeling Prep API client"""
     
-    def __init__(self, api_key: str):
-        super().__init__(api_key, "https://financialmodelingprep.com/api", rate_limit=0.25)
+    cache_ttls = {
+        'v3/profile/': DAY,
+        'v3/historical-price-full/': UNTIL_MARKET_CLOSE,
+        'v3/market-capitalization/': UNTIL_MARKET_CLOSE,
+        'v3/income-statement/': 7 * DAY,
+        'v3/balance-sheet-statement/': 7 * DAY,
+        'v3/cash-flow-statement/': 7 * DAY,
+        'v3/ratios/': 7 * DAY,
+        'v3/key-metrics/': 7 * DAY,
+        'v3/enterprise-values/': 7 * DAY,
+        'v3/discounted-cash-flow/': DAY,
+        'v3/stock-screener': DAY
+    }
+    
+    def __init__(self, api_key: str, base_url: str = "https://financialmodelingprep.com/api", **kwargs):
+        super().__init__(api_key, base_url, rate_limit=0.25,
+                         quotas=[(4, 1), (300, 60)], **kwargs)
         
     def get_company_overview(self, symbol: str) -> Dict[str, Any]:
         """Get company profile"""
@@ -14,12 +31,15 @@ class FMPClient(BaseAPIClient):
         data = self._make_request(endpoint)
         return data[0] if data else {}
         
-    def get_price_data(self, symbol: str, period: str = "1year") -> pd.DataFrame:
-        """Get historical price data"""
+    def get_price_data(self, symbol: str, period: str = "1year", start_date: Optional[datetime] = None) -> pd.DataFrame:
+        """Get historical price data, only from ``start_date`` onwards when given"""
         endpoint = f"v3/historical-price-full/{symbol}"
-        params = {
-            'timeseries': 252 if period == "1year" else 1260
-        }
+        if start_date is not None:
+            params = {'from': pd.Timestamp(start_date).strftime("%Y-%m-%d")}
+        else:
+            params = {
+                'timeseries': 252 if period == "1year" else 1260
+            }
         
         data = self._make_request(endpoint, params)
         
@@ -1,19 +1,26 @@
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 from .base_client import BaseAPIClient
+from .response_cache import DAY
 
 class FREDClient(BaseAPIClient):
     """Federal Reserve Economic Data API client"""
     
-    def __init__(self, api_key: str):
-        super().__init__(api_key, "https://api.stlouisfed.org/fred", rate_limit=0.1)
+    # Series are requested at monthly frequency
+    cache_ttls = {
+        'series/observations': DAY
+    }
+    
+    def __init__(self, api_key: str, base_url: str = "https://api.stlouisfed.org/fred", **kwargs):
+        super().__init__(api_key, base_url, rate_limit=0.1,
+                         quotas=[(10, 1), (120, 60)], **kwargs)
         
     def get_company_overview(self, symbol: str) -> Dict[str, Any]:
         """Not applicable for FRED - returns empty dict"""
         return {}
         
-    def get_price_data(self, symbol: str, period: str = "1year") -> pd.DataFrame:
+    def get_price_data(self, symbol: str, period: str = "1year", start_date: Optional[datetime] = None) -> pd.DataFrame:
         """Not applicable for FRED - returns empty DataFrame"""
         return pd.DataFrame()
         
@@ -1,19 +1,25 @@
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from .base_client import BaseAPIClient
+from .response_cache import HOUR
 
 class NewsClient(BaseAPIClient):
     """News API client for market sentiment analysis"""
     
-    def __init__(self, api_key: str):
-        super().__init__(api_key, "https://newsapi.org/v2", rate_limit=0.1)
+    cache_ttls = {
+        'everything': HOUR
+    }
+    
+    def __init__(self, api_key: str, base_url: str = "https://newsapi.org/v2", **kwargs):
+        super().__init__(api_key, base_url, rate_limit=0.1,
+                         quotas=[(10, 1)], **kwargs)
         
     def get_company_overview(self, symbol: str) -> Dict[str, Any]:
         """Not applicable for News API"""
         return {}
         
-    def get_price_data(self, symbol: str, period: str = "1year") -> pd.DataFrame:
+    def get_price_data(self, symbol: str, period: str = "1year", start_date: Optional[datetime] = None) -> pd.DataFrame:
         """Not applicable for News API"""
         return pd.DataFrame()
         
@@ -1,24 +1,35 @@
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 from .base_client import BaseAPIClient
+from .response_cache import HOUR, DAY, UNTIL_MARKET_CLOSE
 
 class PolygonClient(BaseAPIClient):
     """Polygon.io API client for market data"""
     
-    def __init__(self, api_key: str):
-        super().__init__(api_key, "https://api.polygon.io", rate_limit=0.2)
+    cache_ttls = {
+        'v3/reference/tickers/': DAY,
+        'v2/aggs/': UNTIL_MARKET_CLOSE,
+        'vX/reference/financials': 7 * DAY,
+        'v2/reference/news': HOUR
+    }
+    
+    def __init__(self, api_key: str, base_url: str = "https://api.polygon.io", **kwargs):
+        super().__init__(api_key, base_url, rate_limit=0.2,
+                         quotas=[(5, 1)], **kwargs)
         
     def get_company_overview(self, symbol: str) -> Dict[str, Any]:
         """Get company details from Polygon"""
         endpoint = f"v3/reference/tickers/{symbol}"
         return self._make_request(endpoint)
         
-    def get_price_data(self, symbol: str, period: str = "1year") -> pd.DataFrame:
-        """Get aggregated price data"""
+    def get_price_data(self, symbol: str, period: str = "1year", start_date: Optional[datetime] = None) -> pd.DataFrame:
+        """Get aggregated price data, only from ``start_date`` onwards when given"""
         end_date = datetime.now()
         
-        if period == "1year":
+        if start_date is not None:
+            start_date = pd.Timestamp(start_date).to_pydatetime()
+        elif period == "1year":
             start_date = end_date - timedelta(days=365)
         elif period == "5year":
             start_date = end_date - timedelta(days=1825)
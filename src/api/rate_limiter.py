@@ -0,0 +1,112 @@
+import os
+import sqlite3
+import threading
+import time
+import hashlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .sqlite_store import thread_connection
+
+# Shared bucket state; every process pointing at the same file shares the quota
+DEFAULT_STATE_PATH = os.getenv('RATE_LIMIT_STATE', 'data/cache/rate_limits.sqlite3')
+
+class TokenBucketRateLimiter:
+    """Token-bucket rate limiter keyed by provider and API key
+
+    Each quota is a ``(calls, period_seconds)`` pair, e.g. Alpha Vantage's
+    ``[(5, 60), (500, 86400)]``. A bucket starts full so callers may burst up
+    to the quota, then refills continuously. Bucket levels live in a small
+    SQLite file, which makes the limiter safe across threads and across
+    worker processes using the same key.
+    """
+
+    def __init__(self, provider: str, api_key: Optional[str], quotas: Sequence[Tuple[float, float]],
+                 state_path: str = DEFAULT_STATE_PATH):
+        if not quotas:
+            raise ValueError("At least one (calls, period) quota is required")
+        for calls, period in quotas:
+            if calls < 1 or period <= 0:
+                raise ValueError(f"Invalid quota ({calls}, {period})")
+
+        key_hash = hashlib.sha256((api_key or '').encode()).hexdigest()[:16]
+        self.key = f"{provider}:{key_hash}"
+        self.quotas = [(float(calls), float(period)) for calls, period in quotas]
+        self.state_path = state_path
+
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {'calls': 0, 'waited_calls': 0, 'total_wait': 0.0, 'max_wait': 0.0}
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection to the shared state file"""
+        return thread_connection(self._local, self.state_path, [
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "key TEXT, period REAL, tokens REAL, updated REAL, "
+            "PRIMARY KEY (key, period))",
+        ])
+
+    def _try_acquire(self, tokens: float) -> float:
+        """Take tokens from every bucket if all have enough; else return the wait needed"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            levels = []
+            wait = 0.0
+            for calls, period in self.quotas:
+                row = conn.execute(
+                    "SELECT tokens, updated FROM buckets WHERE key = ? AND period = ?",
+                    (self.key, period)
+                ).fetchone()
+                refill_rate = calls / period
+                if row is None:
+                    level = calls
+                else:
+                    level = min(calls, row[0] + max(now - row[1], 0.0) * refill_rate)
+                if level < tokens:
+                    wait = max(wait, (tokens - level) / refill_rate)
+                levels.append((period, level))
+
+            if wait == 0.0:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO buckets (key, period, tokens, updated) VALUES (?, ?, ?, ?)",
+                    [(self.key, period, level - tokens, now) for period, level in levels]
+                )
+            conn.execute("COMMIT")
+            return wait
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Block until the call is allowed by every quota; returns seconds waited"""
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait == 0.0:
+                break
+            time.sleep(wait)
+            waited += wait
+
+        with self._stats_lock:
+            self._stats['calls'] += 1
+            if waited > 0:
+                self._stats['waited_calls'] += 1
+                self._stats['total_wait'] += waited
+                self._stats['max_wait'] = max(self._stats['max_wait'], waited)
+        return waited
+
+    def stats(self) -> Dict[str, float]:
+        """Calls made through this limiter and how long they waited"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['avg_wait'] = stats['total_wait'] / stats['calls'] if stats['calls'] else 0.0
+        return stats
+
+    def reset(self):
+        """Forget the stored bucket levels for this key"""
+        self._connection().execute("DELETE FROM buckets WHERE key = ?", (self.key,))
+
+def quotas_from_interval(rate_limit: float) -> List[Tuple[float, float]]:
+    """Equivalent quota for the old 'one call every N seconds' rate limit"""
+    return [(1, rate_limit)] if rate_limit > 0 else []
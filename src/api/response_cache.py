@@ -0,0 +1,152 @@
+import os
+import json
+import sqlite3
+import threading
+import time
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Union
+
+from .sqlite_store import evict_lru, thread_connection
+
+DEFAULT_CACHE_PATH = os.getenv('RESPONSE_CACHE_PATH', 'data/cache/http_cache.sqlite3')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# TTL building blocks used by the clients' cache_ttls tables
+HOUR = 3600
+DAY = 24 * HOUR
+UNTIL_MARKET_CLOSE = 'market_close'
+
+# Query parameters that identify the caller rather than the resource
+EXCLUDED_PARAMS = {'apikey', 'api_key'}
+
+def seconds_until_market_close(now: Optional[datetime] = None) -> float:
+    """Seconds until the next 16:00 New York close on a weekday"""
+    try:
+        from zoneinfo import ZoneInfo
+        tz = ZoneInfo('America/New_York')
+    except Exception:
+        tz = timezone(timedelta(hours=-5))
+
+    now = now.astimezone(tz) if now else datetime.now(tz)
+    close = now.replace(hour=16, minute=0, second=0, microsecond=0)
+    if now >= close:
+        close += timedelta(days=1)
+    while close.weekday() >= 5:
+        close += timedelta(days=1)
+    return (close - now).total_seconds()
+
+def resolve_ttl(ttl: Union[float, str]) -> float:
+    """Turn a TTL rule into seconds"""
+    if ttl == UNTIL_MARKET_CLOSE:
+        return seconds_until_market_close()
+    return float(ttl)
+
+class ResponseCache:
+    """Size-bounded on-disk cache of API responses
+
+    Entries are keyed by URL plus query parameters (API keys excluded) and
+    kept in SQLite alongside their ETag/Last-Modified validators. Expired
+    entries are revalidated with a conditional request when the provider
+    sent validators; the least recently used entries are evicted once the
+    cache grows past ``max_bytes``.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stores': 0, 'evictions': 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection to the cache file"""
+        return thread_connection(self._local, self.path, [
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, url TEXT, body BLOB, etag TEXT, last_modified TEXT, "
+            "stored_at REAL, expires_at REAL, last_access REAL, size INTEGER)",
+            "CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)",
+        ])
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[stat] += amount
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Cache key for a request, ignoring credentials"""
+        params = {k: v for k, v in (params or {}).items() if k not in EXCLUDED_PARAMS}
+        canonical = json.dumps([url, sorted((k, str(v)) for k, v in params.items())])
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stored entry (fresh or stale) for a key, or None"""
+        row = self._connection().execute(
+            "SELECT body, etag, last_modified, expires_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            'body': row[0],
+            'etag': row[1],
+            'last_modified': row[2],
+            'fresh': row[3] > time.time()
+        }
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Entry for a key, counting a hit when fresh and a miss otherwise"""
+        entry = self.get(key)
+        if entry is not None and entry['fresh']:
+            self._connection().execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._count('hits')
+        else:
+            self._count('misses')
+        return entry
+
+    def put(self, key: str, url: str, body: bytes, ttl: Union[float, str],
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Store a response body and evict old entries if over budget"""
+        now = time.time()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO responses "
+            "(key, url, body, etag, last_modified, stored_at, expires_at, last_access, size) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, url, body, etag, last_modified, now, now + resolve_ttl(ttl), now, len(body))
+        )
+        self._count('stores')
+        self._evict()
+
+    def refresh(self, key: str, ttl: Union[float, str]):
+        """Extend an entry after the provider confirmed it is unchanged (304)"""
+        now = time.time()
+        self._connection().execute(
+            "UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?",
+            (now + resolve_ttl(ttl), now, key)
+        )
+        self._count('revalidated')
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        self._count('evictions', evict_lru(self._connection(), 'responses', self.max_bytes))
+
+    def clear(self):
+        """Remove every cached response"""
+        self._connection().execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus the on-disk footprint"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        entries, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['entries'] = entries
+        stats['bytes'] = size
+        return stats
+
+# Process-wide cache used by every client unless one is passed explicitly
+response_cache = ResponseCache()
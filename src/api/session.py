@@ -0,0 +1,122 @@
+import threading
+from typing import Dict, Any, Iterable
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+class SessionPool:
+    """Connection-pooled HTTP sessions shared by all API clients, one per host"""
+
+    def __init__(self, pool_connections: int = 4, pool_maxsize: int = 10, keep_alive: bool = True,
+                 max_retries: int = 3, backoff_factor: float = 0.5,
+                 status_forcelist: Iterable[int] = (429, 500, 502, 503, 504)):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.status_forcelist = tuple(status_forcelist)
+        self._sessions = {}
+        self._bytes_received = {}
+        self._lock = threading.Lock()
+
+    def configure(self, **settings):
+        """Change pool settings; sessions are rebuilt on their next use"""
+        for name, value in settings.items():
+            if not hasattr(self, name) or name.startswith('_'):
+                raise ValueError(f"Unknown session pool setting: {name}")
+            setattr(self, name, value)
+        self.close()
+
+    def get_session(self, base_url: str) -> requests.Session:
+        """Return the shared session for the host of ``base_url``"""
+        host = self.host_key(base_url)
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._build_session()
+                self._sessions[host] = session
+            return session
+
+    def _build_session(self) -> requests.Session:
+        """Create a session with a sized connection pool and transport-level retries"""
+        retries = Retry(
+            total=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.status_forcelist,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retries
+        )
+
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.hooks['response'].append(self._count_bytes)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def _count_bytes(self, response: requests.Response, *args, **kwargs):
+        """Response hook tallying body bytes downloaded per host"""
+        host = self.host_key(response.url)
+        size = len(response.content or b'')
+        with self._lock:
+            self._bytes_received[host] = self._bytes_received.get(host, 0) + size
+
+    def connection_stats(self) -> Dict[str, Dict[str, int]]:
+        """Requests sent, connections opened and reused, and body bytes received per host"""
+        stats = {}
+        with self._lock:
+            sessions = list(self._sessions.items())
+            bytes_received = dict(self._bytes_received)
+
+        for host, session in sessions:
+            requests_sent = 0
+            connections_opened = 0
+            for adapter in set(session.adapters.values()):
+                pools = adapter.poolmanager.pools
+                for key in pools.keys():
+                    pool = pools.get(key)
+                    if pool is None:
+                        continue
+                    requests_sent += pool.num_requests
+                    connections_opened += pool.num_connections
+
+            stats[host] = {
+                'requests': requests_sent,
+                'connections_opened': connections_opened,
+                'connections_reused': max(requests_sent - connections_opened, 0),
+                'bytes_received': bytes_received.get(host, 0)
+            }
+        return stats
+
+    def close(self):
+        """Close every pooled session and drop its connections"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions = {}
+        for session in sessions:
+            session.close()
+
+    @staticmethod
+    def host_key(base_url: str) -> str:
+        """Pool key (scheme and host) for a base URL"""
+        parts = urlsplit(base_url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+# Process-wide pool used by every client unless one is passed explicitly
+session_pool = SessionPool()
+
+def get_session(base_url: str) -> requests.Session:
+    """Return the shared pooled session for ``base_url``"""
+    return session_pool.get_session(base_url)
+
+def connection_stats() -> Dict[str, Dict[str, Any]]:
+    """Connection reuse counters for every host contacted so far"""
+    return session_pool.connection_stats()
@@ -0,0 +1,43 @@
+"""
+SQLite plumbing shared by the on-disk caches and the rate limiter
+
+Each store is one SQLite file used by many threads and worker processes:
+every thread gets its own connection in WAL mode, so readers never block
+the writer. Size-bounded caches keep ``key``, ``size`` and ``last_access``
+columns and trim themselves with ``evict_lru``.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Sequence
+
+def thread_connection(local: threading.local, path: str, schema: Sequence[str] = ()) -> sqlite3.Connection:
+    """This thread's connection to ``path``, opened and given ``schema`` on first use"""
+    conn = getattr(local, 'conn', None)
+    if conn is None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in schema:
+            conn.execute(statement)
+        local.conn = conn
+    return conn
+
+def evict_lru(conn: sqlite3.Connection, table: str, max_bytes: int) -> int:
+    """Delete the least recently used rows of ``table`` until it fits in max_bytes; returns rows deleted"""
+    total = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+    if total <= max_bytes:
+        return 0
+
+    evicted = 0
+    for key, size in conn.execute(f"SELECT key, size FROM {table} ORDER BY last_access").fetchall():
+        if total <= max_bytes:
+            break
+        conn.execute(f"DELETE FROM {table} WHERE key = ?", (key,))
+        total -= size
+        evicted += 1
+    return evicted
@@ -0,0 +1,118 @@
+"""
+Callback output cache shared by every dashboard worker process
+
+Rendered figures and components are stored as plotly JSON in a SQLite file,
+so a chart built by one worker is served by all of them. Keys carry the data
+version, so outputs from old data are never served and simply age out of the
+size-bounded store. A small in-process LRU in front of SQLite saves the decode
+for outputs this worker has already returned.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+from plotly.io.json import to_json_plotly
+
+from src.api.sqlite_store import evict_lru, thread_connection
+
+DEFAULT_CACHE_PATH = 'data/cache/dashboard_callbacks.sqlite3'
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+class SharedFigureCache:
+    """Cross-process cache of callback outputs with the ``FigureCache`` interface"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES,
+                 memory_entries: int = 64):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {'memory_hits': 0, 'shared_hits': 0, 'misses': 0, 'evictions': 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection to the cache file"""
+        return thread_connection(self._local, self.path, [
+            "CREATE TABLE IF NOT EXISTS outputs ("
+            "key TEXT PRIMARY KEY, body TEXT, stored_at REAL, last_access REAL, size INTEGER)",
+            "CREATE INDEX IF NOT EXISTS outputs_lru ON outputs (last_access)",
+        ])
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._lock:
+            self._stats[stat] += amount
+
+    @staticmethod
+    def make_key(key: Hashable) -> str:
+        return hashlib.sha256(repr(key).encode()).hexdigest()
+
+    def _remember(self, key: str, value: Any):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Cached output for ``key``, building and publishing it on a miss
+
+        Workers that miss on the same key at once each build it; the last
+        write wins, and both outputs are identical.
+        """
+        cache_key = self.make_key(key)
+        with self._lock:
+            if cache_key in self._memory:
+                self._memory.move_to_end(cache_key)
+                self._stats['memory_hits'] += 1
+                return self._memory[cache_key]
+
+        conn = self._connection()
+        row = conn.execute("SELECT body FROM outputs WHERE key = ?", (cache_key,)).fetchone()
+        if row is not None:
+            conn.execute("UPDATE outputs SET last_access = ? WHERE key = ?", (time.time(), cache_key))
+            value = json.loads(row[0])
+            self._count('shared_hits')
+            self._remember(cache_key, value)
+            return value
+
+        # Stored and returned in the same JSON form, so every worker serves identical output
+        body = to_json_plotly(build())
+        value = json.loads(body)
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO outputs (key, body, stored_at, last_access, size) VALUES (?, ?, ?, ?, ?)",
+            (cache_key, body, now, now, len(body))
+        )
+        self._count('misses')
+        self._evict()
+        self._remember(cache_key, value)
+        return value
+
+    def _evict(self):
+        """Drop least recently used outputs until the cache fits in max_bytes"""
+        self._count('evictions', evict_lru(self._connection(), 'outputs', self.max_bytes))
+
+    def clear(self):
+        """Remove every cached output, in this process and on disk"""
+        with self._lock:
+            self._memory.clear()
+        self._connection().execute("DELETE FROM outputs")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus the on-disk footprint"""
+        with self._lock:
+            stats = dict(self._stats)
+        entries, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM outputs"
+        ).fetchone()
+        lookups = stats['memory_hits'] + stats['shared_hits'] + stats['misses']
+        stats['hit_rate'] = (lookups - stats['misses']) / lookups if lookups else 0.0
+        stats['entries'] = entries
+        stats['bytes'] = size
+        return stats
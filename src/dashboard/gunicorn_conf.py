@@ -0,0 +1,23 @@
+"""
+Gunicorn settings for the production dashboard
+
+    gunicorn -c python:src.dashboard.gunicorn_conf src.dashboard.wsgi:server
+
+Environment overrides: DASHBOARD_BIND, DASHBOARD_WORKERS, DASHBOARD_THREADS.
+"""
+
+import os
+import multiprocessing
+
+bind = os.getenv('DASHBOARD_BIND', '0.0.0.0:8050')
+workers = int(os.getenv('DASHBOARD_WORKERS', str(min(multiprocessing.cpu_count() * 2 + 1, 8))))
+threads = int(os.getenv('DASHBOARD_THREADS', '1'))
+timeout = 120
+
+# Workers load the app themselves and share the data through the mapped store
+preload_app = False
+
+def on_starting(server):
+    """Bring the Arrow store up to date once, before any worker maps it"""
+    from src.data_store import migrate
+    migrate()
@@ -1,43 +1,190 @@
 import dash
-from dash import dcc, html, Input, Output, dash_table
+from dash import dcc, html, Input, Output, State, dash_table
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
-import json
+import os
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-import numpy as np
+from src.data_loader import data_loader, load_frame, load_json
+from src.dashboard.callback_cache import SharedFigureCache
+from src.models.correlation import peer_correlation_summary
+from src.models.indicators import indicator_frame
+from src.models.risk import DEFAULT_WINDOW, risk_frame
+from src.universe import peer_group
+from src.visualization.downsampling import (
+    FULL_WIDTH_PX, HALF_WIDTH_PX, candle_count, aggregate_ohlc, downsample_line, downsample_ohlc,
+)
+
+SYMBOL = 'ABX.TO'
+DATASETS = ('abx_daily_prices', 'abx_company_info', 'peer_comparison_data')
+
+# Look-back of each time period option; 'ALL' uses the full history
+PERIOD_DAYS = {'1M': 30, '3M': 90, '6M': 180, '1Y': 365, '2Y': 730}
+
+# How often the background refresher checks the data files for changes
+REFRESH_SECONDS = float(os.getenv('DASHBOARD_REFRESH_SECONDS', '30'))
+
+# SQLite file that shares callback outputs between worker processes (set by wsgi.py)
+CALLBACK_CACHE_PATH = os.getenv('DASHBOARD_CACHE_PATH')
 
 # Load data
 def load_dashboard_data():
     """Load all data required for dashboard"""
     try:
         # Price data
-        price_data = pd.read_csv('data/raw/abx_daily_prices.csv', index_col=0, parse_dates=True)
+        price_data = load_frame('abx_daily_prices')
         
         # Company info
-        with open('data/raw/abx_company_info.json', 'r') as f:
-            company_info = json.load(f)
+        company_info = load_json('abx_company_info')
             
         # Peer data
-        with open('data/raw/peer_comparison_data.json', 'r') as f:
-            peer_data = json.load(f)
+        peer_data = load_json('peer_comparison_data')
             
         return price_data, company_info, peer_data
     except Exception as e:
         print(f"Error loading dashboard data: {e}")
         return pd.DataFrame(), {}, {}
 
+class DashboardSnapshot:
+    """Dashboard data plus every derived series the callbacks plot
+
+    Indicators, period slices and performance figures are computed once per
+    data version, so callbacks only look them up. A snapshot is never changed
+    after it is published; new data produces a new snapshot.
+    """
+    
+    def __init__(self, price_data: pd.DataFrame, company_info, peer_data, version: str):
+        self.price_data = price_data
+        self.company_info = company_info
+        self.peer_data = peer_data
+        self.version = version
+        self.indicators = indicator_frame(price_data) if not price_data.empty else pd.DataFrame()
+        self.risk = risk_frame(price_data['Close']) if not price_data.empty else pd.DataFrame()
+        self.correlation = peer_correlation_summary(SYMBOL, peer_group(SYMBOL))
+        self._periods = {}
+        
+    def period(self, time_period: str) -> pd.DataFrame:
+        """Price data with indicators for one time period option"""
+        if time_period not in self._periods:
+            data = self.indicators
+            if not data.empty and time_period in PERIOD_DAYS:
+                start_date = data.index[-1] - timedelta(days=PERIOD_DAYS[time_period])
+                data = data.iloc[data.index.searchsorted(start_date):]
+            self._periods[time_period] = data
+        return self._periods[time_period]
+
+def build_snapshot() -> DashboardSnapshot:
+    price_data, company_info, peer_data = load_dashboard_data()
+    return DashboardSnapshot(price_data, company_info, peer_data, data_loader.fingerprint(*DATASETS))
+
+class FigureCache:
+    """Rendered figures keyed by chart, data version and control values"""
+    
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key in self._figures:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return self._figures[key]
+            
+        # Built outside the lock; concurrent misses on one key build it twice at worst
+        figure = build()
+        if isinstance(figure, go.Figure):
+            figure = figure.to_plotly_json()
+        with self._lock:
+            self.misses += 1
+            self._figures[key] = figure
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return figure
+
+class SnapshotRefresher:
+    """Background thread that publishes a new snapshot when the data files change
+
+    The data loader only re-parses files whose mtime and content changed, so
+    a check with no new data costs a few stat calls. The new snapshot is built
+    off the request path and swapped in with a single assignment; callbacks
+    keep using whichever snapshot they started with.
+    """
+    
+    def __init__(self, interval: float = REFRESH_SECONDS):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        
+    def check(self) -> bool:
+        """Reload if the data changed; returns whether a new snapshot was published"""
+        global snapshot
+        price_data, company_info, peer_data = load_dashboard_data()
+        version = data_loader.fingerprint(*DATASETS)
+        if version == snapshot.version:
+            return False
+        snapshot = DashboardSnapshot(price_data, company_info, peer_data, version)
+        print(f"Dashboard data refreshed (version {version[:12]})")
+        return True
+        
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Dashboard refresh failed: {e}")
+                
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='dashboard-refresher', daemon=True)
+            self._thread.start()
+            
+    def stop(self):
+        self._stop.set()
+
 # Initialize the Dash app
 app = dash.Dash(__name__, external_stylesheets=['https://codepen.io/chriddyp/pen/bWLwgP.css'])
 
 # Load data
-price_data, company_info, peer_data = load_dashboard_data()
+snapshot = build_snapshot()
+figure_cache = SharedFigureCache(CALLBACK_CACHE_PATH) if CALLBACK_CACHE_PATH else FigureCache()
+refresher = SnapshotRefresher()
 
-# Calculate key metrics
-current_price = price_data['Close'].iloc[-1] if not price_data.empty else 0
-daily_change = ((price_data['Close'].iloc[-1] / price_data['Close'].iloc[-2]) - 1) * 100 if len(price_data) > 1 else 0
-market_cap = company_info.get('marketCap', 0) / 1e9  # In billions
+def key_metric_cards(snap):
+    """Current price, daily change, market cap and P/E cards"""
+    price_data, company_info = snap.price_data, snap.company_info
+    current_price = price_data['Close'].iloc[-1] if not price_data.empty else 0
+    daily_change = ((price_data['Close'].iloc[-1] / price_data['Close'].iloc[-2]) - 1) * 100 if len(price_data) > 1 else 0
+    market_cap = company_info.get('marketCap', 0) / 1e9  # In billions
+    
+    return [
+        html.Div([
+            html.H3(f"${current_price:.2f}", style={'margin': '0', 'color': '#27ae60'}),
+            html.P("Current Price", style={'margin': '0', 'color': '#7f8c8d'})
+        ], className='three columns', style={'textAlign': 'center', 'padding': '20px', 'backgroundColor': '#ecf0f1', 'border-radius': '5px', 'margin': '5px'}),
+    
+        html.Div([
+            html.H3(f"{daily_change:+.2f}%", style={'margin': '0', 'color': '#e74c3c' if daily_change < 0 else '#27ae60'}),
+            html.P("Daily Change", style={'margin': '0', 'color': '#7f8c8d'})
+        ], className='three columns', style={'textAlign': 'center', 'padding': '20px', 'backgroundColor': '#ecf0f1', 'border-radius': '5px', 'margin': '5px'}),
+    
+        html.Div([
+            html.H3(f"${market_cap:.1f}B", style={'margin': '0', 'color': '#3498db'}),
+            html.P("Market Cap", style={'margin': '0', 'color': '#7f8c8d'})
+        ], className='three columns', style={'textAlign': 'center', 'padding': '20px', 'backgroundColor': '#ecf0f1', 'border-radius': '5px', 'margin': '5px'}),
+    
+        html.Div([
+            html.H3(f"{company_info.get('forwardPE', 0):.1f}x", style={'margin': '0', 'color': '#9b59b6'}),
+            html.P("P/E Ratio", style={'margin': '0', 'color': '#7f8c8d'})
+        ], className='three columns', style={'textAlign': 'center', 'padding': '20px', 'backgroundColor': '#ecf0f1', 'border-radius': '5px', 'margin': '5px'})
+    ]
 
 # Define the layout
 app.layout = html.Div([
@@ -46,27 +193,7 @@ app.layout = html.Div([
                 style={'textAlign': 'center', 'color': '#2c3e50', 'marginBottom': '30px'}),
         
         # Key metrics row
-        html.Div([
-            html.Div([
-                html.H3(f"${current_price:.2f}", style={'margin': '0', 'color': '#27ae60'}),
-                html.P("Current Price", style={'margin': '0', 'color': '#7f8c8d'})
-            ], className='three columns', style={'textAlign': 'center', 'padding': '20px', 'backgroundColor': '#ecf0f1', 'border-radius': '5px', 'margin': '5px'}),
-            
-            html.Div([
-                html.H3(f"{daily_change:+.2f}%", style={'margin': '0', 'color': '#e74c3c' if daily_change < 0 else '#27ae60'}),
-                html.P("Daily Change", style={'margin': '0', 'color': '#7f8c8d'})
-            ], className='three columns', style={'textAlign': 'center', 'padding': '20px', 'backgroundColor': '#ecf0f1', 'border-radius': '5px', 'margin': '5px'}),
-            
-            html.Div([
-                html.H3(f"${market_cap:.1f}B", style={'margin': '0', 'color': '#3498db'}),
-                html.P("Market Cap", style={'margin': '0', 'color': '#7f8c8d'})
-            ], className='three columns', style={'textAlign': 'center', 'padding': '20px', 'backgroundColor': '#ecf0f1', 'border-radius': '5px', 'margin': '5px'}),
-            
-            html.Div([
-                html.H3(f"{company_info.get('forwardPE', 0):.1f}x", style={'margin': '0', 'color': '#9b59b6'}),
-                html.P("P/E Ratio", style={'margin': '0', 'color': '#7f8c8d'})
-            ], className='three columns', style={'textAlign': 'center', 'padding': '20px', 'backgroundColor': '#ecf0f1', 'border-radius': '5px', 'margin': '5px'}),
-        ], className='row', style={'marginBottom': '30px'}),
+        html.Div(key_metric_cards(snapshot), id='key-metrics', className='row', style={'marginBottom': '30px'}),
         
         # Controls
         html.Div([
@@ -123,6 +250,9 @@ app.layout = html.Div([
             ], className='six columns')
         ], className='row'),
         
+        # Peer return correlation
+        dcc.Graph(id='peer-correlation'),
+        
         # Performance metrics table
         html.H3("Performance Metrics", style={'marginTop': '30px', 'color': '#2c3e50'}),
         html.Div(id='performance-table'),
@@ -131,6 +261,9 @@ app.layout = html.Div([
         html.H3("Peer Comparison", style={'marginTop': '30px', 'color': '#2c3e50'}),
         html.Div(id='peer-table'),
         
+        # Version of the data the charts were rendered from
+        dcc.Store(id='data-version', data=snapshot.version),
+        
         # Auto-refresh component
         dcc.Interval(
             id='interval-component',
@@ -144,78 +277,89 @@ app.layout = html.Div([
     ], style={'margin': '20px'})
 ])
 
+# Callback for key metrics
+@app.callback(
+    Output('key-metrics', 'children'),
+    [Input('data-version', 'data')]
+)
+def update_key_metrics(data_version):
+    snap = snapshot
+    return figure_cache.get_or_build(('key-metrics', snap.version), lambda: key_metric_cards(snap))
+
+# Publish a new data version only when the data changed; every chart keys off it
+@app.callback(
+    Output('data-version', 'data'),
+    [Input('interval-component', 'n_intervals')],
+    [State('data-version', 'data')]
+)
+def check_data_version(n_intervals, rendered_version):
+    if snapshot.version == rendered_version:
+        return dash.no_update
+    return snapshot.version
+
 # Callback for price chart
 @app.callback(
     Output('price-chart', 'figure'),
     [Input('time-period', 'value'),
      Input('chart-type', 'value'),
-     Input('interval-component', 'n_intervals')]
+     Input('data-version', 'data')]
 )
-def update_price_chart(time_period, chart_type, n_intervals):
-    # Filter data based on time period
-    end_date = price_data.index[-1] if not price_data.empty else datetime.now()
-    
-    if time_period == '1M':
-        start_date = end_date - timedelta(days=30)
-    elif time_period == '3M':
-        start_date = end_date - timedelta(days=90)
-    elif time_period == '6M':
-        start_date = end_date - timedelta(days=180)
-    elif time_period == '1Y':
-        start_date = end_date - timedelta(days=365)
-    elif time_period == '2Y':
-        start_date = end_date - timedelta(days=730)
-    else:  # ALL
-        start_date = price_data.index[0] if not price_data.empty else datetime.now() - timedelta(days=365)
-    
-    filtered_data = price_data[price_data.index >= start_date] if not price_data.empty else pd.DataFrame()
+def update_price_chart(time_period, chart_type, data_version):
+    snap = snapshot
+    return figure_cache.get_or_build(('price', snap.version, time_period, chart_type),
+                                     lambda: build_price_chart(snap, time_period, chart_type))
+
+def build_price_chart(snap, time_period, chart_type):
+    filtered_data = snap.period(time_period)
     
     fig = go.Figure()
     
     if not filtered_data.empty:
+        bars = downsample_ohlc(filtered_data, FULL_WIDTH_PX) if chart_type != 'line' else None
         if chart_type == 'candlestick':
             fig.add_trace(go.Candlestick(
-                x=filtered_data.index,
-                open=filtered_data['Open'],
-                high=filtered_data['High'],
-                low=filtered_data['Low'],
-                close=filtered_data['Close'],
+                x=bars.index,
+                open=bars['Open'],
+                high=bars['High'],
+                low=bars['Low'],
+                close=bars['Close'],
                 name='ABX.TO'
             ))
         elif chart_type == 'line':
+            close = downsample_line(filtered_data['Close'], FULL_WIDTH_PX)
             fig.add_trace(go.Scatter(
-                x=filtered_data.index,
-                y=filtered_data['Close'],
+                x=close.index,
+                y=close,
                 mode='lines',
                 name='Close Price',
                 line=dict(color='#3498db', width=2)
             ))
         elif chart_type == 'ohlc':
             fig.add_trace(go.Ohlc(
-                x=filtered_data.index,
-                open=filtered_data['Open'],
-                high=filtered_data['High'],
-                low=filtered_data['Low'],
-                close=filtered_data['Close'],
+                x=bars.index,
+                open=bars['Open'],
+                high=bars['High'],
+                low=bars['Low'],
+                close=bars['Close'],
                 name='ABX.TO'
             ))
         
         # Add moving averages
         if len(filtered_data) > 20:
-            ma_20 = filtered_data['Close'].rolling(window=20).mean()
+            sma_20 = downsample_line(filtered_data['SMA_20'], FULL_WIDTH_PX)
             fig.add_trace(go.Scatter(
-                x=filtered_data.index,
-                y=ma_20,
+                x=sma_20.index,
+                y=sma_20,
                 mode='lines',
                 name='20-day MA',
                 line=dict(color='orange', width=1)
             ))
         
         if len(filtered_data) > 50:
-            ma_50 = filtered_data['Close'].rolling(window=50).mean()
+            sma_50 = downsample_line(filtered_data['SMA_50'], FULL_WIDTH_PX)
             fig.add_trace(go.Scatter(
-                x=filtered_data.index,
-                y=ma_50,
+                x=sma_50.index,
+                y=sma_50,
                 mode='lines',
                 name='50-day MA',
                 line=dict(color='red', width=1)
@@ -235,43 +379,34 @@ def update_price_chart(time_period, chart_type, n_intervals):
 @app.callback(
     Output('volume-chart', 'figure'),
     [Input('time-period', 'value'),
-     Input('interval-component', 'n_intervals')]
+     Input('data-version', 'data')]
 )
-def update_volume_chart(time_period, n_intervals):
-    # Filter data based on time period (same logic as price chart)
-    end_date = price_data.index[-1] if not price_data.empty else datetime.now()
-    
-    if time_period == '1M':
-        start_date = end_date - timedelta(days=30)
-    elif time_period == '3M':
-        start_date = end_date - timedelta(days=90)
-    elif time_period == '6M':
-        start_date = end_date - timedelta(days=180)
-    elif time_period == '1Y':
-        start_date = end_date - timedelta(days=365)
-    elif time_period == '2Y':
-        start_date = end_date - timedelta(days=730)
-    else:  # ALL
-        start_date = price_data.index[0] if not price_data.empty else datetime.now() - timedelta(days=365)
-    
-    filtered_data = price_data[price_data.index >= start_date] if not price_data.empty else pd.DataFrame()
+def update_volume_chart(time_period, data_version):
+    snap = snapshot
+    return figure_cache.get_or_build(('volume', snap.version, time_period),
+                                     lambda: build_volume_chart(snap, time_period))
+
+def build_volume_chart(snap, time_period):
+    filtered_data = snap.period(time_period)
     
     fig = go.Figure()
     
     if not filtered_data.empty:
+        # Average daily volume per bar, so the bars share the moving average's scale
+        bars = aggregate_ohlc(filtered_data, candle_count(HALF_WIDTH_PX), volume='mean')
         fig.add_trace(go.Bar(
-            x=filtered_data.index,
-            y=filtered_data['Volume'],
+            x=bars.index,
+            y=bars['Volume'],
             name='Volume',
             marker_color='lightblue'
         ))
         
         # Add volume moving average
         if len(filtered_data) > 20:
-            vol_ma = filtered_data['Volume'].rolling(window=20).mean()
+            volume_ma = downsample_line(filtered_data['Volume_SMA'], HALF_WIDTH_PX)
             fig.add_trace(go.Scatter(
-                x=filtered_data.index,
-                y=vol_ma,
+                x=volume_ma.index,
+                y=volume_ma,
                 mode='lines',
                 name='20-day Vol MA',
                 line=dict(color='red', width=2)
@@ -290,33 +425,16 @@ def update_volume_chart(time_period, n_intervals):
 @app.callback(
     Output('technical-indicators', 'figure'),
     [Input('time-period', 'value'),
-     Input('interval-component', 'n_intervals')]
+     Input('data-version', 'data')]
 )
-def update_technical_indicators(time_period, n_intervals):
-    # Calculate RSI
-    if not price_data.empty:
-        delta = price_data['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        # Filter based on time period
-        end_date = price_data.index[-1]
-        if time_period == '1M':
-            start_date = end_date - timedelta(days=30)
-        elif time_period == '3M':
-            start_date = end_date - timedelta(days=90)
-        elif time_period == '6M':
-            start_date = end_date - timedelta(days=180)
-        elif time_period == '1Y':
-            start_date = end_date - timedelta(days=365)
-        elif time_period == '2Y':
-            start_date = end_date - timedelta(days=730)
-        else:  # ALL
-            start_date = price_data.index[0]
-        
-        filtered_rsi = rsi[rsi.index >= start_date]
+def update_technical_indicators(time_period, data_version):
+    snap = snapshot
+    return figure_cache.get_or_build(('rsi', snap.version, time_period),
+                                     lambda: build_technical_indicators(snap, time_period))
+
+def build_technical_indicators(snap, time_period):
+    if not snap.price_data.empty:
+        filtered_rsi = downsample_line(snap.period(time_period)['RSI'], HALF_WIDTH_PX)
         
         fig = go.Figure()
         
@@ -349,9 +467,14 @@ def update_technical_indicators(time_period, n_intervals):
 # Callback for peer comparison
 @app.callback(
     Output('peer-comparison', 'figure'),
-    [Input('interval-component', 'n_intervals')]
+    [Input('data-version', 'data')]
 )
-def update_peer_comparison(n_intervals):
+def update_peer_comparison(data_version):
+    snap = snapshot
+    return figure_cache.get_or_build(('peers', snap.version), lambda: build_peer_comparison(snap))
+
+def build_peer_comparison(snap):
+    peer_data = snap.peer_data
     fig = go.Figure()
     
     if peer_data:
@@ -388,18 +511,18 @@ def update_peer_comparison(n_intervals):
 # Callback for risk metrics
 @app.callback(
     Output('risk-metrics', 'figure'),
-    [Input('interval-component', 'n_intervals')]
+    [Input('data-version', 'data')]
 )
-def update_risk_metrics(n_intervals):
-    fig = go.Figure()
+def update_risk_metrics(data_version):
+    snap = snapshot
+    return figure_cache.get_or_build(('risk', snap.version), lambda: build_risk_metrics(snap))
+
+def build_risk_metrics(snap):
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
     
-    if not price_data.empty:
-        # Calculate rolling volatility
-        returns = price_data['Close'].pct_change().dropna()
-        rolling_vol = returns.rolling(30).std() * np.sqrt(252) * 100  # Annualized
-        
-        # Show last year of volatility
-        recent_vol = rolling_vol.tail(252)
+    if not snap.price_data.empty:
+        # Annualized 30-day rolling volatility, last year
+        recent_vol = (snap.indicators['Volatility_30D'] * 100).tail(252)
         
         fig.add_trace(go.Scatter(
             x=recent_vol.index,
@@ -408,28 +531,80 @@ def update_risk_metrics(n_intervals):
             name='30D Rolling Volatility (%)',
             line=dict(color='orange', width=2),
             fill='tonexty'
-        ))
+        ), secondary_y=False)
         
         # Add average volatility line
         avg_vol = recent_vol.mean()
         fig.add_hline(y=avg_vol, line_dash="dash", line_color="red", 
                      annotation_text=f"Avg: {avg_vol:.1f}%")
+        
+        # One-year historical VaR and CVaR of daily returns
+        recent_risk = snap.risk.tail(252)
+        for column, name, color in ((f'VaR_95_{DEFAULT_WINDOW}D', '1Y VaR 95% (daily %)', 'purple'),
+                                    (f'CVaR_95_{DEFAULT_WINDOW}D', '1Y CVaR 95% (daily %)', 'darkred')):
+            fig.add_trace(go.Scatter(
+                x=recent_risk.index,
+                y=recent_risk[column],
+                mode='lines',
+                name=name,
+                line=dict(color=color, width=1.5, dash='dot')
+            ), secondary_y=True)
     
     fig.update_layout(
-        title='30-Day Rolling Volatility',
-        yaxis_title='Volatility (%)',
+        title='30-Day Rolling Volatility & Historical VaR',
         xaxis_title='Date',
         template='plotly_white'
     )
+    fig.update_yaxes(title_text='Volatility (%)', secondary_y=False)
+    fig.update_yaxes(title_text='Daily Return (%)', secondary_y=True)
+    
+    return fig
+
+# Callback for peer correlation
+@app.callback(
+    Output('peer-correlation', 'figure'),
+    [Input('data-version', 'data')]
+)
+def update_peer_correlation(data_version):
+    snap = snapshot
+    return figure_cache.get_or_build(('correlation', snap.version), lambda: build_peer_correlation(snap))
+
+def build_peer_correlation(snap):
+    correlation = snap.correlation['correlation']
+    fig = go.Figure()
+    
+    if not correlation.empty:
+        fig.add_trace(go.Heatmap(
+            x=list(correlation.columns),
+            y=list(correlation.index),
+            z=correlation.to_numpy(),
+            zmin=-1, zmax=1,
+            colorscale='RdBu',
+            reversescale=True,
+            text=correlation.round(2).to_numpy(),
+            texttemplate='%{text}',
+            colorbar=dict(title='Correlation')
+        ))
+    
+    fig.update_layout(
+        title=f"Peer Return Correlation (1Y daily, {snap.correlation['observations']} days, "
+              f"covariance shrinkage {snap.correlation['shrinkage']:.2f})",
+        template='plotly_white'
+    )
     
     return fig
 
 # Callback for performance table
 @app.callback(
     Output('performance-table', 'children'),
-    [Input('interval-component', 'n_intervals')]
+    [Input('data-version', 'data')]
 )
-def update_performance_table(n_intervals):
+def update_performance_table(data_version):
+    snap = snapshot
+    return figure_cache.get_or_build(('performance', snap.version), lambda: build_performance_table(snap))
+
+def build_performance_table(snap):
+    price_data = snap.price_data
     if price_data.empty:
         return html.Div("No data available")
     
@@ -472,9 +647,14 @@ def update_performance_table(n_intervals):
 # Callback for peer table
 @app.callback(
     Output('peer-table', 'children'),
-    [Input('interval-component', 'n_intervals')]
+    [Input('data-version', 'data')]
 )
-def update_peer_table(n_intervals):
+def update_peer_table(data_version):
+    snap = snapshot
+    return figure_cache.get_or_build(('peer-table', snap.version), lambda: build_peer_table(snap))
+
+def build_peer_table(snap):
+    peer_data = snap.peer_data
     if not peer_data:
         return html.Div("No peer data available")
     
@@ -521,5 +701,9 @@ if __name__ == '__main__':
     print("Starting Barrick Gold Interactive Dashboard...")
     print("Dashboard will be available at: http://127.0.0.1:8050")
     print("Press Ctrl+C to stop the server")
+    print("For many users, run the production server instead: "
+          "gunicorn -c python:src.dashboard.gunicorn_conf src.dashboard.wsgi:server")
+    
+    refresher.start()
     
-    app.run_server(debug=True, host='127.0.0.1', port=8050)
\ No newline at end of file
+    app.run(debug=True, host='127.0.0.1', port=8050)
\ No newline at end of file
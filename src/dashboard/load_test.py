@@ -0,0 +1,184 @@
+"""
+Load test for the production dashboard
+
+Starts the gunicorn server with each requested worker count, replays the
+callback requests a page view makes (every chart for a random time period
+and chart type) from concurrent clients, and reports throughput and callback
+latency:
+
+    python -m src.dashboard.load_test --workers 1 2 4 --clients 16 --requests 600
+
+Pass --url to test a server that is already running instead.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import requests
+
+# Values the simulated analysts pick for each control
+CONTROL_VALUES = {
+    'time-period': ['1M', '3M', '6M', '1Y', '2Y', 'ALL'],
+    'chart-type': ['candlestick', 'line', 'ohlc'],
+}
+
+def _find_prop(node: Any, component_id: str, prop: str) -> Any:
+    """Property of a component anywhere in a serialized layout"""
+    if isinstance(node, dict):
+        props = node.get('props', {})
+        if props.get('id') == component_id:
+            return props.get(prop)
+        for child in props.values():
+            found = _find_prop(child, component_id, prop)
+            if found is not None:
+                return found
+    elif isinstance(node, list):
+        for child in node:
+            found = _find_prop(child, component_id, prop)
+            if found is not None:
+                return found
+    return None
+
+class DashboardClient:
+    """Builds and sends Dash callback requests against one server"""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip('/')
+        layout = requests.get(f"{self.url}/_dash-layout", timeout=30).json()
+        dependencies = requests.get(f"{self.url}/_dash-dependencies", timeout=30).json()
+        self.data_version = _find_prop(layout, 'data-version', 'data')
+        # Callbacks driven by the controls and the data version; interval callbacks are left out
+        self.callbacks = [c for c in dependencies
+                          if all(i['id'] in CONTROL_VALUES or i['id'] == 'data-version' for i in c['inputs'])]
+
+    def _value(self, component_id: str, rng: random.Random) -> Any:
+        if component_id == 'data-version':
+            return self.data_version
+        return rng.choice(CONTROL_VALUES[component_id])
+
+    def payload(self, callback: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+        component_id, prop = callback['output'].rsplit('.', 1)
+        inputs = [dict(i, value=self._value(i['id'], rng)) for i in callback['inputs']]
+        return {
+            'output': callback['output'],
+            'outputs': {'id': component_id, 'property': prop},
+            'inputs': inputs,
+            'state': [dict(s, value=self._value(s['id'], rng)) for s in callback['state']],
+            'changedPropIds': [f"{i['id']}.{i['property']}" for i in inputs],
+        }
+
+    def page_view(self, session: requests.Session, rng: random.Random) -> List[float]:
+        """Fire every chart callback once; returns each request's latency in seconds"""
+        latencies = []
+        for callback in self.callbacks:
+            start = time.perf_counter()
+            response = session.post(f"{self.url}/_dash-update-component",
+                                    json=self.payload(callback, rng), timeout=120)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+def run_load(url: str, clients: int, total_requests: int, seed: int = 0) -> Dict[str, float]:
+    """Replay page views from ``clients`` threads until ``total_requests`` callbacks were served"""
+    client = DashboardClient(url)
+    views = max(1, total_requests // max(1, len(client.callbacks)))
+    errors = []
+
+    def worker(index: int) -> List[float]:
+        rng = random.Random(seed * 1000 + index)
+        session = requests.Session()
+        latencies = []
+        for _ in range(index, views, clients):
+            try:
+                latencies.extend(client.page_view(session, rng))
+            except requests.RequestException as e:
+                errors.append(str(e))
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        latencies = [l for result in pool.map(worker, range(clients)) for l in result]
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies) if latencies else np.array([np.nan])
+    return {
+        'requests': int(np.isfinite(latencies).sum()),
+        'errors': len(errors),
+        'seconds': elapsed,
+        'requests_per_second': np.isfinite(latencies).sum() / elapsed,
+        'p50_ms': float(np.nanpercentile(latencies, 50) * 1000),
+        'p95_ms': float(np.nanpercentile(latencies, 95) * 1000),
+    }
+
+def start_server(workers: int, port: int, cache_path: str) -> subprocess.Popen:
+    """Launch gunicorn with ``workers`` workers and wait until it answers"""
+    env = dict(os.environ, DASHBOARD_WORKERS=str(workers), DASHBOARD_BIND=f"127.0.0.1:{port}",
+               DASHBOARD_CACHE_PATH=cache_path)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'python:src.dashboard.gunicorn_conf',
+         'src.dashboard.wsgi:server'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {process.returncode}")
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/_dash-layout", timeout=2).ok:
+                return process
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("gunicorn did not start within 120s")
+
+def stop_server(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+def _remove_cache(path: str):
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+def _report(label: str, result: Dict[str, float]):
+    print(f"{label:>12}  {result['requests']:6d} req  {result['requests_per_second']:8.1f} req/s  "
+          f"p50 {result['p50_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms  errors {result['errors']}")
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--clients', type=int, default=16, help='concurrent simulated analysts')
+    parser.add_argument('--requests', type=int, default=600, help='callback requests per run')
+    parser.add_argument('--port', type=int, default=8051)
+    parser.add_argument('--url', help='test this running server instead of starting gunicorn')
+    args = parser.parse_args(argv)
+
+    print(f"{args.clients} clients, {args.requests} callback requests per run")
+    if args.url:
+        _report('server', run_load(args.url, args.clients, args.requests))
+        return
+
+    for workers in args.workers:
+        # A fresh cache per run, so every run starts cold
+        cache_path = os.path.join('data', 'cache', f"load_test_{workers}w.sqlite3")
+        _remove_cache(cache_path)
+        process = start_server(workers, args.port, cache_path)
+        try:
+            _report(f"{workers} workers", run_load(f"http://127.0.0.1:{args.port}", args.clients, args.requests))
+        finally:
+            stop_server(process)
+            _remove_cache(cache_path)
+
+if __name__ == "__main__":
+    main()
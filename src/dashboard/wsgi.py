@@ -0,0 +1,24 @@
+"""
+Production entry point for the dashboard
+
+Serve the Flask server behind the Dash app with a multi-worker WSGI server:
+
+    gunicorn -c python:src.dashboard.gunicorn_conf src.dashboard.wsgi:server
+
+Each worker imports this module on its own (no preloading), maps the price
+data from the Arrow store instead of parsing a private copy, and runs its
+own snapshot refresher. Data versions are content hashes, so every worker
+agrees on them, and callback outputs are shared through a SQLite cache:
+a chart rendered by one worker is served by all of them.
+"""
+
+import os
+
+# Must be set before the data loader and dashboard modules are imported
+os.environ.setdefault('DATA_ZERO_COPY', '1')
+os.environ.setdefault('DASHBOARD_CACHE_PATH', 'data/cache/dashboard_callbacks.sqlite3')
+
+from src.dashboard.interactive_dashboard import app, refresher
+
+server = app.server
+refresher.start()
@@ -1,20 +1,40 @@
 import os
+import argparse
+import asyncio
 import pandas as pd
 import json
 from datetime import datetime
 from dotenv import load_dotenv
-from api import AlphaVantageClient, PolygonClient, FMPClient, FREDClient, NewsClient
+from price_history import update_price_history
+from data_store import write_peer_prices
+from instrumentation import instrumented, record_error, register_counters, stage
+from api import AlphaVantageClient, PolygonClient, FMPClient, FREDClient, NewsClient, AsyncAPIClient, connection_stats, response_cache
 
 # Load environment variables
 load_dotenv()
 
+def _http_counters():
+    """API requests and bytes downloaded over every pooled host"""
+    hosts = connection_stats().values()
+    return {
+        'requests': sum(host['requests'] for host in hosts),
+        'bytes_received': sum(host['bytes_received'] for host in hosts),
+    }
+
+register_counters('http', _http_counters)
+register_counters('response_cache', lambda: {key: response_cache.stats()[key]
+                                             for key in ('hits', 'misses', 'revalidated')})
+
 class BarrickDataCollector:
     """Main data collection orchestrator for Barrick Gold analysis"""
     
-    def __init__(self):
+    def __init__(self, incremental: bool = True):
         self.symbol = "GOLD"  # Barrick Gold Corporation
         self.company_name = "Barrick Gold Corporation"
         
+        # Only fetch price bars missing from the stored history
+        self.incremental = incremental
+        
         # Initialize API clients
         self.alpha_vantage = AlphaVantageClient(os.getenv('ALPHAVANTAGE_API_KEY'))
         self.polygon = PolygonClient(os.getenv('POLYGON_API_KEY'))
@@ -26,8 +46,12 @@ class BarrickDataCollector:
         self.raw_data_path = "data/raw"
         self.processed_data_path = "data/processed"
         
-    def collect_all_data(self):
+    @instrumented('collect')
+    def collect_all_data(self, mode: str = "sync"):
         """Collect all data sources for comprehensive analysis"""
+        if mode == "async":
+            return asyncio.run(self.collect_all_data_async())
+            
         print(f"Starting comprehensive data collection for {self.company_name} ({self.symbol})")
         
         # Company fundamentals
@@ -47,121 +71,119 @@ class BarrickDataCollector:
         
         print("Data collection completed successfully!")
         
-    def _collect_company_data(self):
-        """Collect company overview and profile data"""
-        print("Collecting company overview data...")
+    async def collect_all_data_async(self):
+        """Collect all data sources with every provider running concurrently"""
+        print(f"Starting concurrent data collection for {self.company_name} ({self.symbol})")
         
-        # Alpha Vantage company overview
-        av_overview = self.alpha_vantage.get_company_overview(self.symbol)
-        self._save_json(av_overview, f"{self.raw_data_path}/av_company_overview.json")
+        # Providers are independent, so a run lasts as long as the slowest one
+        jobs_by_provider = {}
+        for jobs in self._collection_plan().values():
+            for job in jobs:
+                jobs_by_provider.setdefault(job[0], []).append(job)
+                
+        await asyncio.gather(*(
+            self._collect_provider_async(provider, jobs)
+            for provider, jobs in jobs_by_provider.items()
+        ))
         
-        # FMP company profile
-        fmp_profile = self.fmp.get_company_overview(self.symbol)
-        self._save_json(fmp_profile, f"{self.raw_data_path}/fmp_company_profile.json")
+        print("Data collection completed successfully!")
         
-        # Polygon company details
-        polygon_details = self.polygon.get_company_overview(self.symbol)
-        self._save_json(polygon_details, f"{self.raw_data_path}/polygon_company_details.json")
+    async def _collect_provider_async(self, provider: str, jobs):
+        """Run one provider's requests concurrently within its own rate limit"""
+        async with AsyncAPIClient(getattr(self, provider)) as client:
+            await asyncio.gather(*(client.run(self._execute_job, job) for job in jobs))
+            
+    def _collection_plan(self):
+        """Collection jobs by category as (provider, client method, args, output file)"""
+        symbol = self.symbol
+        return {
+            'company': [
+                ('alpha_vantage', 'get_company_overview', (symbol,), 'av_company_overview.json'),
+                ('fmp', 'get_company_overview', (symbol,), 'fmp_company_profile.json'),
+                ('polygon', 'get_company_overview', (symbol,), 'polygon_company_details.json'),
+            ],
+            'market': [
+                ('alpha_vantage', 'get_price_data', (symbol, "5year"), 'av_daily_prices.csv'),
+                ('polygon', 'get_price_data', (symbol, "5year"), 'polygon_daily_prices.csv'),
+                ('fmp', 'get_price_data', (symbol, "5year"), 'fmp_daily_prices.csv'),
+            ],
+            'financial': [
+                ('alpha_vantage', 'get_income_statement', (symbol,), 'av_income_statement.json'),
+                ('alpha_vantage', 'get_balance_sheet', (symbol,), 'av_balance_sheet.json'),
+                ('alpha_vantage', 'get_cash_flow', (symbol,), 'av_cash_flow.json'),
+                ('alpha_vantage', 'get_earnings', (symbol,), 'av_earnings.json'),
+                ('fmp', 'get_financial_statements', (symbol, "income-statement"), 'fmp_income_statement.json'),
+                ('fmp', 'get_financial_statements', (symbol, "balance-sheet-statement"), 'fmp_balance_sheet.json'),
+                ('fmp', 'get_financial_statements', (symbol, "cash-flow-statement"), 'fmp_cash_flow.json'),
+                ('fmp', 'get_ratios', (symbol,), 'fmp_ratios.json'),
+                ('fmp', 'get_key_metrics', (symbol,), 'fmp_key_metrics.json'),
+                ('fmp', 'get_dcf', (symbol,), 'fmp_dcf_valuation.json'),
+                ('fmp', 'get_enterprise_values', (symbol,), 'fmp_enterprise_values.json'),
+            ],
+            'economic': [
+                ('fred', 'get_gold_price', (), 'fred_gold_prices.csv'),
+                ('fred', 'get_inflation_rate', (), 'fred_inflation.csv'),
+                ('fred', 'get_interest_rates', (), 'fred_interest_rates.csv'),
+                ('fred', 'get_gdp_growth', (), 'fred_gdp_growth.csv'),
+                ('fred', 'get_unemployment_rate', (), 'fred_unemployment.csv'),
+                ('fred', 'get_dollar_index', (), 'fred_dollar_index.csv'),
+                ('fred', 'get_mining_production_index', (), 'fred_mining_production.csv'),
+            ],
+            'news': [
+                ('news', 'get_company_news', (self.company_name, symbol, 30), 'company_news.json'),
+                ('news', 'get_sector_news', ("mining", 14), 'sector_news.json'),
+                ('news', 'get_market_news', (7,), 'market_news.json'),
+            ]
+        }
+        
+    def _run_jobs(self, jobs):
+        """Run collection jobs one after another"""
+        for job in jobs:
+            self._execute_job(job)
+            
+    def _execute_job(self, job):
+        """Fetch one dataset and save it under data/raw"""
+        provider, method, args, filename = job
+        client_method = getattr(getattr(self, provider), method)
+        
+        with stage('fetch', provider=provider, dataset=filename):
+            # Price histories are extended in place rather than re-downloaded
+            if method == 'get_price_data' and self.incremental:
+                prices, mode = update_price_history(
+                    f"{self.raw_data_path}/{filename}",
+                    lambda start_date: client_method(*args, start_date=start_date)
+                )
+                print(f"{filename}: {mode} update, {len(prices)} bars stored")
+                return
+                
+            self._save_result(client_method(*args), filename)
+            
+    def _collect_company_data(self):
+        """Collect company overview and profile data"""
+        print("Collecting company overview data...")
+        self._run_jobs(self._collection_plan()['company'])
         
     def _collect_market_data(self):
-        """Collect price and market data"""
+        """Collect price and market data (5 years of daily prices)"""
         print("Collecting market and price data...")
-        
-        # Alpha Vantage daily prices (5 years)
-        av_prices = self.alpha_vantage.get_price_data(self.symbol, "5year")
-        av_prices.to_csv(f"{self.raw_data_path}/av_daily_prices.csv")
-        
-        # Polygon daily prices (5 years)
-        polygon_prices = self.polygon.get_price_data(self.symbol, "5year")
-        polygon_prices.to_csv(f"{self.raw_data_path}/polygon_daily_prices.csv")
-        
-        # FMP historical prices (5 years)
-        fmp_prices = self.fmp.get_price_data(self.symbol, "5year")
-        fmp_prices.to_csv(f"{self.raw_data_path}/fmp_daily_prices.csv")
+        self._run_jobs(self._collection_plan()['market'])
         
     def _collect_financial_data(self):
         """Collect financial statements and key metrics"""
         print("Collecting financial statements and metrics...")
-        
-        # Alpha Vantage financial statements
-        av_income = self.alpha_vantage.get_income_statement(self.symbol)
-        self._save_json(av_income, f"{self.raw_data_path}/av_income_statement.json")
-        
-        av_balance = self.alpha_vantage.get_balance_sheet(self.symbol)
-        self._save_json(av_balance, f"{self.raw_data_path}/av_balance_sheet.json")
-        
-        av_cashflow = self.alpha_vantage.get_cash_flow(self.symbol)
-        self._save_json(av_cashflow, f"{self.raw_data_path}/av_cash_flow.json")
-        
-        av_earnings = self.alpha_vantage.get_earnings(self.symbol)
-        self._save_json(av_earnings, f"{self.raw_data_path}/av_earnings.json")
-        
-        # FMP financial data
-        fmp_income = self.fmp.get_financial_statements(self.symbol, "income-statement")
-        self._save_json(fmp_income, f"{self.raw_data_path}/fmp_income_statement.json")
-        
-        fmp_balance = self.fmp.get_financial_statements(self.symbol, "balance-sheet-statement")
-        self._save_json(fmp_balance, f"{self.raw_data_path}/fmp_balance_sheet.json")
-        
-        fmp_cashflow = self.fmp.get_financial_statements(self.symbol, "cash-flow-statement")
-        self._save_json(fmp_cashflow, f"{self.raw_data_path}/fmp_cash_flow.json")
-        
-        # FMP ratios and metrics
-        fmp_ratios = self.fmp.get_ratios(self.symbol)
-        self._save_json(fmp_ratios, f"{self.raw_data_path}/fmp_ratios.json")
-        
-        fmp_metrics = self.fmp.get_key_metrics(self.symbol)
-        self._save_json(fmp_metrics, f"{self.raw_data_path}/fmp_key_metrics.json")
-        
-        fmp_dcf = self.fmp.get_dcf(self.symbol)
-        self._save_json(fmp_dcf, f"{self.raw_data_path}/fmp_dcf_valuation.json")
-        
-        fmp_enterprise = self.fmp.get_enterprise_values(self.symbol)
-        self._save_json(fmp_enterprise, f"{self.raw_data_path}/fmp_enterprise_values.json")
+        self._run_jobs(self._collection_plan()['financial'])
         
     def _collect_economic_data(self):
         """Collect relevant economic indicators"""
         print("Collecting economic indicators...")
-        
-        # Gold prices
-        gold_prices = self.fred.get_gold_price()
-        gold_prices.to_csv(f"{self.raw_data_path}/fred_gold_prices.csv")
-        
-        # Economic indicators
-        inflation = self.fred.get_inflation_rate()
-        inflation.to_csv(f"{self.raw_data_path}/fred_inflation.csv")
-        
-        interest_rates = self.fred.get_interest_rates()
-        interest_rates.to_csv(f"{self.raw_data_path}/fred_interest_rates.csv")
-        
-        gdp_growth = self.fred.get_gdp_growth()
-        gdp_growth.to_csv(f"{self.raw_data_path}/fred_gdp_growth.csv")
-        
-        unemployment = self.fred.get_unemployment_rate()
-        unemployment.to_csv(f"{self.raw_data_path}/fred_unemployment.csv")
-        
-        dollar_index = self.fred.get_dollar_index()
-        dollar_index.to_csv(f"{self.raw_data_path}/fred_dollar_index.csv")
-        
-        mining_production = self.fred.get_mining_production_index()
-        mining_production.to_csv(f"{self.raw_data_path}/fred_mining_production.csv")
+        self._run_jobs(self._collection_plan()['economic'])
         
     def _collect_news_data(self):
         """Collect news and sentiment data"""
         print("Collecting news and sentiment data...")
+        self._run_jobs(self._collection_plan()['news'])
         
-        # Company-specific news
-        company_news = self.news.get_company_news(self.company_name, self.symbol, 30)
-        self._save_json(company_news, f"{self.raw_data_path}/company_news.json")
-        
-        # Sector news
-        sector_news = self.news.get_sector_news("mining", 14)
-        self._save_json(sector_news, f"{self.raw_data_path}/sector_news.json")
-        
-        # Market news
-        market_news = self.news.get_market_news(7)
-        self._save_json(market_news, f"{self.raw_data_path}/market_news.json")
-        
+    @instrumented('collect', dataset='peer_analysis_data')
     def collect_peer_data(self):
         """Collect peer company data for benchmarking"""
         print("Collecting peer company data...")
@@ -174,6 +196,7 @@ class BarrickDataCollector:
             peers = ['NEM', 'AEM', 'KGC', 'AU', 'EGO', 'GG', 'HMY']  # Major gold miners
             
         peer_data = {}
+        peer_prices = {}
         
         for peer in peers[:10]:  # Limit to top 10 peers
             try:
@@ -186,22 +209,31 @@ class BarrickDataCollector:
                 peer_ratios = self.fmp.get_ratios(peer)
                 peer_metrics = self.fmp.get_key_metrics(peer)
                 
-                # Price data (1 year)
-                peer_prices = self.fmp.get_price_data(peer, "1year")
+                # Price data (1 year), stored as a columnar file per peer
+                peer_prices[peer] = self.fmp.get_price_data(peer, "1year")
                 
                 peer_data[peer] = {
                     'profile': peer_profile,
                     'ratios': peer_ratios,
-                    'metrics': peer_metrics,
-                    'prices': peer_prices.to_dict() if not peer_prices.empty else {}
+                    'metrics': peer_metrics
                 }
                 
             except Exception as e:
                 print(f"Error collecting data for {peer}: {e}")
+                record_error(e)
                 continue
                 
         self._save_json(peer_data, f"{self.raw_data_path}/peer_analysis_data.json")
-        
+        write_peer_prices('peer_analysis_data', peer_prices, self.raw_data_path)
+        
+    def _save_result(self, result, filename):
+        """Save a collected result under data/raw (DataFrames as CSV, everything else as JSON)"""
+        filepath = f"{self.raw_data_path}/{filename}"
+        if isinstance(result, pd.DataFrame):
+            result.to_csv(filepath)
+        else:
+            self._save_json(result, filepath)
+            
     def _save_json(self, data, filepath):
         """Save data as JSON file"""
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
@@ -227,8 +259,26 @@ class BarrickDataCollector:
         return summary
 
 if __name__ == "__main__":
-    collector = BarrickDataCollector()
-    collector.collect_all_data()
+    parser = argparse.ArgumentParser(description="Collect Barrick Gold data from all API providers")
+    parser.add_argument('--mode', choices=['sync', 'async'], default='sync',
+                        help="'async' queries all providers concurrently")
+    parser.add_argument('--full-refresh', action='store_true',
+                        help="Re-download full price histories instead of appending new bars")
+    args = parser.parse_args()
+    
+    collector = BarrickDataCollector(incremental=not args.full_refresh)
+    collector.collect_all_data(mode=args.mode)
     collector.collect_peer_data()
     summary = collector.get_data_summary()
-    print(f"Data collection completed: {summary}")
\ No newline at end of file
+    print(f"Data collection completed: {summary}")
+    
+    for host, stats in connection_stats().items():
+        print(f"{host}: {stats['requests']} requests, {stats['connections_reused']} reused connections")
+        
+    for name in ['alpha_vantage', 'polygon', 'fmp', 'fred', 'news']:
+        stats = getattr(collector, name).rate_limit_stats()
+        print(f"{name}: {stats['calls']} calls, {stats['total_wait']:.1f}s waiting on rate limits")
+        
+    cache = response_cache.stats()
+    print(f"Response cache: {cache['hits']} hits, {cache['misses']} misses, "
+          f"{cache['revalidated']} revalidated ({cache['entries']} entries, {cache['bytes']/1e6:.1f} MB)")
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""
+Process-wide memoized access to the collected datasets
+
+Every engine in a process (analysis, charts, PNG reports, dashboard, memo)
+loads its inputs through ``load_frame``/``load_json``, so each dataset is
+parsed once and shared. A dataset is reloaded when its source file changes:
+a new mtime or size triggers a content hash, and the parsed copy is only
+replaced when the content actually differs.
+
+Frames are handed out as copies of the shared frame and JSON documents as
+read-only mappings, so one consumer cannot change the data another one sees.
+The copies are shallow when pandas copy-on-write is on (always from pandas 3,
+or when the application enables it) and deep otherwise; the loader never
+changes pandas options itself.
+
+Set ``DATA_ZERO_COPY=1`` to hand out frames whose columns are read-only views
+of the memory-mapped Arrow store. Processes serving the same data (dashboard
+workers) then share one copy through the OS page cache; without copy-on-write
+each consumer still gets its own deep copy.
+"""
+
+import os
+import hashlib
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Optional
+import pandas as pd
+
+from src.data_store import RAW_DATA_DIR, STORE_DIR, read_frame, read_json, _raw_path, _store_path
+from src.instrumentation import register_counters
+
+# Map frames straight from the Arrow store instead of copying them into the process
+ZERO_COPY = os.getenv('DATA_ZERO_COPY', '0') == '1'
+
+def _copy_on_write() -> bool:
+    """Whether writes to a shallow copy leave the original alone (always from pandas 3)"""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return pd.get_option('mode.copy_on_write') is True
+
+def _freeze(value: Any) -> Any:
+    """Read-only version of a parsed JSON document"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class DataLoader:
+    """Memoizes parsed datasets, keyed by name and invalidated by file changes"""
+
+    def __init__(self, raw_dir: str = RAW_DATA_DIR, store_dir: str = STORE_DIR, zero_copy: bool = ZERO_COPY):
+        self.raw_dir = raw_dir
+        self.store_dir = store_dir
+        self.zero_copy = zero_copy
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'loads': 0, 'reloads': 0, 'revalidated': 0}
+
+    def _source_path(self, kind: str, name: str) -> str:
+        """File whose changes invalidate a dataset"""
+        if kind == 'json':
+            return _raw_path(name, 'json', self.raw_dir)
+        csv_path = _raw_path(name, 'csv', self.raw_dir)
+        return csv_path if os.path.exists(csv_path) else _store_path(name, self.store_dir)
+
+    def _load(self, kind: str, name: str, parse: Callable[[], Any]) -> Any:
+        path = self._source_path(kind, name)
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        key = (kind, name)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['stamp'] == stamp:
+                self._stats['hits'] += 1
+                return entry['value']
+
+            # Touched but unchanged files keep their parsed copy
+            content_hash = _file_hash(path)
+            if entry is not None and entry['hash'] == content_hash:
+                entry['stamp'] = stamp
+                self._stats['revalidated'] += 1
+                return entry['value']
+
+            value = parse()
+            self._entries[key] = {'stamp': stamp, 'hash': content_hash, 'value': value}
+            self._stats['reloads' if entry is not None else 'loads'] += 1
+            return value
+
+    def load_frame(self, name: str) -> pd.DataFrame:
+        """Shared time series, e.g. ``load_frame('abx_daily_prices')``"""
+        frame = self._load('frame', name,
+                           lambda: read_frame(name, raw_dir=self.raw_dir, store_dir=self.store_dir,
+                                              zero_copy=self.zero_copy))
+        return frame.copy(deep=not _copy_on_write())
+
+    def load_json(self, name: str) -> Any:
+        """Shared read-only JSON document, e.g. ``load_json('peer_comparison_data')``"""
+        return self._load('json', name, lambda: _freeze(read_json(name, raw_dir=self.raw_dir)))
+
+    def fingerprint(self, *names: str) -> str:
+        """Content hash over the given datasets as currently loaded"""
+        digest = hashlib.sha256()
+        with self._lock:
+            for key in sorted(k for k in self._entries if k[1] in names):
+                digest.update(f"{key[0]}:{key[1]}:{self._entries[key]['hash']};".encode())
+        return digest.hexdigest()
+
+    def invalidate(self, name: Optional[str] = None):
+        """Forget one dataset, or all of them"""
+        with self._lock:
+            for key in list(self._entries):
+                if name is None or key[1] == name:
+                    del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, datasets=sorted(k[1] for k in self._entries))
+
+data_loader = DataLoader()
+
+register_counters('data_loader', lambda: {key: value for key, value in data_loader.stats().items()
+                                          if key != 'datasets'})
+
+def load_frame(name: str) -> pd.DataFrame:
+    return data_loader.load_frame(name)
+
+def load_json(name: str) -> Any:
+    return data_loader.load_json(name)
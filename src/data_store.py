@@ -0,0 +1,295 @@
+"""
+Columnar data store for collected market data
+
+Time series collected as CSV under data/raw are converted to Arrow IPC files
+under data/store with a typed datetime index, float32 prices and int64
+volumes. Arrow IPC files are read through a memory map, so loading a frame
+does not parse text and large universes can be opened without reading every
+file into memory. JSON documents (company info, peer metrics, statements)
+stay in data/raw and are read through the same API.
+
+Peer price histories are collected without a CSV: each ticker gets its own
+Arrow file under data/raw/peer_prices/<document>/, listed in a small JSON
+index there, and ``PeerPriceStore`` maps only the tickers a caller asks for.
+
+Usage:
+    python -m src.data_store migrate     # convert every CSV in data/raw
+
+    store = PeerPriceStore('peer_analysis_data')
+    store.symbols                        # from the index; no price file opened
+    store.read('NEM', columns=['adjClose'])
+"""
+
+import os
+import re
+import sys
+import json
+import uuid
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+from typing import Any, Dict, List, Optional
+
+RAW_DATA_DIR = 'data/raw'
+STORE_DIR = 'data/store'
+
+# Per-ticker peer price files live under raw_dir/PEER_PRICE_DIR/<document>/
+PEER_PRICE_DIR = 'peer_prices'
+PEER_INDEX = 'index.json'
+
+# Columns that hold counts and are stored as int64 when they have no gaps
+INTEGER_COLUMNS = {'volume', 'transactions', 'n'}
+
+def _store_path(name: str, store_dir: str = STORE_DIR) -> str:
+    return os.path.join(store_dir, f"{name}.arrow")
+
+def _raw_path(name: str, extension: str, raw_dir: str = RAW_DATA_DIR) -> str:
+    return os.path.join(raw_dir, f"{name}.{extension}")
+
+def _parse_index(index) -> pd.Index:
+    """Datetime index where the labels are dates, otherwise the labels unchanged"""
+    try:
+        return pd.DatetimeIndex(pd.to_datetime(index))
+    except (ValueError, TypeError):
+        pass
+    try:
+        # yfinance writes mixed -04:00/-05:00 offsets across DST changes
+        return pd.DatetimeIndex(pd.to_datetime(index, utc=True))
+    except (ValueError, TypeError):
+        return index
+
+def _typed(df: pd.DataFrame) -> pd.DataFrame:
+    """Narrow numeric columns to float32, and count columns to int64"""
+    df = df.copy()
+    for column in df.columns:
+        values = df[column]
+        if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+            continue
+        if str(column).lower() in INTEGER_COLUMNS and values.notna().all() \
+                and np.all(np.mod(values.to_numpy(dtype=float), 1) == 0):
+            df[column] = values.astype(np.int64)
+        elif pd.api.types.is_float_dtype(values):
+            df[column] = values.astype(np.float32)
+        else:
+            df[column] = values.astype(np.int64)
+    df.columns = [str(c) for c in df.columns]
+    return df
+
+def read_csv_frame(path: str) -> pd.DataFrame:
+    """Parse a collected CSV into a typed frame (empty if the file has no data)"""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return pd.DataFrame()
+    try:
+        df = pd.read_csv(path, index_col=0)
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+    if df.empty:
+        return df
+    df.index = _parse_index(df.index)
+    if isinstance(df.index, pd.DatetimeIndex):
+        df = df.sort_index()
+    return _typed(df)
+
+def unique_temp_path(path: str) -> str:
+    """Temp file beside ``path`` for an atomic rewrite, unique to this writer
+
+    Every writer gets its own name, so two processes rewriting the same file
+    at once never write into one temp file; the last ``os.replace`` wins
+    with a complete file.
+    """
+    return f"{path}.{os.getpid()}.{uuid.uuid4().hex[:12]}.tmp"
+
+def write_frame(name: str, df: pd.DataFrame, store_dir: str = STORE_DIR) -> str:
+    """Write a frame to the store as an uncompressed Arrow IPC file"""
+    os.makedirs(store_dir, exist_ok=True)
+    path = _store_path(name, store_dir)
+    table = pa.Table.from_pandas(_typed(df), preserve_index=True)
+
+    # Write beside the target and rename so readers never see a partial file
+    tmp_path = unique_temp_path(path)
+    try:
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+def read_table(name: str, columns: Optional[List[str]] = None, memory_map: bool = True,
+               store_dir: str = STORE_DIR) -> pa.Table:
+    """Arrow table for a stored dataset, memory-mapped by default"""
+    path = _store_path(name, store_dir)
+    source = pa.memory_map(path, 'r') if memory_map else pa.OSFile(path, 'rb')
+    table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        metadata = table.schema.pandas_metadata or {}
+        index_columns = [c for c in metadata.get('index_columns', []) if isinstance(c, str)]
+        table = table.select(index_columns + [c for c in columns if c not in index_columns])
+    return table
+
+def _to_pandas(table: pa.Table, zero_copy: bool) -> pd.DataFrame:
+    """Frame from an Arrow table
+
+    With ``zero_copy`` every column gets its own block, so numeric columns
+    without gaps are read-only views of the table's buffers. For a memory-mapped
+    table that means the data stays in the OS page cache, shared by every
+    process that maps the same file, instead of being copied into each one.
+    """
+    if zero_copy:
+        return table.to_pandas(split_blocks=True)
+    return table.to_pandas()
+
+def _is_stale(name: str, raw_dir: str, store_dir: str) -> bool:
+    """Whether the collected CSV is newer than its converted copy"""
+    csv_path = _raw_path(name, 'csv', raw_dir)
+    store_path = _store_path(name, store_dir)
+    if not os.path.exists(store_path):
+        return True
+    return os.path.exists(csv_path) and os.path.getmtime(csv_path) > os.path.getmtime(store_path)
+
+def read_frame(name: str, columns: Optional[List[str]] = None, memory_map: bool = True,
+               raw_dir: str = RAW_DATA_DIR, store_dir: str = STORE_DIR,
+               zero_copy: bool = False) -> pd.DataFrame:
+    """Load a time series dataset, e.g. ``read_frame('abx_daily_prices')``
+
+    Reads the Arrow copy when it is up to date and converts the collected
+    CSV (refreshing the store) when the collectors have written a newer one.
+    With ``zero_copy`` the columns are read-only views of the memory-mapped
+    store file (see ``_to_pandas``).
+    """
+    if _is_stale(name, raw_dir, store_dir):
+        csv_path = _raw_path(name, 'csv', raw_dir)
+        if not os.path.exists(csv_path):
+            raise FileNotFoundError(f"No stored or collected data for {name}")
+        df = read_csv_frame(csv_path)
+        if df.empty:
+            return df
+        try:
+            write_frame(name, df, store_dir)
+        except OSError as e:
+            print(f"Could not update data store for {name}: {e}")
+            return df[columns] if columns is not None else df
+        if not (zero_copy and memory_map):
+            return df[columns] if columns is not None else df
+
+    return _to_pandas(read_table(name, columns, memory_map, store_dir), zero_copy and memory_map)
+
+def read_json(name: str, raw_dir: str = RAW_DATA_DIR) -> Any:
+    """Load a JSON document, e.g. ``read_json('peer_comparison_data')``"""
+    with open(_raw_path(name, 'json', raw_dir), 'r') as f:
+        return json.load(f)
+
+def _peer_dir(document: str, raw_dir: str = RAW_DATA_DIR) -> str:
+    return os.path.join(raw_dir, PEER_PRICE_DIR, document)
+
+def _peer_file_name(symbol: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '_', symbol.lower())
+
+def _read_peer_index(directory: str) -> Dict[str, Dict[str, Any]]:
+    path = os.path.join(directory, PEER_INDEX)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def write_peer_prices(document: str, prices: Dict[str, pd.DataFrame], raw_dir: str = RAW_DATA_DIR,
+                      merge: bool = False) -> Dict[str, Dict[str, Any]]:
+    """Store each peer's price history as its own Arrow file and rewrite the document's index
+
+    The index lists, per symbol, the file name, row count, first and last
+    bar and the stored columns, so callers can see what was collected without
+    opening any price file. Symbols with no bars are left out. With ``merge``
+    the symbols already in the index are kept, so a collection can store its
+    prices batch by batch.
+    """
+    directory = _peer_dir(document, raw_dir)
+    index = _read_peer_index(directory) if merge else {}
+    for symbol, df in prices.items():
+        if df is None or df.empty:
+            continue
+        df = df.copy()
+        df.index = _parse_index(df.index)
+        if isinstance(df.index, pd.DatetimeIndex):
+            df = df.sort_index()
+        name = _peer_file_name(symbol)
+        write_frame(name, df, directory)
+        index[symbol] = {
+            'file': os.path.basename(_store_path(name, directory)),
+            'rows': len(df),
+            'start': str(df.index[0]),
+            'end': str(df.index[-1]),
+            'columns': [str(c) for c in df.columns],
+        }
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, PEER_INDEX)
+    tmp_path = unique_temp_path(path)
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return index
+
+class PeerPriceStore:
+    """Peer price histories of one peer document, read per ticker on demand
+
+    Only the index is read up front; each ``read`` memory-maps that one
+    ticker's file, so opening a large universe to chart three names costs
+    three small reads.
+    """
+
+    def __init__(self, document: str, raw_dir: str = RAW_DATA_DIR):
+        self.document = document
+        self.directory = _peer_dir(document, raw_dir)
+        self.index = _read_peer_index(self.directory)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.index)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.index
+
+    def metadata(self, symbol: str) -> Dict[str, Any]:
+        """Index entry for one ticker: file, rows, start, end and columns"""
+        return self.index[symbol]
+
+    def read(self, symbol: str, columns: Optional[List[str]] = None,
+             zero_copy: bool = False) -> pd.DataFrame:
+        """One ticker's price history, optionally only some columns"""
+        if symbol not in self.index:
+            raise KeyError(f"No stored peer prices for {symbol} in {self.document}")
+        name = self.index[symbol]['file'][:-len('.arrow')]
+        return _to_pandas(read_table(name, columns, store_dir=self.directory), zero_copy)
+
+def migrate(raw_dir: str = RAW_DATA_DIR, store_dir: str = STORE_DIR) -> Dict[str, int]:
+    """Convert every CSV under ``raw_dir`` into the store; returns rows per dataset"""
+    converted = {}
+    for filename in sorted(os.listdir(raw_dir)):
+        if not filename.endswith('.csv'):
+            continue
+        name = filename[:-len('.csv')]
+        df = read_csv_frame(os.path.join(raw_dir, filename))
+        if df.empty:
+            print(f"  skipped {filename} (no data)")
+            continue
+        write_frame(name, df, store_dir)
+        converted[name] = len(df)
+        print(f"  {filename} -> {_store_path(name, store_dir)} ({len(df)} rows)")
+    return converted
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != 'migrate':
+        print("Usage: python -m src.data_store migrate [raw_dir] [store_dir]")
+        sys.exit(1)
+
+    raw_dir = sys.argv[2] if len(sys.argv) > 2 else RAW_DATA_DIR
+    store_dir = sys.argv[3] if len(sys.argv) > 3 else STORE_DIR
+    print(f"Converting {raw_dir} into {store_dir}...")
+    converted = migrate(raw_dir, store_dir)
+    print(f"Migration completed: {len(converted)} datasets converted")
@@ -0,0 +1,308 @@
+"""
+Timing and profiling of pipeline stages
+
+Stages are marked with a decorator or a context manager:
+
+    @instrumented('memo')
+    def generate_comprehensive_memo(self): ...
+
+    with stage('fetch', dataset='fmp_ratios.json'):
+        ...
+
+Instrumentation is off by default, and then a marked call costs one flag
+check. Setting ``PIPELINE_TRACE`` to a path turns it on for the whole run and
+writes a JSON trace there at exit (``{pid}`` in the path is replaced, so
+several processes started with the same setting keep separate traces);
+``PIPELINE_PROFILE`` adds a cProfile dump of the
+main thread, readable with ``python -m pstats`` or as a flame graph with
+snakeviz/flameprof. ``PIPELINE_TRACE_MEMORY=0`` skips memory tracing, which
+slows allocation-heavy code.
+
+    PIPELINE_TRACE=reports/trace.json PIPELINE_PROFILE=reports/run.prof python generate_investment_memo.py
+
+For every stage the trace records wall time, CPU time, peak traced memory,
+any exception that escaped it, and how much every registered counter moved
+while it ran: modules register their API call, byte and cache counters with
+``register_counters``.
+
+Print a trace's per-stage totals, or measure the overhead with no trace:
+    python -m src.instrumentation [trace.json]
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import cProfile
+import threading
+import tracemalloc
+from contextlib import nullcontext
+from datetime import datetime
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+
+TRACE_ENV = 'PIPELINE_TRACE'
+PROFILE_ENV = 'PIPELINE_PROFILE'
+MEMORY_ENV = 'PIPELINE_TRACE_MEMORY'
+
+_NULL_STAGE = nullcontext()
+
+class _Tracer:
+    """Open stages per thread, finished stage records and the counter sources"""
+
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.trace_path = None
+        self.profile_path = None
+        self.profiler = None
+        self.started = None
+        self.started_at = None
+        self.cpu_started = None
+        self.records = []
+        self.counters = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def stack(self) -> List['_Stage']:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def read_counters(self) -> Dict[str, Dict[str, float]]:
+        values = {}
+        for name, read in list(self.counters.items()):
+            try:
+                values[name] = read()
+            except Exception as e:
+                print(f"Could not read {name} counters: {e}")
+        return values
+
+    def fold_peak(self):
+        """Credit the traced-memory peak since the last stage boundary to every open stage
+
+        tracemalloc keeps a single peak, so it is reset at each boundary and
+        the open stages keep their own maxima.
+        """
+        if not self.memory:
+            return
+        peak = tracemalloc.get_traced_memory()[1]
+        for open_stage in self.stack():
+            open_stage.peak = max(open_stage.peak, peak)
+        tracemalloc.reset_peak()
+
+_tracer = _Tracer()
+
+def _counter_deltas(before: Dict[str, Dict[str, float]], after: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    deltas = {}
+    for name, values in after.items():
+        changed = {key: value - before.get(name, {}).get(key, 0) for key, value in values.items()}
+        changed = {key: value for key, value in changed.items() if value}
+        if changed:
+            deltas[name] = changed
+    return deltas
+
+class _Stage:
+    """One running stage; becomes a trace record when it exits"""
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.peak = 0
+        self.error = None
+
+    def __enter__(self):
+        _tracer.fold_peak()
+        stack = _tracer.stack()
+        self.parent = stack[-1].name if stack else None
+        self.depth = len(stack)
+        stack.append(self)
+        self.counters = _tracer.read_counters()
+        self.start = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.start
+        cpu = time.process_time() - self.cpu
+        counters = _counter_deltas(self.counters, _tracer.read_counters())
+        _tracer.fold_peak()
+        _tracer.stack().pop()
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        record = {
+            'name': self.name,
+            'parent': self.parent,
+            'depth': self.depth,
+            'thread': threading.current_thread().name,
+            'start_s': round(self.start - _tracer.started, 6),
+            'wall_s': round(wall, 6),
+            'cpu_s': round(cpu, 6),
+            'peak_memory_mb': round(self.peak / 1e6, 3) if _tracer.memory else None,
+            'counters': counters,
+            'attrs': self.attrs,
+            'error': self.error,
+        }
+        with _tracer._lock:
+            _tracer.records.append(record)
+        return False
+
+def stage(name: str, **attrs):
+    """Context manager timing a block as stage ``name``; ``attrs`` are stored with the record"""
+    if not _tracer.enabled:
+        return _NULL_STAGE
+    return _Stage(name, attrs)
+
+def instrumented(name: str, **attrs):
+    """Decorator timing every call of a function as stage ``name``"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return func(*args, **kwargs)
+            with _Stage(name, attrs):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def record_error(error: Any):
+    """Attach a handled failure to the innermost open stage, so it reaches the trace"""
+    if not _tracer.enabled:
+        return
+    stack = _tracer.stack()
+    message = f"{type(error).__name__}: {error}" if isinstance(error, BaseException) else str(error)
+    if stack:
+        current = stack[-1]
+        current.error = f"{current.error}; {message}" if current.error else message
+
+def register_counters(name: str, read: Callable[[], Dict[str, float]]):
+    """Counter source sampled around every stage; ``read`` returns cumulative numbers"""
+    _tracer.counters[name] = read
+
+def enabled() -> bool:
+    return _tracer.enabled
+
+def enable(trace_path: Optional[str] = None, profile_path: Optional[str] = None, memory: bool = True):
+    """Start recording stages; with ``trace_path`` the trace is written at exit"""
+    if _tracer.enabled:
+        return
+    _tracer.started = time.perf_counter()
+    _tracer.started_at = datetime.now().isoformat()
+    _tracer.cpu_started = time.process_time()
+    _tracer.trace_path = trace_path
+    _tracer.profile_path = profile_path
+    _tracer.memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if profile_path:
+        _tracer.profiler = cProfile.Profile()
+        _tracer.profiler.enable()
+    _tracer.enabled = True
+    if trace_path or profile_path:
+        atexit.register(finish)
+
+def _summary(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Calls, total wall/CPU time, largest peak and errors per stage name"""
+    summary = {}
+    for record in records:
+        totals = summary.setdefault(record['name'], {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0,
+                                                     'peak_memory_mb': None, 'errors': 0})
+        totals['calls'] += 1
+        totals['wall_s'] = round(totals['wall_s'] + record['wall_s'], 6)
+        totals['cpu_s'] = round(totals['cpu_s'] + record['cpu_s'], 6)
+        if record['peak_memory_mb'] is not None:
+            totals['peak_memory_mb'] = max(totals['peak_memory_mb'] or 0, record['peak_memory_mb'])
+        totals['errors'] += record['error'] is not None
+    return summary
+
+def trace() -> Dict[str, Any]:
+    """The run so far as a JSON-serializable document"""
+    with _tracer._lock:
+        records = sorted(_tracer.records, key=lambda r: r['start_s'])
+    run = {
+        'argv': sys.argv,
+        'pid': os.getpid(),
+        'started': _tracer.started_at,
+        'wall_s': round(time.perf_counter() - _tracer.started, 6) if _tracer.started else 0.0,
+        'cpu_s': round(time.process_time() - _tracer.cpu_started, 6) if _tracer.started else 0.0,
+    }
+    try:
+        import resource
+        # ru_maxrss is in kilobytes on Linux
+        run['max_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3, 1)
+    except ImportError:
+        pass
+    return {'run': run, 'stages': records, 'summary': _summary(records)}
+
+def _write_json(document: Any, path: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(document, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+def finish() -> Optional[Dict[str, Any]]:
+    """Stop recording and write the trace and profile, if paths were given"""
+    if not _tracer.enabled:
+        return None
+    _tracer.enabled = False
+    if _tracer.profiler is not None:
+        _tracer.profiler.disable()
+        profile_path = _tracer.profile_path.format(pid=os.getpid())
+        os.makedirs(os.path.dirname(profile_path) or '.', exist_ok=True)
+        _tracer.profiler.dump_stats(profile_path)
+        _tracer.profiler = None
+        print(f"Profile written to {profile_path}")
+    document = trace()
+    if _tracer.trace_path:
+        trace_path = _tracer.trace_path.format(pid=os.getpid())
+        _write_json(document, trace_path)
+        print(f"Trace written to {trace_path} ({len(document['stages'])} stages)")
+    if _tracer.memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return document
+
+def print_summary(document: Dict[str, Any]):
+    """Per-stage totals of a trace, slowest first"""
+    summary = sorted(document['summary'].items(), key=lambda item: -item[1]['wall_s'])
+    print(f"{'stage':<28}{'calls':>7}{'wall s':>10}{'cpu s':>10}{'peak MB':>10}{'errors':>8}")
+    for name, totals in summary:
+        peak = f"{totals['peak_memory_mb']:.1f}" if totals['peak_memory_mb'] is not None else '-'
+        print(f"{name:<28}{totals['calls']:>7}{totals['wall_s']:>10.3f}{totals['cpu_s']:>10.3f}"
+              f"{peak:>10}{totals['errors']:>8}")
+
+if os.getenv(TRACE_ENV) or os.getenv(PROFILE_ENV):
+    enable(os.getenv(TRACE_ENV), os.getenv(PROFILE_ENV), memory=os.getenv(MEMORY_ENV, '1') != '0')
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'r') as f:
+            print_summary(json.load(f))
+        sys.exit(0)
+
+    @instrumented('noop')
+    def noop():
+        pass
+
+    calls = 1_000_000
+    start = time.perf_counter()
+    for _ in range(calls):
+        noop()
+    disabled = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(calls):
+        with stage('noop'):
+            pass
+    disabled_block = time.perf_counter() - start
+    print(f"Disabled: {disabled / calls * 1e9:.0f} ns per decorated call, "
+          f"{disabled_block / calls * 1e9:.0f} ns per stage block")
+
+    enable(memory=False)
+    start = time.perf_counter()
+    for _ in range(10_000):
+        noop()
+    print(f"Enabled: {(time.perf_counter() - start) / 10_000 * 1e6:.1f} us per decorated call")
@@ -0,0 +1,238 @@
+"""
+Walk-forward backtest of the investment rating rule
+
+``generate_investment_thesis`` rates a stock from its upside to the average
+price target (BUY above 20%, OVERWEIGHT above 10%, HOLD above -10%,
+UNDERWEIGHT otherwise) and describes the trend from the 50/200-day moving
+averages. Here the same rule is applied to every bar of a (dates x tickers)
+close panel at once: each date's rating and trend use only that date's close
+and the moving averages up to it, and forward returns are measured from the
+close the rating was given at.
+
+Targets are best given as a (dates x tickers) panel of what was known on each
+date; ``FinancialAnalysisEngine.point_in_time_targets`` builds one by repricing
+the valuation legs from each bar's close. A per-ticker target is held constant
+through history instead, so past bars are rated against a target that was only
+known at the end: that is look-ahead, and the result says so with
+``point_in_time_targets`` False and a ``warning``. Everything price-driven is
+point-in-time either way.
+
+    result = backtest_ratings(close_panel, targets=FinancialAnalysisEngine('NEM').point_in_time_targets())
+    result['summary']          # hit rate, forward returns, drawdowns per rating
+
+Benchmark on a synthetic 10-year x 500-ticker panel:
+    python -m src.models.backtest [tickers] [years]
+"""
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Mapping, Optional, Sequence, Union
+
+from src.models.indicators import TRADING_DAYS, RollingSums
+
+# Ratings in order of the upside (%) above which they apply; the last has no floor
+RATINGS = ('BUY', 'OVERWEIGHT', 'HOLD', 'UNDERWEIGHT')
+RATING_THRESHOLDS = (20, 10, -10)
+NO_RATING = -1
+
+TRENDS = ('Bullish', 'Neutral', 'Bearish')
+TREND_WINDOWS = (50, 200)
+
+# Forward return horizons in trading days: one month, one quarter, one year
+DEFAULT_HORIZONS = (22, 63, 252)
+
+# A HOLD is right when the stock stays within the HOLD upside band
+HOLD_BAND = 0.10
+
+LOOK_AHEAD_WARNING = ("Price targets are held constant at their latest values, so past ratings use "
+                      "targets that were not known at the time (look-ahead); treat hit rates as optimistic")
+
+def recommendation_for(upside: float) -> str:
+    """Rating for one upside-to-target percentage"""
+    for rating, threshold in zip(RATINGS, RATING_THRESHOLDS):
+        if upside > threshold:
+            return rating
+    return RATINGS[-1]
+
+def rating_codes(upside: np.ndarray) -> np.ndarray:
+    """Index into ``RATINGS`` for every upside value; ``NO_RATING`` where it is NaN"""
+    upside = np.asarray(upside, dtype=np.float64)
+    conditions = [upside > threshold for threshold in RATING_THRESHOLDS]
+    codes = np.select(conditions, range(len(RATING_THRESHOLDS)), len(RATINGS) - 1).astype(np.int8)
+    codes[np.isnan(upside)] = NO_RATING
+    return codes
+
+def trend_codes(close: np.ndarray, sma_short: np.ndarray, sma_long: np.ndarray) -> np.ndarray:
+    """Index into ``TRENDS``; bars before the long average exists are Neutral, as in the thesis"""
+    with np.errstate(invalid='ignore'):
+        bullish = (close > sma_short) & (sma_short > sma_long)
+        bearish = (close < sma_short) & (sma_short < sma_long)
+    return np.select([bullish, bearish], [0, 2], 1).astype(np.int8)
+
+def forward_returns(close: np.ndarray, horizon: int) -> np.ndarray:
+    """Return from each close to the close ``horizon`` bars later (NaN past the end)"""
+    result = np.full_like(close, np.nan)
+    if horizon < close.shape[0]:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result[:-horizon] = close[horizon:] / close[:-horizon] - 1
+    return result
+
+def _hits(codes: np.ndarray, returns: np.ndarray) -> np.ndarray:
+    """Whether each rating was borne out by the forward return"""
+    bullish = codes <= RATINGS.index('OVERWEIGHT')
+    hold = codes == RATINGS.index('HOLD')
+    return np.where(bullish, returns > 0, np.where(hold, np.abs(returns) <= HOLD_BAND, returns < 0))
+
+def _pooled_stats(codes: np.ndarray, returns: np.ndarray, prefix: str) -> Dict[str, np.ndarray]:
+    """Count, hit rate, mean and median forward return per rating, over all dates and tickers"""
+    valid = (codes != NO_RATING) & np.isfinite(returns)
+    flat_codes = codes[valid].astype(np.intp)
+    flat_returns = returns[valid]
+    counts = np.bincount(flat_codes, minlength=len(RATINGS))
+    hits = np.bincount(flat_codes, weights=_hits(flat_codes, flat_returns), minlength=len(RATINGS))
+    totals = np.bincount(flat_codes, weights=flat_returns, minlength=len(RATINGS))
+
+    # Group returns by rating with one stable (radix) sort of the small integer codes
+    order = np.argsort(flat_codes, kind='stable')
+    sorted_returns = flat_returns[order]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    medians = np.full(len(RATINGS), np.nan)
+    for code, (start, count) in enumerate(zip(starts, counts)):
+        if count:
+            medians[code] = np.median(sorted_returns[start:start + count])
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return {
+            f'{prefix}_count': counts,
+            f'{prefix}_hit_rate': hits / counts * 100,
+            f'{prefix}_mean_return': totals / counts * 100,
+            f'{prefix}_median_return': medians * 100,
+        }
+
+def _holding_stats(codes: np.ndarray, close: np.ndarray) -> Dict[str, np.ndarray]:
+    """Long-while-rated returns and drawdowns per rating, averaged over tickers
+
+    A rating given at one close sets the position for the next bar's return,
+    so no bar is earned on a rating that used its own close.
+    """
+    daily = np.zeros_like(close)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        daily[1:] = close[1:] / close[:-1] - 1
+    daily[~np.isfinite(daily)] = 0.0
+    held = np.full(codes.shape, NO_RATING, dtype=np.int8)
+    held[1:] = codes[:-1]
+
+    stats = {name: np.full(len(RATINGS), np.nan) for name in
+             ('exposure', 'total_return', 'annualized_return', 'max_drawdown', 'worst_drawdown')}
+    for code in range(len(RATINGS)):
+        position = held == code
+        days = position.sum(axis=0)
+        rated = days > 0
+        if not rated.any():
+            continue
+        equity = np.cumprod(1 + np.where(position, daily, 0.0), axis=0)
+        drawdown = (equity / np.maximum.accumulate(equity, axis=0)).min(axis=0) - 1
+        total = equity[-1] - 1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            annualized = (1 + total[rated]) ** (TRADING_DAYS / days[rated]) - 1
+        stats['exposure'][code] = days.sum() / close.size * 100
+        stats['total_return'][code] = total[rated].mean() * 100
+        stats['annualized_return'][code] = np.median(annualized) * 100
+        stats['max_drawdown'][code] = drawdown[rated].mean() * 100
+        stats['worst_drawdown'][code] = drawdown[rated].min() * 100
+    return stats
+
+def _target_panel(targets: Union[Mapping[str, float], pd.Series, pd.DataFrame], close: pd.DataFrame) -> np.ndarray:
+    """Per-date targets for every ticker column; a per-ticker mapping is held constant"""
+    if isinstance(targets, pd.DataFrame):
+        return targets.reindex(index=close.index, columns=close.columns).to_numpy(dtype=np.float64)
+    per_ticker = pd.Series(targets, dtype=np.float64).reindex(close.columns).to_numpy()
+    return np.broadcast_to(per_ticker, close.shape)
+
+def backtest_ratings(close: pd.DataFrame, targets: Union[Mapping[str, float], pd.Series, pd.DataFrame],
+                     horizons: Sequence[int] = DEFAULT_HORIZONS,
+                     indicators: Optional[Mapping[str, np.ndarray]] = None) -> Dict[str, Any]:
+    """Rate every date of every ticker and score the ratings against what followed
+
+    ``close`` has one column per ticker; ``targets`` gives each ticker's price
+    target, either as a panel aligned to ``close`` (point-in-time) or as one
+    value per ticker, which is applied to every date and so leaks the latest
+    target into past ratings. Tickers without a target are not rated. ``indicators`` may pass in SMA_50
+    and SMA_200 arrays already computed for the same panel (e.g. from
+    ``compute_indicators``) so the moving averages are not recomputed.
+
+    Returns the rating and trend panels (codes into ``RATINGS`` and
+    ``TRENDS``), a summary per rating with the hit rate and mean/median return
+    at each horizon plus long-while-rated returns and drawdowns, and the
+    first-horizon hit rate per rating and trend. ``point_in_time_targets``
+    is False, and ``warning`` explains the look-ahead, unless ``targets`` was
+    a panel.
+    """
+    values = close.to_numpy(dtype=np.float64)
+    if indicators is None:
+        sums = RollingSums(values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            indicators = {f'SMA_{w}': sums.mean(w) for w in TREND_WINDOWS}
+    short, long = (indicators[f'SMA_{w}'] for w in TREND_WINDOWS)
+
+    point_in_time = isinstance(targets, pd.DataFrame)
+    target = _target_panel(targets, close)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        upside = np.where(values > 0, (target - values) / values * 100, np.nan)
+    codes = rating_codes(upside)
+    trends = trend_codes(values, short, long)
+
+    columns = {}
+    first_returns = None
+    for horizon in horizons:
+        returns = forward_returns(values, horizon)
+        first_returns = returns if first_returns is None else first_returns
+        columns.update(_pooled_stats(codes, returns, f'{horizon}d'))
+    columns.update(_holding_stats(codes, values))
+    summary = pd.DataFrame(columns, index=pd.Index(RATINGS, name='rating'))
+
+    # First-horizon hit rate split by trend, as one pooled pass over rating x trend cells
+    by_trend = None
+    if first_returns is not None:
+        valid = (codes != NO_RATING) & np.isfinite(first_returns)
+        cells = codes[valid].astype(np.intp) * len(TRENDS) + trends[valid]
+        counts = np.bincount(cells, minlength=len(RATINGS) * len(TRENDS))
+        hits = np.bincount(cells, weights=_hits(codes[valid], first_returns[valid]),
+                           minlength=len(RATINGS) * len(TRENDS))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rates = (hits / counts * 100).reshape(len(RATINGS), len(TRENDS))
+        by_trend = pd.DataFrame(rates, index=pd.Index(RATINGS, name='rating'),
+                                columns=pd.Index(TRENDS, name='trend'))
+
+    return {
+        'ratings': pd.DataFrame(codes, index=close.index, columns=close.columns, copy=False),
+        'trends': pd.DataFrame(trends, index=close.index, columns=close.columns, copy=False),
+        'summary': summary,
+        'hit_rate_by_trend': by_trend,
+        'horizons': list(horizons),
+        'point_in_time_targets': point_in_time,
+        'warning': None if point_in_time else LOOK_AHEAD_WARNING,
+    }
+
+def _synthetic_panel(tickers: int, years: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    bars = years * TRADING_DAYS
+    log_returns = rng.normal(0.0003, 0.02, (bars, tickers))
+    close = 30 * np.exp(np.cumsum(log_returns, axis=0))
+    index = pd.bdate_range(end='2025-08-01', periods=bars)
+    return pd.DataFrame(close, index=index, columns=[f'T{i:03d}' for i in range(tickers)])
+
+if __name__ == "__main__":
+    tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    years = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    close = _synthetic_panel(tickers, years)
+    # Each ticker's target is a fixed multiple of its close on the day, as the engine's targets are
+    targets = close * np.random.default_rng(1).uniform(0.7, 1.5, tickers)
+
+    start = time.perf_counter()
+    result = backtest_ratings(close, targets)
+    elapsed = time.perf_counter() - start
+    print(f"{years} years x {tickers} tickers ({close.size:,} ratings): {elapsed:.2f}s")
+    print(result['summary'][['22d_count', '22d_hit_rate', '252d_mean_return', 'max_drawdown']].round(1))
@@ -1,81 +1,138 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+from functools import wraps
+import copy
+import hashlib
 import json
+import os
+from src import instrumentation
+from src.data_loader import data_loader, load_frame, load_json
+from src.data_store import STORE_DIR
+from src.models.backtest import DEFAULT_HORIZONS, backtest_ratings, recommendation_for
+from src.models.correlation import _calendar_dates, peer_close_panel, peer_correlation_summary
+from src.models.dcf import dcf_base, monte_carlo_dcf, sensitivity_axis, sensitivity_grid, value_per_share
+from src.models.indicators import indicator_frame
+from src.models.risk import risk_frame, risk_summary
+from src.models.indicator_state import resume_state
+from src.universe import company_name, info_dataset, peer_group, price_dataset
+
+def symbol_datasets(symbol: str) -> Tuple[str, str, str]:
+    """Datasets one symbol's analysis reads"""
+    return (price_dataset(symbol), info_dataset(symbol), 'peer_comparison_data')
+
+def indicator_checkpoint(symbol: str) -> str:
+    """Streaming indicator state, so a new bar does not recompute the whole history"""
+    return os.path.join(STORE_DIR, f"{price_dataset(symbol)}.indicators.json")
+
+def analysis_stage(stage: str):
+    """Memoize an analysis method per data version and assumption set"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self):
+            return self._run_stage(stage, lambda: method(self))
+        return wrapper
+    return decorator
 
 class FinancialAnalysisEngine:
     """Professional-grade financial analysis and modeling engine"""
     
-    def __init__(self, symbol: str = "ABX.TO", company_name: str = "Barrick Gold Corporation"):
+    # Valuation assumptions; override per engine with the assumptions argument
+    DEFAULT_ASSUMPTIONS = {
+        'wacc': 0.08,               # Weighted average cost of capital
+        'terminal_growth': 0.03,    # Long-term growth rate
+    }
+    
+    def __init__(self, symbol: str = "ABX.TO", company_name: str = "Barrick Gold Corporation",
+                 assumptions: Optional[Dict[str, float]] = None):
         self.symbol = symbol
         self.company_name = company_name
+        self.datasets = symbol_datasets(symbol)
+        self.assumptions = dict(self.DEFAULT_ASSUMPTIONS, **(assumptions or {}))
+        self._stage_results = {}
+        self.stage_log = []
         self.load_data()
         
+    @instrumentation.instrumented('load')
     def load_data(self):
         """Load all collected financial data"""
         try:
             # Price data
-            self.price_data = pd.read_csv('data/raw/abx_daily_prices.csv', index_col=0, parse_dates=True)
+            self.price_data = load_frame(price_dataset(self.symbol))
             
             # Company info
-            with open('data/raw/abx_company_info.json', 'r') as f:
-                self.company_info = json.load(f)
+            self.company_info = load_json(info_dataset(self.symbol))
                 
             # Peer data
-            with open('data/raw/peer_comparison_data.json', 'r') as f:
-                self.peer_data = json.load(f)
-                
+            self.peer_data = load_json('peer_comparison_data')
+            
+            self.data_version = data_loader.fingerprint(*self.datasets)
             print(f"Data loaded successfully for {self.company_name}")
             
         except Exception as e:
             print(f"Error loading data: {e}")
-            
-    def calculate_technical_indicators(self) -> pd.DataFrame:
-        """Calculate comprehensive technical indicators"""
-        df = self.price_data.copy()
-        
-        # Simple Moving Averages
-        df['SMA_20'] = df['Close'].rolling(window=20).mean()
-        df['SMA_50'] = df['Close'].rolling(window=50).mean()
-        df['SMA_200'] = df['Close'].rolling(window=200).mean()
+            instrumentation.record_error(e)
+            self.data_version = None
         
-        # Exponential Moving Averages
-        df['EMA_12'] = df['Close'].ewm(span=12).mean()
-        df['EMA_26'] = df['Close'].ewm(span=26).mean()
+        self.invalidate_results()
         
-        # MACD
-        df['MACD'] = df['EMA_12'] - df['EMA_26']
-        df['MACD_Signal'] = df['MACD'].ewm(span=9).mean()
-        df['MACD_Histogram'] = df['MACD'] - df['MACD_Signal']
+    def fingerprint(self) -> str:
+        """Identifies the input data and assumptions the cached results depend on"""
+        key = json.dumps({'data': self.data_version, 'assumptions': self.assumptions}, sort_keys=True)
+        return hashlib.sha256(key.encode()).hexdigest()
         
-        # RSI
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
-        
-        # Bollinger Bands
-        df['BB_Middle'] = df['Close'].rolling(window=20).mean()
-        bb_std = df['Close'].rolling(window=20).std()
-        df['BB_Upper'] = df['BB_Middle'] + (bb_std * 2)
-        df['BB_Lower'] = df['BB_Middle'] - (bb_std * 2)
-        
-        # Volume indicators
-        df['Volume_SMA'] = df['Volume'].rolling(window=20).mean()
-        df['Volume_Ratio'] = df['Volume'] / df['Volume_SMA']
-        
-        # Price performance
-        df['Returns_1D'] = df['Close'].pct_change()
-        df['Returns_5D'] = df['Close'].pct_change(5)
-        df['Returns_22D'] = df['Close'].pct_change(22)
-        
-        # Volatility
-        df['Volatility_30D'] = df['Returns_1D'].rolling(window=30).std() * np.sqrt(252)
+    def invalidate_results(self, stage: Optional[str] = None):
+        """Drop cached analysis results, for one stage or all of them"""
+        if stage is None:
+            self._stage_results.clear()
+        else:
+            self._stage_results.pop(stage, None)
+            
+    def set_assumptions(self, **assumptions):
+        """Change valuation assumptions; results computed under other assumptions are not reused"""
+        unknown = set(assumptions) - set(self.DEFAULT_ASSUMPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown assumptions: {', '.join(sorted(unknown))}")
+        self.assumptions.update(assumptions)
+        
+    def _run_stage(self, stage: str, compute: Callable[[], Any]) -> Any:
+        fingerprint = self.fingerprint()
+        cached = self._stage_results.get(stage)
+        outcome = 'hit' if cached is not None and cached[0] == fingerprint else 'miss'
+        self.stage_log.append((stage, outcome))
+        with instrumentation.stage(stage, symbol=self.symbol, cache=outcome):
+            if outcome == 'hit':
+                result = cached[1]
+            else:
+                result = compute()
+                self._stage_results[stage] = (fingerprint, result)
+            
+            # Hand out copies so callers cannot alter the cached result
+            if isinstance(result, pd.DataFrame):
+                return result.copy(deep=False)
+            return copy.deepcopy(result)
+        
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Hits and misses per analysis stage"""
+        stats = {}
+        for stage, outcome in self.stage_log:
+            counts = stats.setdefault(stage, {'hit': 0, 'miss': 0})
+            counts[outcome] += 1
+        return stats
+            
+    @analysis_stage('technical_indicators')
+    def calculate_technical_indicators(self) -> pd.DataFrame:
+        """Calculate comprehensive technical indicators"""
+        # Shares its implementation with the multi-ticker screen in indicators.py
+        return indicator_frame(self.price_data)
         
-        return df
+    @analysis_stage('latest_indicators')
+    def latest_indicators(self) -> Dict[str, float]:
+        """Indicator values for the most recent bar, resumed from the checkpoint"""
+        return resume_state(self.price_data, indicator_checkpoint(self.symbol)).latest
         
+    @analysis_stage('valuation')
     def perform_valuation_analysis(self) -> Dict[str, any]:
         """Comprehensive valuation analysis"""
         valuation = {}
@@ -124,7 +181,7 @@ class FinancialAnalysisEngine:
         }
         
         # Filter for main gold mining peers (avoid duplicates)
-        main_peers = ['NEM', 'AEM', 'KGC', 'AU', 'EGO']
+        main_peers = peer_group(self.symbol)[1:]
         
         for symbol in main_peers:
             if symbol in self.peer_data:
@@ -145,55 +202,131 @@ class FinancialAnalysisEngine:
             'peer_count': len(main_peers)
         }
         
+    def dcf_inputs(self) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """Company-level DCF inputs and the base-case parameters the scenarios vary"""
+        current_price = self.price_data['Close'].iloc[-1]
+        market_cap = self.company_info.get('marketCap', 0)
+        base_case = {
+            'wacc': self.assumptions['wacc'],
+            'terminal_growth': self.assumptions['terminal_growth'],
+            'revenue_growth': self.company_info.get('revenueGrowth', 0.05),  # Default 5%
+            'operating_margin': self.company_info.get('operatingMargins', 0.15),  # Default 15%
+        }
+        return dcf_base(market_cap, current_price), base_case
+        
     def _simple_dcf_model(self) -> Dict[str, float]:
         """Simplified DCF valuation model"""
         try:
-            # Basic assumptions for DCF
-            current_price = self.price_data['Close'].iloc[-1]
-            
-            # Estimate free cash flow (simplified using market cap and margins)
-            market_cap = self.company_info.get('marketCap', 0)
-            operating_margin = self.company_info.get('operatingMargins', 0.15)  # Default 15%
-            revenue_growth = self.company_info.get('revenueGrowth', 0.05)  # Default 5%
+            base, base_case = self.dcf_inputs()
+            current_price = base['current_price']
             
-            # Simplified DCF calculation
-            estimated_revenue = market_cap / 2  # Rough estimate
-            estimated_fcf = estimated_revenue * operating_margin * 0.8  # Convert to FCF
-            
-            # 5-year projection
-            wacc = 0.08  # Assumed weighted average cost of capital
-            terminal_growth = 0.03  # Long-term growth rate
-            
-            pv_fcf = 0
-            for year in range(1, 6):
-                fcf = estimated_fcf * (1 + revenue_growth) ** year
-                pv = fcf / (1 + wacc) ** year
-                pv_fcf += pv
-                
-            # Terminal value
-            terminal_fcf = estimated_fcf * (1 + revenue_growth) ** 5 * (1 + terminal_growth)
-            terminal_value = terminal_fcf / (wacc - terminal_growth)
-            pv_terminal = terminal_value / (1 + wacc) ** 5
-            
-            enterprise_value = pv_fcf + pv_terminal
-            shares_outstanding = market_cap / current_price if current_price > 0 else 1
-            dcf_price_per_share = enterprise_value / shares_outstanding if shares_outstanding > 0 else 0
+            # 5-year projection plus terminal value, same kernel as the Monte Carlo runs
+            dcf_price_per_share = float(value_per_share(base, **base_case))
+            if not np.isfinite(dcf_price_per_share):
+                raise ValueError("WACC must exceed terminal growth")
             
             return {
                 'dcf_value_per_share': dcf_price_per_share,
                 'current_price': current_price,
                 'upside_downside': (dcf_price_per_share - current_price) / current_price * 100 if current_price > 0 else 0,
                 'assumptions': {
-                    'wacc': wacc,
-                    'terminal_growth': terminal_growth,
-                    'revenue_growth': revenue_growth,
-                    'operating_margin': operating_margin
+                    'wacc': base_case['wacc'],
+                    'terminal_growth': base_case['terminal_growth'],
+                    'revenue_growth': base_case['revenue_growth'],
+                    'operating_margin': base_case['operating_margin']
                 }
             }
         except Exception as e:
             print(f"DCF calculation error: {e}")
+            instrumentation.record_error(e)
             return {'dcf_value_per_share': 0, 'current_price': 0, 'upside_downside': 0}
             
+    @instrumentation.instrumented('monte_carlo')
+    def monte_carlo_valuation(self, scenarios: int = 1_000_000, distributions: Optional[Dict[str, Dict[str, Any]]] = None,
+                              seed: Optional[int] = None, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """DCF value distribution over sampled WACC, growth, margin and terminal growth
+        
+        Distributions centre on the base-case DCF inputs; see ``src.models.dcf``
+        for their specification. ``chunk_size`` bounds memory for large runs.
+        """
+        base, base_case = self.dcf_inputs()
+        return monte_carlo_dcf(base, base_case, distributions, scenarios, seed, chunk_size)
+        
+    @instrumentation.instrumented('dcf_sensitivity')
+    def dcf_sensitivity(self, parameters: Tuple[str, ...] = ('wacc', 'terminal_growth'), points: int = 5,
+                        axes: Optional[Dict[str, List[float]]] = None) -> Dict[str, Any]:
+        """DCF value per share over a 2-D or 3-D grid of assumptions, in one pass
+        
+        Each of ``parameters`` spans ``points`` values around its base case
+        unless ``axes`` gives explicit values for it; see ``src.models.dcf``.
+        """
+        base, base_case = self.dcf_inputs()
+        axes = axes or {}
+        grid_axes = {name: axes[name] if name in axes else sensitivity_axis(name, base_case[name], points)
+                     for name in parameters}
+        return sensitivity_grid(base, base_case, grid_axes)
+        
+    def _peer_median_path(self, field: str) -> pd.Series:
+        """Peer median of a price multiple on every bar, each peer's multiple moved with its own close
+        
+        A peer's multiple on a past date is today's multiple scaled by its
+        close then over its latest close. Peers without a collected price
+        history keep today's multiple.
+        """
+        peers = [s for s in peer_group(self.symbol)[1:] if s in self.peer_data and self.peer_data[s][field] > 0]
+        dates = _calendar_dates(self.price_data.index)
+        multiples = pd.DataFrame({s: np.full(len(dates), float(self.peer_data[s][field])) for s in peers},
+                                 index=dates)
+        close = peer_close_panel(peers)
+        if not close.empty:
+            # Each date sees the peer's last close on or before it
+            on_dates = close.reindex(close.index.union(dates)).ffill().reindex(dates)
+            moved = multiples * on_dates / close.ffill().iloc[-1]
+            multiples = moved.reindex(columns=peers).fillna(multiples)
+        with np.errstate(all='ignore'):
+            median = np.nanmedian(multiples.to_numpy(), axis=1) if peers else np.zeros(len(dates))
+        return pd.Series(median, index=self.price_data.index)
+        
+    def point_in_time_targets(self) -> pd.DataFrame:
+        """Average price target on every bar, from the prices known on that bar
+        
+        Every leg of ``_calculate_price_targets`` is derived from the price:
+        the DCF estimates revenue from market cap, and the multiple targets
+        estimate EPS and book value per share from the company's P/E and P/B.
+        Each leg is repriced from the bar's close, and the peer medians from
+        the peers' closes on that date, so only today's valuation ratios are
+        carried back. Returns a (dates x symbol) panel for ``backtest_ratings``.
+        """
+        targets = self.perform_valuation_analysis()['price_targets']
+        close = self.price_data['Close'].astype(np.float64)
+        legs = []
+        if targets['pe_multiple_target'] > 0:
+            legs.append(close / self.company_info['forwardPE'] * self._peer_median_path('pe_ratio'))
+        if targets['pb_multiple_target'] > 0:
+            legs.append(close / self.company_info['priceToBook'] * self._peer_median_path('pb_ratio'))
+        if targets['dcf_target'] > 0:
+            legs.append(close * targets['dcf_target'] / targets['current_price'])
+        average = pd.concat(legs, axis=1).mean(axis=1) if legs else close
+        return average.to_frame(self.symbol)
+        
+    @instrumentation.instrumented('backtest')
+    def backtest_recommendations(self, horizons: Tuple[int, ...] = DEFAULT_HORIZONS,
+                                 targets: Optional[Union[pd.DataFrame, Mapping[str, float]]] = None) -> Dict[str, Any]:
+        """Walk-forward backtest of the thesis rating rule over this symbol's price history
+        
+        Every bar is rated with the close, moving averages and price target
+        known on that bar: ``targets`` defaults to ``point_in_time_targets``.
+        A per-symbol mapping rates history against constant targets instead,
+        and the result then carries a look-ahead ``warning``; see
+        ``src.models.backtest``.
+        """
+        if targets is None:
+            targets = self.point_in_time_targets()
+        close = self.price_data[['Close']].rename(columns={'Close': self.symbol})
+        indicators = self.calculate_technical_indicators()
+        sma = {name: indicators[[name]].to_numpy(dtype=np.float64) for name in ('SMA_50', 'SMA_200')}
+        return backtest_ratings(close, targets, horizons, sma)
+        
     def _calculate_price_targets(self, peer_multiples, dcf_value) -> Dict[str, float]:
         """Calculate price targets using different methodologies"""
         current_price = self.price_data['Close'].iloc[-1]
@@ -235,6 +368,7 @@ class FinancialAnalysisEngine:
             'upside_to_avg_target': (avg_target - current_price) / current_price * 100 if current_price > 0 else 0
         }
         
+    @analysis_stage('risk')
     def risk_analysis(self) -> Dict[str, any]:
         """Comprehensive risk analysis"""
         risk_metrics = {}
@@ -242,22 +376,25 @@ class FinancialAnalysisEngine:
         # Price volatility analysis
         returns = self.price_data['Close'].pct_change().dropna()
         
+        # Historical VaR/CVaR and drawdowns share one implementation with the charts and dashboard
+        summary = risk_summary(self.price_data['Close'])
+        
         risk_metrics['volatility'] = {
             'daily_volatility': returns.std(),
             'annual_volatility': returns.std() * np.sqrt(252) * 100,
-            'var_95': np.percentile(returns, 5) * 100,  # 5% Value at Risk
-            'var_99': np.percentile(returns, 1) * 100   # 1% Value at Risk
+            'var_95': summary['var_95'],    # 5% Value at Risk
+            'var_99': summary['var_99'],    # 1% Value at Risk
+            'cvar_95': summary['cvar_95'],  # Mean return on the worst 5% of days
+            'cvar_99': summary['cvar_99']
         }
         
         # Drawdown analysis
-        price_series = self.price_data['Close']
-        rolling_max = price_series.expanding().max()
-        drawdown = (price_series / rolling_max - 1) * 100
-        
         risk_metrics['drawdowns'] = {
-            'current_drawdown': drawdown.iloc[-1],
-            'max_drawdown': drawdown.min(),
-            'avg_drawdown': drawdown[drawdown < 0].mean() if len(drawdown[drawdown < 0]) > 0 else 0
+            'current_drawdown': summary['current_drawdown'],
+            'max_drawdown': summary['max_drawdown'],
+            'avg_drawdown': summary['avg_drawdown'],
+            'current_duration_days': summary['current_drawdown_days'],
+            'max_duration_days': summary['max_drawdown_days']
         }
         
         # Beta calculation (vs market proxy)
@@ -278,23 +415,32 @@ class FinancialAnalysisEngine:
         
         return risk_metrics
         
+    @analysis_stage('rolling_risk')
+    def rolling_risk(self) -> pd.DataFrame:
+        """One-year rolling VaR/CVaR and max drawdown, plus drawdown depth and duration, per bar"""
+        return risk_frame(self.price_data['Close'])
+        
+    @analysis_stage('peer_correlation')
+    def peer_correlation(self) -> Dict[str, Any]:
+        """Return correlation and shrinkage covariance with the peer group over the last year"""
+        return peer_correlation_summary(self.symbol, peer_group(self.symbol))
+        
     def _calculate_peer_correlation(self) -> float:
-        """Calculate correlation with peer group (simplified)"""
-        # This would normally require peer price data
-        # For now, return a reasonable estimate
-        return 0.75  # Gold miners typically have high correlation
+        """Average one-year daily return correlation with the peers that have price history (NaN without any)"""
+        return self.peer_correlation()['average_peer_correlation']
         
+    @analysis_stage('thesis')
     def generate_investment_thesis(self) -> Dict[str, any]:
         """Generate comprehensive investment thesis"""
-        technical_analysis = self.calculate_technical_indicators()
+        latest = self.latest_indicators()
         valuation = self.perform_valuation_analysis()
         risk_analysis = self.risk_analysis()
         
         # Current position analysis
         current_price = self.price_data['Close'].iloc[-1]
-        sma_50 = technical_analysis['SMA_50'].iloc[-1]
-        sma_200 = technical_analysis['SMA_200'].iloc[-1]
-        rsi = technical_analysis['RSI'].iloc[-1]
+        sma_50 = latest['SMA_50']
+        sma_200 = latest['SMA_200']
+        rsi = latest['RSI']
         
         # Determine trend
         trend = "Bullish" if current_price > sma_50 > sma_200 else "Bearish" if current_price < sma_50 < sma_200 else "Neutral"
@@ -306,22 +452,15 @@ class FinancialAnalysisEngine:
         elif rsi < 30:
             signals.append("Oversold (RSI < 30)")
             
-        if current_price > technical_analysis['BB_Upper'].iloc[-1]:
+        if current_price > latest['BB_Upper']:
             signals.append("Above Bollinger Upper Band")
-        elif current_price < technical_analysis['BB_Lower'].iloc[-1]:
+        elif current_price < latest['BB_Lower']:
             signals.append("Below Bollinger Lower Band")
         
         # Investment recommendation
         upside = valuation['price_targets']['upside_to_avg_target']
         
-        if upside > 20:
-            recommendation = "BUY"
-        elif upside > 10:
-            recommendation = "OVERWEIGHT"
-        elif upside > -10:
-            recommendation = "HOLD"
-        else:
-            recommendation = "UNDERWEIGHT"
+        recommendation = recommendation_for(upside)
         
         return {
             'company': self.company_name,
@@ -355,6 +494,23 @@ class FinancialAnalysisEngine:
             }
         }
 
+def backtest_universe(symbols: List[str], horizons: Tuple[int, ...] = DEFAULT_HORIZONS,
+                      targets: Optional[Union[pd.DataFrame, Mapping[str, float]]] = None) -> Dict[str, Any]:
+    """Walk-forward backtest of the rating rule across every symbol with collected data
+
+    Each symbol is rated against its ``point_in_time_targets`` unless
+    ``targets`` gives a panel or, with a look-ahead warning, constant values.
+    """
+    closes, panels = {}, {}
+    for symbol in symbols:
+        engine = FinancialAnalysisEngine(symbol, company_name(symbol))
+        if engine.data_version is None:
+            continue
+        closes[symbol] = engine.price_data['Close']
+        if targets is None:
+            panels[symbol] = engine.point_in_time_targets()[symbol]
+    return backtest_ratings(pd.DataFrame(closes), pd.DataFrame(panels) if targets is None else targets, horizons)
+
 # Usage example
 if __name__ == "__main__":
     analyzer = FinancialAnalysisEngine()
@@ -366,4 +522,16 @@ if __name__ == "__main__":
     print(f"Price Target: ${thesis['price_target']:.2f}")
     print(f"Upside Potential: {thesis['upside_potential']:.1f}%")
     print(f"Current Trend: {thesis['trend']}")
-    print(f"Risk Level: {thesis['key_metrics']['annual_volatility']:.1f}% volatility")
\ No newline at end of file
+    print(f"Risk Level: {thesis['key_metrics']['annual_volatility']:.1f}% volatility")
+    
+    monte_carlo = analyzer.monte_carlo_valuation(seed=0)
+    bands = monte_carlo['percentiles']
+    print(f"DCF range ({monte_carlo['scenarios']:,} scenarios): P5 ${bands[5]:.2f} / P50 ${bands[50]:.2f} / P95 ${bands[95]:.2f}")
+    
+    backtest = analyzer.backtest_recommendations()
+    summary = backtest['summary']
+    for rating, row in summary[summary['22d_count'] > 0].iterrows():
+        print(f"Backtest {rating}: {row['22d_hit_rate']:.1f}% 1M hit rate over {int(row['22d_count'])} days, "
+              f"max drawdown {row['max_drawdown']:.1f}%")
+    if backtest['warning']:
+        print(f"Backtest warning: {backtest['warning']}")
@@ -0,0 +1,316 @@
+"""
+Streaming technical indicators
+
+``IndicatorState`` keeps the running state behind every indicator produced by
+``indicators.compute_indicators`` (window sums, EMA numerators and weights,
+RSI gain/loss sums, Welford moments for Bollinger bands and volatility), so a
+new daily bar is absorbed in constant time instead of recomputing five years
+of rolling windows. The state can be checkpointed to JSON and resumed later.
+
+    state = IndicatorState.from_frame(price_data)
+    state.save('data/store/abx_daily_prices.indicators.json')
+    latest = state.update({'Close': 31.2, 'Volume': 9_500_000}, timestamp)
+"""
+
+import os
+import json
+import math
+from collections import deque
+from typing import Any, Dict, Mapping
+import pandas as pd
+
+from src.data_store import unique_temp_path
+from src.models.indicators import (
+    SMA_WINDOWS, EMA_SPANS, MACD_SIGNAL_SPAN, RSI_WINDOW, BOLLINGER_WINDOW,
+    BOLLINGER_WIDTH, VOLUME_WINDOW, VOLATILITY_WINDOW, TRADING_DAYS, INDICATOR_COLUMNS,
+)
+
+CHECKPOINT_VERSION = 1
+
+# Closes kept for the longest pct_change lookback
+RETURN_PERIODS = (1, 5, 22)
+
+class RollingWindow:
+    """Fixed-size window with a running sum and optional Welford variance
+
+    NaN values occupy a slot but are left out of the moments; like pandas'
+    rolling, results are NaN until the window holds ``size`` valid values.
+    """
+
+    def __init__(self, size: int, track_variance: bool = False):
+        self.size = size
+        self.track_variance = track_variance
+        self.values = deque(maxlen=size)
+        self.valid = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.pushes = 0
+
+    def push(self, value: float):
+        if len(self.values) == self.size:
+            self._remove(self.values[0])
+        self.values.append(value)
+        self._add(value)
+
+        # Re-sum the window once per pass to keep rounding from accumulating
+        self.pushes += 1
+        if self.pushes % self.size == 0:
+            self._resync()
+
+    def _add(self, value: float):
+        if math.isnan(value):
+            return
+        self.valid += 1
+        self.total += value
+        if self.track_variance:
+            delta = value - self.mean
+            self.mean += delta / self.valid
+            self.m2 += delta * (value - self.mean)
+
+    def _remove(self, value: float):
+        if math.isnan(value):
+            return
+        self.valid -= 1
+        self.total -= value
+        if self.track_variance:
+            if self.valid == 0:
+                self.mean = self.m2 = 0.0
+                return
+            delta = value - self.mean
+            self.mean -= delta / self.valid
+            self.m2 -= delta * (value - self.mean)
+
+    def _resync(self):
+        observed = [v for v in self.values if not math.isnan(v)]
+        self.valid = len(observed)
+        self.total = math.fsum(observed)
+        if self.track_variance:
+            self.mean = self.total / self.valid if self.valid else 0.0
+            self.m2 = math.fsum((v - self.mean) ** 2 for v in observed)
+
+    @property
+    def full(self) -> bool:
+        return self.valid == self.size
+
+    def average(self) -> float:
+        return self.total / self.size if self.full else math.nan
+
+    def std(self, ddof: int = 1) -> float:
+        return math.sqrt(max(self.m2, 0.0) / (self.size - ddof)) if self.full else math.nan
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'size': self.size, 'track_variance': self.track_variance, 'values': list(self.values),
+                'valid': self.valid, 'total': self.total, 'mean': self.mean, 'm2': self.m2,
+                'pushes': self.pushes}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'RollingWindow':
+        window = cls(data['size'], data['track_variance'])
+        window.values.extend(data['values'])
+        for name in ('valid', 'total', 'mean', 'm2', 'pushes'):
+            setattr(window, name, data[name])
+        return window
+
+class ExponentialAverage:
+    """``ewm(span=span, adjust=True).mean()`` one observation at a time"""
+
+    def __init__(self, span: int):
+        self.span = span
+        self.decay = 1.0 - 2.0 / (span + 1.0)
+        self.numerator = 0.0
+        self.weight = 0.0
+
+    def push(self, value: float) -> float:
+        self.numerator *= self.decay
+        self.weight *= self.decay
+        if not math.isnan(value):
+            self.numerator += value
+            self.weight += 1.0
+        return self.value()
+
+    def value(self) -> float:
+        return self.numerator / self.weight if self.weight else math.nan
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'span': self.span, 'numerator': self.numerator, 'weight': self.weight}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'ExponentialAverage':
+        average = cls(data['span'])
+        average.numerator = data['numerator']
+        average.weight = data['weight']
+        return average
+
+def _ratio(numerator: float, denominator: float) -> float:
+    """Division with NumPy's inf/NaN results instead of ZeroDivisionError"""
+    if denominator == 0:
+        if numerator == 0 or math.isnan(numerator):
+            return math.nan
+        return math.copysign(math.inf, numerator)
+    return numerator / denominator
+
+class IndicatorState:
+    """Running indicator state for one ticker, updated bar by bar"""
+
+    def __init__(self):
+        self.closes = deque(maxlen=max(RETURN_PERIODS) + 1)
+        self.sma = {w: RollingWindow(w) for w in SMA_WINDOWS}
+        self.bollinger = RollingWindow(BOLLINGER_WINDOW, track_variance=True)
+        self.ema = {span: ExponentialAverage(span) for span in EMA_SPANS}
+        self.macd_signal = ExponentialAverage(MACD_SIGNAL_SPAN)
+        self.gains = RollingWindow(RSI_WINDOW)
+        self.losses = RollingWindow(RSI_WINDOW)
+        self.volume = RollingWindow(VOLUME_WINDOW)
+        self.volatility = RollingWindow(VOLATILITY_WINDOW, track_variance=True)
+        self.bars = 0
+        self.last_timestamp = None
+        self.latest = {}
+
+    def update(self, bar: Mapping[str, float], timestamp=None) -> Dict[str, float]:
+        """Absorb one bar (a mapping with Close and optionally Volume) and return the latest values"""
+        close = float(bar['Close'])
+        volume = float(bar['Volume']) if 'Volume' in bar else math.nan
+
+        returns = {}
+        for period in RETURN_PERIODS:
+            previous = self.closes[-period] if len(self.closes) >= period else math.nan
+            returns[period] = close / previous - 1 if previous else math.nan
+        delta = close - self.closes[-1] if self.closes else math.nan
+        self.closes.append(close)
+
+        out = {}
+        for window, rolling in self.sma.items():
+            rolling.push(close)
+            out[f'SMA_{window}'] = rolling.average()
+
+        for span, average in self.ema.items():
+            out[f'EMA_{span}'] = average.push(close)
+        out['MACD'] = out['EMA_12'] - out['EMA_26']
+        out['MACD_Signal'] = self.macd_signal.push(out['MACD'])
+        out['MACD_Histogram'] = out['MACD'] - out['MACD_Signal']
+
+        # NaN deltas count as neither gain nor loss, as in the batch engine
+        self.gains.push(delta if delta > 0 else 0.0)
+        self.losses.push(-delta if delta < 0 else 0.0)
+        relative_strength = _ratio(self.gains.average(), self.losses.average())
+        out['RSI'] = 100 - 100 / (1 + relative_strength)
+
+        self.bollinger.push(close)
+        band = self.bollinger.std() * BOLLINGER_WIDTH
+        out['BB_Middle'] = self.bollinger.average()
+        out['BB_Upper'] = out['BB_Middle'] + band
+        out['BB_Lower'] = out['BB_Middle'] - band
+
+        if 'Volume' in bar:
+            self.volume.push(volume)
+            out['Volume_SMA'] = self.volume.average()
+            out['Volume_Ratio'] = _ratio(volume, out['Volume_SMA'])
+
+        out['Returns_1D'] = returns[1]
+        out['Returns_5D'] = returns[5]
+        out['Returns_22D'] = returns[22]
+        self.volatility.push(returns[1])
+        out['Volatility_30D'] = self.volatility.std() * math.sqrt(TRADING_DAYS)
+
+        self.bars += 1
+        self.last_timestamp = timestamp
+        self.latest = {c: out[c] for c in INDICATOR_COLUMNS if c in out}
+        return dict(self.latest)
+
+    @classmethod
+    def from_frame(cls, prices: pd.DataFrame) -> 'IndicatorState':
+        """Warm up from a price history (one pass over every bar)"""
+        state = cls()
+        state.extend(prices)
+        return state
+
+    def extend(self, prices: pd.DataFrame) -> Dict[str, float]:
+        """Absorb every bar of a frame in order"""
+        columns = [c for c in ('Close', 'Volume') if c in prices.columns]
+        for timestamp, values in zip(prices.index, prices[columns].itertuples(index=False)):
+            self.update(dict(zip(columns, values)), timestamp)
+        return dict(self.latest)
+
+    def to_dict(self) -> Dict[str, Any]:
+        timestamp = self.last_timestamp
+        return {
+            'version': CHECKPOINT_VERSION,
+            'bars': self.bars,
+            'last_timestamp': pd.Timestamp(timestamp).isoformat() if timestamp is not None else None,
+            'last_close': self.closes[-1] if self.closes else None,
+            'closes': list(self.closes),
+            'sma': {str(w): r.to_dict() for w, r in self.sma.items()},
+            'bollinger': self.bollinger.to_dict(),
+            'ema': {str(s): e.to_dict() for s, e in self.ema.items()},
+            'macd_signal': self.macd_signal.to_dict(),
+            'gains': self.gains.to_dict(),
+            'losses': self.losses.to_dict(),
+            'volume': self.volume.to_dict(),
+            'volatility': self.volatility.to_dict(),
+            'latest': self.latest,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'IndicatorState':
+        if data.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported indicator checkpoint version: {data.get('version')}")
+        state = cls()
+        state.bars = data['bars']
+        state.last_timestamp = pd.Timestamp(data['last_timestamp']) if data['last_timestamp'] else None
+        state.closes.extend(data['closes'])
+        state.sma = {int(w): RollingWindow.from_dict(r) for w, r in data['sma'].items()}
+        state.bollinger = RollingWindow.from_dict(data['bollinger'])
+        state.ema = {int(s): ExponentialAverage.from_dict(e) for s, e in data['ema'].items()}
+        state.macd_signal = ExponentialAverage.from_dict(data['macd_signal'])
+        for name in ('gains', 'losses', 'volume', 'volatility'):
+            setattr(state, name, RollingWindow.from_dict(data[name]))
+        state.latest = dict(data['latest'])
+        return state
+
+    def save(self, path: str):
+        """Checkpoint the state to a JSON file (written atomically)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = unique_temp_path(path)
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.to_dict(), f)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def load(cls, path: str) -> 'IndicatorState':
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+def resume_state(prices: pd.DataFrame, checkpoint_path: str) -> IndicatorState:
+    """Indicator state for ``prices``, resumed from a checkpoint when it still applies
+
+    The checkpoint is reused when its last bar is present in ``prices`` with
+    the same close at the same position, so only newer bars are processed;
+    otherwise (restated history, different series) the state is rebuilt.
+    The checkpoint is rewritten whenever new bars were absorbed.
+    """
+    state = None
+    if os.path.exists(checkpoint_path):
+        try:
+            state = IndicatorState.load(checkpoint_path)
+        except (ValueError, KeyError, json.JSONDecodeError) as e:
+            print(f"Ignoring indicator checkpoint {checkpoint_path}: {e}")
+
+    if state is not None and state.last_timestamp is not None:
+        position = state.bars - 1
+        last_timestamp = pd.Timestamp(state.last_timestamp)
+        if (position < len(prices) and prices.index[position] == last_timestamp
+                and float(prices['Close'].iloc[position]) == state.closes[-1]):
+            new_bars = prices.iloc[position + 1:]
+            if not new_bars.empty:
+                state.extend(new_bars)
+                state.save(checkpoint_path)
+            return state
+
+    state = IndicatorState.from_frame(prices)
+    state.save(checkpoint_path)
+    return state
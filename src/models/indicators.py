@@ -0,0 +1,228 @@
+"""
+Vectorized technical indicators for many tickers at once
+
+Prices are handled as a 2-D array with one row per bar and one column per
+ticker, so every indicator is computed for the whole universe in a single
+NumPy pass. Rolling windows share one cumulative sum per series (SMA 20/50/200,
+Bollinger bands and volatility reuse the same prefix sums) and exponential
+averages advance all tickers together one bar at a time.
+
+The results follow pandas semantics: a rolling value is NaN until its window
+holds ``window`` valid observations, and EMAs use ``ewm(span=..., adjust=True)``.
+
+    panel = yf.download(tickers, period='10y')        # columns: (field, ticker)
+    indicators = indicator_panel(panel)               # columns: (indicator, ticker)
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence
+
+SMA_WINDOWS = (20, 50, 200)
+EMA_SPANS = (12, 26)
+MACD_SIGNAL_SPAN = 9
+RSI_WINDOW = 14
+BOLLINGER_WINDOW = 20
+BOLLINGER_WIDTH = 2
+VOLUME_WINDOW = 20
+VOLATILITY_WINDOW = 30
+TRADING_DAYS = 252
+
+# Column order matches FinancialAnalysisEngine.calculate_technical_indicators
+INDICATOR_COLUMNS = [
+    'SMA_20', 'SMA_50', 'SMA_200', 'EMA_12', 'EMA_26', 'MACD', 'MACD_Signal',
+    'MACD_Histogram', 'RSI', 'BB_Middle', 'BB_Upper', 'BB_Lower', 'Volume_SMA',
+    'Volume_Ratio', 'Returns_1D', 'Returns_5D', 'Returns_22D', 'Volatility_30D',
+]
+
+def _as_2d(values) -> np.ndarray:
+    array = np.asarray(values, dtype=np.float64)
+    return array.reshape(-1, 1) if array.ndim == 1 else array
+
+class RollingSums:
+    """Prefix sums of a panel, shared by every rolling window over it"""
+
+    def __init__(self, values: np.ndarray):
+        values = _as_2d(values)
+        missing = np.isnan(values)
+        self.complete = not missing.any()
+        if self.complete:
+            self.count = None
+        else:
+            values = np.where(missing, 0.0, values)
+            self.count = self._prefix(~missing)
+        self._values = values
+        self._missing = None if self.complete else missing
+        self._deviations = None
+        self.total = self._prefix(values)
+
+    @staticmethod
+    def _prefix(values: np.ndarray) -> np.ndarray:
+        """Cumulative sums with a leading row of zeros"""
+        prefix = np.empty((values.shape[0] + 1, values.shape[1]))
+        prefix[0] = 0.0
+        np.cumsum(values, axis=0, out=prefix[1:])
+        return prefix
+
+    def deviations(self):
+        """Prefix sums of deviations from the column mean and of their squares
+
+        Centering keeps the sum of squares well conditioned for variances.
+        """
+        if self._deviations is None:
+            if self.complete:
+                centered = self._values - self._values.mean(axis=0)
+            else:
+                with np.errstate(invalid='ignore'):
+                    center = self.total[-1] / np.maximum(self.count[-1], 1)
+                centered = np.where(self._missing, 0.0, self._values - center)
+            self._deviations = (self._prefix(centered), self._prefix(np.square(centered)))
+        return self._deviations
+
+    @staticmethod
+    def _window(prefix: np.ndarray, window: int) -> np.ndarray:
+        result = np.empty((prefix.shape[0] - 1, prefix.shape[1]))
+        result[:window - 1] = np.nan
+        if window <= result.shape[0]:
+            np.subtract(prefix[window:], prefix[:-window], out=result[window - 1:])
+        return result
+
+    def _mask_partial(self, result: np.ndarray, window: int) -> np.ndarray:
+        """NaN where the window holds fewer than ``window`` observations"""
+        if not self.complete:
+            result[self._window(self.count, window) != window] = np.nan
+        return result
+
+    def mean(self, window: int) -> np.ndarray:
+        result = self._window(self.total, window)
+        result /= window
+        return self._mask_partial(result, window)
+
+    def std(self, window: int, ddof: int = 1) -> np.ndarray:
+        deviations, squares = self.deviations()
+        total = self._window(deviations, window)
+        result = self._window(squares, window)
+        total *= total
+        total /= window
+        result -= total
+        np.maximum(result, 0.0, out=result)
+        result /= window - ddof
+        np.sqrt(result, out=result)
+        return self._mask_partial(result, window)
+
+def rolling_mean(values, window: int) -> np.ndarray:
+    return RollingSums(values).mean(window)
+
+def rolling_std(values, window: int, ddof: int = 1) -> np.ndarray:
+    return RollingSums(values).std(window, ddof)
+
+def ewm_mean(values, span: int) -> np.ndarray:
+    """``ewm(span=span).mean()`` for every column, with pandas' NaN handling"""
+    values = _as_2d(values)
+    decay = 1.0 - 2.0 / (span + 1.0)
+    valid = ~np.isnan(values)
+    complete = valid.all()
+    observed = values if complete else np.where(valid, values, 0.0)
+
+    # The weight total only differs between columns when some bars are missing
+    if complete:
+        weights = np.ones(values.shape[0])
+        for row in range(1, len(weights)):
+            weights[row] += weights[row - 1] * decay
+        weights = weights[:, None]
+    else:
+        weights = np.empty_like(values)
+        weights[0] = valid[0]
+        for row in range(1, values.shape[0]):
+            np.multiply(weights[row - 1], decay, out=weights[row])
+            weights[row] += valid[row]
+
+    result = np.empty_like(values)
+    result[0] = observed[0]
+    for row in range(1, values.shape[0]):
+        np.multiply(result[row - 1], decay, out=result[row])
+        result[row] += observed[row]
+    with np.errstate(invalid='ignore'):
+        result /= weights
+    return result
+
+def pct_change(values, periods: int = 1) -> np.ndarray:
+    values = _as_2d(values)
+    result = np.full_like(values, np.nan)
+    if periods < values.shape[0]:
+        result[periods:] = values[periods:] / values[:-periods] - 1
+    return result
+
+def compute_indicators(close, volume=None) -> Dict[str, np.ndarray]:
+    """All indicators for a (bars x tickers) close panel and optional volume panel"""
+    close = _as_2d(close)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sums = RollingSums(close)
+        out = {f'SMA_{w}': sums.mean(w) for w in SMA_WINDOWS}
+
+        for span in EMA_SPANS:
+            out[f'EMA_{span}'] = ewm_mean(close, span)
+        out['MACD'] = out['EMA_12'] - out['EMA_26']
+        out['MACD_Signal'] = ewm_mean(out['MACD'], MACD_SIGNAL_SPAN)
+        out['MACD_Histogram'] = out['MACD'] - out['MACD_Signal']
+
+        delta = np.full_like(close, np.nan)
+        delta[1:] = close[1:] - close[:-1]
+        # NaN deltas count as neither gain nor loss, as with Series.where
+        gain = RollingSums(np.where(delta > 0, delta, 0.0)).mean(RSI_WINDOW)
+        loss = RollingSums(np.where(delta < 0, -delta, 0.0)).mean(RSI_WINDOW)
+        out['RSI'] = 100 - 100 / (1 + gain / loss)
+
+        out['BB_Middle'] = out[f'SMA_{BOLLINGER_WINDOW}']
+        band = sums.std(BOLLINGER_WINDOW) * BOLLINGER_WIDTH
+        out['BB_Upper'] = out['BB_Middle'] + band
+        out['BB_Lower'] = out['BB_Middle'] - band
+
+        if volume is not None:
+            volume = _as_2d(volume)
+            out['Volume_SMA'] = RollingSums(volume).mean(VOLUME_WINDOW)
+            out['Volume_Ratio'] = volume / out['Volume_SMA']
+
+        out['Returns_1D'] = pct_change(close, 1)
+        out['Returns_5D'] = pct_change(close, 5)
+        out['Returns_22D'] = pct_change(close, 22)
+        out['Volatility_30D'] = RollingSums(out['Returns_1D']).std(VOLATILITY_WINDOW) * np.sqrt(TRADING_DAYS)
+    return out
+
+def _field_level(columns: pd.MultiIndex, field: str) -> int:
+    for level in range(columns.nlevels):
+        if field in columns.get_level_values(level):
+            return level
+    raise KeyError(f"No '{field}' field in panel columns")
+
+def indicator_panel(prices: pd.DataFrame, close: str = 'Close', volume: str = 'Volume',
+                    tickers: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Indicators for a MultiIndex-column price panel
+
+    ``prices`` has (field, ticker) or (ticker, field) columns, as returned by
+    ``yf.download`` for several tickers. The result has (indicator, ticker)
+    columns on the same index.
+    """
+    level = _field_level(prices.columns, close)
+    close_panel = prices.xs(close, axis=1, level=level)
+    if tickers is not None:
+        close_panel = close_panel[list(tickers)]
+    names = list(close_panel.columns)
+
+    volume_panel = None
+    if volume in prices.columns.get_level_values(level):
+        volume_panel = prices.xs(volume, axis=1, level=level)[names].to_numpy(dtype=np.float64)
+
+    results = compute_indicators(close_panel.to_numpy(dtype=np.float64), volume_panel)
+    computed = [c for c in INDICATOR_COLUMNS if c in results]
+    columns = pd.MultiIndex.from_product([computed, names], names=['indicator', 'ticker'])
+    data = np.concatenate([results[c] for c in computed], axis=1)
+    return pd.DataFrame(data, index=prices.index, columns=columns, copy=False)
+
+def indicator_frame(prices: pd.DataFrame, close: str = 'Close', volume: str = 'Volume') -> pd.DataFrame:
+    """Single-ticker OHLCV frame with the indicator columns appended"""
+    results = compute_indicators(prices[close].to_numpy(dtype=np.float64),
+                                 prices[volume].to_numpy(dtype=np.float64) if volume in prices else None)
+    indicators = pd.DataFrame({c: results[c][:, 0] for c in INDICATOR_COLUMNS if c in results},
+                              index=prices.index)
+    return pd.concat([prices, indicators], axis=1)
@@ -0,0 +1,209 @@
+"""
+Peer price metrics computed across the whole panel at once
+
+Trailing returns, the 52-week range and annualized volatility for every
+ticker of a (dates x tickers) price panel in one pass, from the peer price
+store rather than the network. Lookbacks are calendar offsets measured back
+from each ticker's own last bar: the 1-month return compares the last close
+with the last close on or before the same date a month earlier, however many
+trading days that spans, and a ticker with less history than a lookback gets
+NaN rather than a shorter return.
+
+    panels = stored_price_panels('peer_comparison_data')
+    metrics = compute_peer_metrics(panels['close'], panels['high'], panels['low'])
+    metrics.loc['NEM', 'returns_3m']
+
+    compute_peer_metrics(close, lookbacks={'6m': pd.DateOffset(months=6)})
+
+Benchmark on a synthetic panel:
+    python -m src.models.peer_metrics [tickers] [years]
+"""
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Mapping, Optional
+
+from src.data_store import PeerPriceStore
+from src.models.correlation import _calendar_dates, return_panel
+from src.models.indicators import TRADING_DAYS
+
+# Trailing return lookbacks, named as in the peer comparison document (returns_1m, ...)
+DEFAULT_LOOKBACKS = {
+    '1m': pd.DateOffset(months=1),
+    '3m': pd.DateOffset(months=3),
+    '1y': pd.DateOffset(years=1),
+}
+
+# Window of the year high/low
+RANGE_WINDOW = pd.DateOffset(years=1)
+
+# Price fields read from the store, in order of preference for each panel
+PANEL_FIELDS = {
+    'close': ('Close', 'close'),
+    'high': ('High', 'high'),
+    'low': ('Low', 'low'),
+}
+
+def stored_price_panels(document: str, symbols: Optional[Iterable[str]] = None,
+                        fields: Iterable[str] = tuple(PANEL_FIELDS)) -> Dict[str, pd.DataFrame]:
+    """(dates x symbols) panels of the given fields from a peer price document's store
+
+    Only the requested symbols' files are opened, and only the columns
+    needed. Bars are put on trading dates, so listings in different time
+    zones line up.
+    """
+    store = PeerPriceStore(document)
+    symbols = [s for s in (symbols if symbols is not None else store.symbols) if s in store]
+    series = {field: {} for field in fields}
+    for symbol in symbols:
+        stored = store.metadata(symbol)['columns']
+        columns = {field: next((c for c in PANEL_FIELDS[field] if c in stored), None) for field in fields}
+        frame = store.read(symbol, [c for c in columns.values() if c is not None])
+        dates = _calendar_dates(frame.index)
+        keep = ~dates.duplicated(keep='last')
+        for field, column in columns.items():
+            if column is not None:
+                series[field][symbol] = pd.Series(frame[column].to_numpy(dtype=np.float64)[keep], index=dates[keep])
+
+    return {field: pd.DataFrame(series[field], columns=symbols, dtype=np.float64).sort_index()
+            for field in fields}
+
+def _last_valid_rows(values: np.ndarray) -> np.ndarray:
+    """Row of each column's last non-NaN value (-1 for an empty column)"""
+    if values.shape[0] == 0:
+        return np.full(values.shape[1], -1)
+    valid = ~np.isnan(values)
+    last = values.shape[0] - 1 - np.argmax(valid[::-1], axis=0)
+    return np.where(valid.any(axis=0), last, -1)
+
+def _first_valid_rows(values: np.ndarray) -> np.ndarray:
+    """Row of each column's first non-NaN value (rows for an empty column)"""
+    if values.shape[0] == 0:
+        return np.zeros(values.shape[1], dtype=np.intp)
+    valid = ~np.isnan(values)
+    return np.where(valid.any(axis=0), np.argmax(valid, axis=0), values.shape[0])
+
+def _window_starts(dates: pd.DatetimeIndex, last_rows: np.ndarray, offset: pd.DateOffset) -> np.ndarray:
+    """Row of the last bar on or before each column's last date minus ``offset`` (-1 if none)
+
+    The offset is applied once per distinct last date, so a panel where
+    every ticker ends on the same day costs one calendar calculation.
+    """
+    ends, inverse = np.unique(np.maximum(last_rows, 0), return_inverse=True)
+    anchors = pd.DatetimeIndex(dates[ends]) - offset
+    rows = dates.searchsorted(anchors, side='right') - 1
+    return rows[inverse]
+
+def trailing_returns(close: pd.DataFrame, lookbacks: Mapping[str, pd.DateOffset] = DEFAULT_LOOKBACKS) -> pd.DataFrame:
+    """Percent return from the close one lookback before each ticker's last bar to that bar"""
+    values = close.to_numpy(dtype=np.float64)
+    filled = close.ffill().to_numpy(dtype=np.float64)
+    last_rows = _last_valid_rows(values)
+    first_rows = _first_valid_rows(values)
+    cols = np.arange(values.shape[1])
+    current = values[np.maximum(last_rows, 0), cols]
+
+    columns = {}
+    for name, offset in lookbacks.items():
+        start = _window_starts(close.index, last_rows, offset)
+        covered = (start >= first_rows) & (last_rows >= 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = (current / filled[np.maximum(start, 0), cols] - 1) * 100
+        columns[f'returns_{name}'] = np.where(covered, returns, np.nan)
+    return pd.DataFrame(columns, index=close.columns)
+
+def _in_window(dates: pd.DatetimeIndex, last_rows: np.ndarray, window: Optional[pd.DateOffset]) -> np.ndarray:
+    """(dates x tickers) mask of the bars after each ticker's window start, up to its last bar"""
+    rows = np.arange(len(dates))[:, None]
+    mask = rows <= last_rows[None, :]
+    if window is not None:
+        mask &= rows > _window_starts(dates, last_rows, window)[None, :]
+    return mask
+
+def _aligned(panel: pd.DataFrame, close: pd.DataFrame) -> np.ndarray:
+    """Another field's panel on the close panel's trading dates and tickers"""
+    panel = panel.copy()
+    panel.index = _calendar_dates(panel.index)
+    panel = panel[~panel.index.duplicated(keep='last')]
+    return panel.reindex(index=close.index, columns=close.columns).to_numpy(dtype=np.float64)
+
+def compute_peer_metrics(close: pd.DataFrame, high: Optional[pd.DataFrame] = None,
+                         low: Optional[pd.DataFrame] = None,
+                         lookbacks: Mapping[str, pd.DateOffset] = DEFAULT_LOOKBACKS,
+                         range_window: Optional[pd.DateOffset] = RANGE_WINDOW,
+                         volatility_window: Optional[pd.DateOffset] = None) -> pd.DataFrame:
+    """Per-ticker price metrics for a (dates x tickers) panel, one row per ticker
+
+    Columns are current_price, year_high and year_low over ``range_window``
+    (from the high/low panels, or the closes without them), returns_<name>
+    for every lookback in percent, and volatility_annualized in percent over
+    ``volatility_window`` (the whole history when None). Returns are taken
+    between each ticker's consecutive closes, so a missing bar joins two days
+    instead of leaving a gap.
+    """
+    close = close.sort_index()
+    close.index = _calendar_dates(close.index)
+    close = close[~close.index.duplicated(keep='last')]
+    if close.empty:
+        # No bars at all (nothing stored yet): every ticker gets NaN metrics
+        columns = ['current_price', 'year_high', 'year_low',
+                   *(f'returns_{name}' for name in lookbacks), 'volatility_annualized']
+        metrics = pd.DataFrame(np.nan, index=close.columns, columns=columns)
+        metrics['as_of'] = pd.NaT
+        return metrics
+    values = close.to_numpy(dtype=np.float64)
+    last_rows = _last_valid_rows(values)
+    cols = np.arange(values.shape[1])
+
+    high_values = values if high is None else _aligned(high, close)
+    low_values = values if low is None else _aligned(low, close)
+    in_range = _in_window(close.index, last_rows, range_window)
+
+    returns = return_panel(close).to_numpy()
+    in_volatility = _in_window(close.index, last_rows, volatility_window) & ~np.isnan(returns)
+    counts = in_volatility.sum(axis=0)
+    masked = np.where(in_volatility, returns, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = masked.sum(axis=0) / counts
+        variance = (np.where(in_volatility, returns - mean, 0.0) ** 2).sum(axis=0) / (counts - 1)
+    volatility = np.where(counts > 1, np.sqrt(variance) * np.sqrt(TRADING_DAYS) * 100, np.nan)
+
+    # NaN bars are excluded by filling with -inf/inf; a ticker with no bars comes out NaN
+    year_high = np.where(in_range & ~np.isnan(high_values), high_values, -np.inf).max(axis=0, initial=-np.inf)
+    year_low = np.where(in_range & ~np.isnan(low_values), low_values, np.inf).min(axis=0, initial=np.inf)
+    year_high[np.isinf(year_high)] = np.nan
+    year_low[np.isinf(year_low)] = np.nan
+
+    metrics = pd.DataFrame({
+        'current_price': np.where(last_rows >= 0, values[np.maximum(last_rows, 0), cols], np.nan),
+        'year_high': year_high,
+        'year_low': year_low,
+    }, index=close.columns)
+    metrics = metrics.join(trailing_returns(close, lookbacks))
+    metrics['volatility_annualized'] = volatility
+    metrics['as_of'] = pd.DatetimeIndex(close.index[np.maximum(last_rows, 0)]).where(last_rows >= 0)
+    return metrics
+
+def _synthetic_panel(tickers: int, years: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    bars = years * TRADING_DAYS
+    close = 30 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, (bars, tickers)), axis=0))
+    # Listings start at different dates and a few bars are missing, as across exchanges
+    starts = rng.integers(0, bars // 2, tickers)
+    close[np.arange(bars)[:, None] < starts[None, :]] = np.nan
+    close[rng.random(close.shape) < 0.01] = np.nan
+    index = pd.bdate_range(end='2025-08-01', periods=bars)
+    return pd.DataFrame(close, index=index, columns=[f'T{i:04d}' for i in range(tickers)])
+
+if __name__ == "__main__":
+    tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    years = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    close = _synthetic_panel(tickers, years)
+
+    start = time.perf_counter()
+    metrics = compute_peer_metrics(close, close * 1.01, close * 0.99)
+    elapsed = time.perf_counter() - start
+    print(f"{years} years x {tickers} tickers: {elapsed * 1000:.0f} ms")
+    print(metrics.drop(columns='as_of').head().round(2))
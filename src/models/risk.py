@@ -0,0 +1,265 @@
+"""
+Historical risk metrics for one or many tickers
+
+Returns and prices are handled as (bars x tickers) arrays, like the indicator
+panels in ``indicators.py``. Rolling historical VaR and CVaR come from an
+order-statistic tree that is updated as bars enter and leave the window, so
+each day costs O(log n) per ticker instead of a sort of the whole window.
+Drawdowns, drawdown durations and rolling beta are computed with array
+arithmetic across all tickers at once.
+
+VaR follows ``np.percentile(returns, 5)`` (linear interpolation) and CVaR is
+the mean of the returns at or below it; both are returns, so losses are
+negative.
+
+    risk_summary(price_data['Close'])                  # point-in-time metrics for the memo
+    risk_frame(price_data['Close'], window=252)        # rolling series for charts
+    rolling_var_cvar(returns_panel, window=252)        # many tickers at once
+
+Benchmark:
+    python -m src.models.risk [tickers] [years]
+"""
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence
+
+from src.models.indicators import TRADING_DAYS, RollingSums, _as_2d
+
+VAR_LEVELS = (0.95, 0.99)
+DEFAULT_WINDOW = TRADING_DAYS
+
+def _level_name(level: float) -> str:
+    return f"{level * 100:g}"
+
+class OrderStatisticTree:
+    """Sliding multiset of each column's values with k-th smallest and prefix-sum queries
+
+    Every value of a column is ranked once up front; a Fenwick tree over the
+    ranks then holds the count and the sum of the values currently inside the
+    window. Adding or removing a bar and finding the k-th smallest value (with
+    the sum of the k smallest) each take O(log n), vectorized over columns.
+    """
+
+    def __init__(self, values: np.ndarray):
+        values = _as_2d(values)
+        self.rows, self.columns = values.shape
+        self._values = values
+        self._valid = ~np.isnan(values)
+
+        # NaNs sort last and are never inserted, so their ranks go unused
+        order = np.argsort(values, axis=0, kind='stable')
+        self._sorted = np.take_along_axis(values, order, axis=0)
+        self._rank = np.empty(values.shape, dtype=np.intp)
+        np.put_along_axis(self._rank, order, np.broadcast_to(np.arange(1, self.rows + 1)[:, None], values.shape), axis=0)
+
+        self._cols = np.arange(self.columns)
+        # Slot rows + 1 is a sink for updates that have left the tree, so every
+        # update runs the same number of passes without masking
+        self._sink = self.rows + 1
+        self._depth = self.rows.bit_length()
+        self._counts = np.zeros((self.rows + 2) * self.columns, dtype=np.int64)
+        self._sums = np.zeros((self.rows + 2) * self.columns)
+        self._top_step = 1 << (self.rows.bit_length() - 1) if self.rows else 0
+        self.count = np.zeros(self.columns, dtype=np.int64)
+
+    def _update(self, row: int, sign: int):
+        active = self._valid[row]
+        self.count += active * sign
+        index = np.where(active, self._rank[row], self._sink)
+        delta = np.where(active, self._values[row], 0.0) * sign
+        for _ in range(self._depth):
+            flat = index * self.columns + self._cols
+            self._counts[flat] += sign
+            self._sums[flat] += delta
+            index += index & -index
+            np.minimum(index, self._sink, out=index)
+
+    def add(self, row: int):
+        self._update(row, 1)
+
+    def remove(self, row: int):
+        self._update(row, -1)
+
+    def kth(self, k: np.ndarray):
+        """k-th smallest value of each column (1-based) and the sum of the k smallest
+
+        ``k`` may stack several queries per column as a (queries x columns)
+        array; they share one descent of the tree.
+        """
+        remaining = np.array(k, dtype=np.int64)
+        position = np.zeros(remaining.shape, dtype=np.intp)
+        total = np.zeros(remaining.shape)
+        step = self._top_step
+        while step:
+            candidate = position + step
+            flat = np.minimum(candidate, self.rows) * self.columns + self._cols
+            counts = self._counts[flat]
+            take = (candidate <= self.rows) & (counts < remaining)
+            np.copyto(position, candidate, where=take)
+            np.subtract(remaining, counts, out=remaining, where=take)
+            np.add(total, self._sums[flat], out=total, where=take)
+            step >>= 1
+        value = self._sorted[np.minimum(position, self.rows - 1), self._cols]
+        return value, total + value
+
+def _quantile_position(count: np.ndarray, level: float):
+    """Index of the lower order statistic and interpolation weight, as np.percentile's 'linear'"""
+    h = (np.maximum(count, 1) - 1) * (1 - level)
+    lower = np.floor(h)
+    return lower.astype(np.int64), h - lower
+
+def var_cvar(returns, levels: Sequence[float] = VAR_LEVELS) -> Dict[str, np.ndarray]:
+    """Full-sample historical VaR and CVaR for every column"""
+    values = np.sort(_as_2d(returns), axis=0)
+    count = (~np.isnan(values)).sum(axis=0)
+    cumulative = np.nancumsum(values, axis=0)
+    cols = np.arange(values.shape[1])
+    out = {}
+    for level in levels:
+        lower, weight = _quantile_position(count, level)
+        upper = np.minimum(lower + 1, np.maximum(count - 1, 0))
+        var = values[lower, cols] + weight * (values[upper, cols] - values[lower, cols])
+        cvar = cumulative[lower, cols] / (lower + 1)
+        empty = count == 0
+        out[f'VaR_{_level_name(level)}'] = np.where(empty, np.nan, var)
+        out[f'CVaR_{_level_name(level)}'] = np.where(empty, np.nan, cvar)
+    return out
+
+def rolling_var_cvar(returns, window: Optional[int] = DEFAULT_WINDOW, levels: Sequence[float] = VAR_LEVELS,
+                     min_periods: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Historical VaR and CVaR over a trailing window of bars (expanding when ``window`` is None)
+
+    Like pandas' rolling, a value needs ``min_periods`` valid returns in the
+    window, by default the whole window (or one return when expanding).
+    """
+    values = _as_2d(returns)
+    rows, columns = values.shape
+    min_periods = min_periods or window or 1
+    tree = OrderStatisticTree(values)
+    out = {f'{kind}_{_level_name(level)}': np.full((rows, columns), np.nan)
+           for level in levels for kind in ('VaR', 'CVaR')}
+
+    for row in range(rows):
+        tree.add(row)
+        if window is not None and row >= window:
+            tree.remove(row - window)
+        ready = tree.count >= min_periods
+        if not ready.any():
+            continue
+        # Lower and upper order statistic for every level, found in one descent
+        positions = [_quantile_position(tree.count, level) for level in levels]
+        k = [lower + 1 for lower, _ in positions] + [np.minimum(lower + 2, np.maximum(tree.count, 1))
+                                                    for lower, _ in positions]
+        statistics, sums = tree.kth(np.stack(k))
+        for i, (level, (lower, weight)) in enumerate(zip(levels, positions)):
+            name = _level_name(level)
+            low_value, high_value = statistics[i], statistics[i + len(levels)]
+            out[f'VaR_{name}'][row] = np.where(ready, low_value + weight * (high_value - low_value), np.nan)
+            out[f'CVaR_{name}'][row] = np.where(ready, sums[i] / (lower + 1), np.nan)
+    return out
+
+def drawdown(close) -> np.ndarray:
+    """Fraction below the running peak at every bar"""
+    close = _as_2d(close)
+    with np.errstate(invalid='ignore'):
+        return close / np.fmax.accumulate(close, axis=0) - 1
+
+def drawdown_duration(close) -> np.ndarray:
+    """Bars since the running peak was last set (0 at a new high)"""
+    close = _as_2d(close)
+    with np.errstate(invalid='ignore'):
+        at_peak = close >= np.fmax.accumulate(close, axis=0)
+    bars = np.arange(close.shape[0])[:, None]
+    last_peak = np.maximum.accumulate(np.where(at_peak, bars, 0), axis=0)
+    return bars - last_peak
+
+def rolling_max_drawdown(close, window: int = DEFAULT_WINDOW) -> np.ndarray:
+    """Largest peak-to-trough decline inside each trailing window of ``window`` bars
+
+    Walks the window offsets once, carrying a running peak for every window
+    end at the same time, so the cost is ``window`` passes over the panel.
+    """
+    close = _as_2d(close)
+    rows = close.shape[0]
+    result = np.full(close.shape, np.nan)
+    if window > rows:
+        return result
+    ends = rows - window + 1
+    peak = close[:ends].copy()
+    worst = np.zeros(peak.shape)
+    with np.errstate(invalid='ignore'):
+        for offset in range(1, window):
+            current = close[offset:offset + ends]
+            np.fmax(peak, current, out=peak)
+            np.fmin(worst, current / peak - 1, out=worst)
+    result[window - 1:] = worst
+    return result
+
+def rolling_beta(returns, benchmark_returns, window: int = DEFAULT_WINDOW) -> np.ndarray:
+    """Beta of each column's returns against one benchmark return series over a trailing window"""
+    returns = _as_2d(returns)
+    benchmark = np.broadcast_to(_as_2d(benchmark_returns), returns.shape)
+    valid = ~(np.isnan(returns) | np.isnan(benchmark))
+    x = np.where(valid, returns, np.nan)
+    y = np.where(valid, benchmark, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_x = RollingSums(x).mean(window)
+        mean_y = RollingSums(y).mean(window)
+        covariance = RollingSums(x * y).mean(window) - mean_x * mean_y
+        variance = RollingSums(y * y).mean(window) - mean_y * mean_y
+        return covariance / variance
+
+def risk_frame(close: pd.Series, window: int = DEFAULT_WINDOW,
+               benchmark: Optional[pd.Series] = None) -> pd.DataFrame:
+    """Rolling risk series for one price history, in percent where they are returns"""
+    prices = close.to_numpy(dtype=np.float64)
+    returns = np.full_like(prices, np.nan)
+    returns[1:] = prices[1:] / prices[:-1] - 1
+    columns = {f'{name}_{window}D': values[:, 0] * 100
+               for name, values in rolling_var_cvar(returns, window).items()}
+    columns['Drawdown'] = drawdown(prices)[:, 0] * 100
+    columns['Drawdown_Duration'] = drawdown_duration(prices)[:, 0]
+    columns[f'Max_Drawdown_{window}D'] = rolling_max_drawdown(prices, window)[:, 0] * 100
+    if benchmark is not None:
+        market = benchmark.reindex(close.index).to_numpy(dtype=np.float64)
+        market_returns = np.full_like(market, np.nan)
+        market_returns[1:] = market[1:] / market[:-1] - 1
+        columns[f'Beta_{window}D'] = rolling_beta(returns, market_returns, window)[:, 0]
+    return pd.DataFrame(columns, index=close.index)
+
+def risk_summary(close: pd.Series) -> Dict[str, float]:
+    """Point-in-time VaR, CVaR and drawdown statistics for one price history, in percent"""
+    prices = close.to_numpy(dtype=np.float64)
+    returns = prices[1:] / prices[:-1] - 1
+    summary = {name.lower(): float(values[0]) * 100 for name, values in var_cvar(returns).items()}
+    drawdowns = drawdown(prices)[:, 0] * 100
+    durations = drawdown_duration(prices)[:, 0]
+    underwater = drawdowns[drawdowns < 0]
+    summary.update({
+        'current_drawdown': float(drawdowns[-1]),
+        'max_drawdown': float(np.nanmin(drawdowns)),
+        'avg_drawdown': float(underwater.mean()) if len(underwater) > 0 else 0,
+        'current_drawdown_days': int(durations[-1]),
+        'max_drawdown_days': int(durations.max()),
+    })
+    return summary
+
+if __name__ == "__main__":
+    tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    years = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0003, 0.02, (years * TRADING_DAYS, tickers))
+    close = 30 * np.cumprod(1 + returns, axis=0)
+
+    for label, compute in (
+        ('rolling VaR/CVaR 95/99', lambda: rolling_var_cvar(returns, DEFAULT_WINDOW)),
+        ('rolling max drawdown', lambda: rolling_max_drawdown(close, DEFAULT_WINDOW)),
+        ('drawdown duration', lambda: drawdown_duration(close)),
+        ('rolling beta', lambda: rolling_beta(returns, returns.mean(axis=1), DEFAULT_WINDOW)),
+    ):
+        start = time.perf_counter()
+        compute()
+        print(f"{label}, {years}y x {tickers} tickers: {time.perf_counter() - start:.2f}s")
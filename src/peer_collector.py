@@ -0,0 +1,251 @@
+"""
+Concurrent peer data collection
+
+Peer data is fetched one symbol per request and nearly all of the time goes
+to waiting on the network, so ``collect_concurrently`` keeps up to
+``max_workers`` requests in flight. A failed attempt is retried with
+exponential backoff. An attempt that outlives its timeout keeps its slot until
+its call returns, so calls never pile up past ``max_workers``, and a symbol
+whose call is stuck for good is given up rather than holding up the batch.
+Each finished symbol is appended to an optional JSON-lines checkpoint, so an
+interrupted run picks up where it stopped.
+
+Price histories are downloaded for many symbols per request where the source
+supports it: ``download_prices_batched`` splits the universe into chunks,
+runs the chunks through the same retrying pool and returns one frame per
+symbol.
+
+    prices, missing = download_prices_batched(
+        symbols, lambda chunk: yf.download(chunk, period='2y', group_by='ticker', progress=False))
+    results, failures = collect_concurrently(
+        symbols, lambda s: yf.Ticker(s).info, checkpoint_path='data/raw/peer_info.checkpoint.jsonl')
+
+Benchmark against a simulated slow, flaky source:
+    python -m src.peer_collector [symbols] [workers]
+"""
+
+import os
+import sys
+import json
+import heapq
+import queue
+import random
+import threading
+import time
+import pandas as pd
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_WORKERS = 16
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+
+# Symbols per multi-symbol price request
+DEFAULT_CHUNK_SIZE = 50
+
+def _backoff_delay(attempt: int, backoff: float) -> float:
+    """Exponential delay before retry ``attempt`` (1-based), with jitter so retries spread out"""
+    return backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+
+def load_checkpoint(path: Optional[str]) -> Dict[str, Any]:
+    """Results saved by an earlier, interrupted run (a truncated last line is ignored)"""
+    results = {}
+    if not path or not os.path.exists(path):
+        return results
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            results[record['symbol']] = record['result']
+    return results
+
+def clear_checkpoint(path: Optional[str]):
+    """Remove a checkpoint once its results have been saved for good"""
+    if path and os.path.exists(path):
+        os.remove(path)
+
+def collect_concurrently(symbols: Iterable[str], fetch: Callable[[str], Any],
+                         max_workers: int = DEFAULT_WORKERS, timeout: float = DEFAULT_TIMEOUT,
+                         retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF,
+                         checkpoint_path: Optional[str] = None,
+                         on_result: Optional[Callable[[str, Any], None]] = None
+                         ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Run ``fetch(symbol)`` for every symbol with bounded concurrency, timeouts and retries
+
+    Each attempt runs on its own daemon thread, and a symbol gets ``retries``
+    retries after a failed attempt. Python cannot stop a thread, so an
+    attempt still running after ``timeout`` seconds keeps its slot and its
+    symbol is not retried until the call returns: a late result is still
+    used, a late error is retried as usual, and no two calls for a symbol
+    ever overlap. A call still running another ``timeout`` later is written
+    off: the symbol fails and the slot is freed, so a stuck request costs
+    one slot for twice ``timeout`` and at most one stray thread per symbol.
+
+    With ``checkpoint_path``, symbols already in the checkpoint are not
+    fetched again and every new result is appended to it as it arrives, so
+    results must be JSON-serializable. ``on_result`` is called on the calling
+    thread as each symbol finishes.
+
+    Returns the results by symbol, in the order given, and the last error of
+    every symbol that ran out of attempts.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    saved = load_checkpoint(checkpoint_path)
+    results = {symbol: saved[symbol] for symbol in symbols if symbol in saved}
+    failures = {}
+
+    finished = queue.Queue()
+    order = {symbol: index for index, symbol in enumerate(symbols)}
+    ready = [(0.0, order[symbol], symbol) for symbol in symbols if symbol not in results]
+    heapq.heapify(ready)
+    attempts = {}
+    running = {}  # symbol -> (attempt, deadline)
+    overdue = {}  # symbol -> (attempt, deadline): past its timeout, its call still holding the slot
+
+    def run(symbol: str, attempt: int):
+        try:
+            finished.put((symbol, attempt, True, fetch(symbol)))
+        except Exception as e:
+            finished.put((symbol, attempt, False, e))
+
+    def finish(symbol: str, ok: bool, value: Any, now: float):
+        if ok:
+            results[symbol] = value
+            if checkpoint is not None:
+                checkpoint.write(json.dumps({'symbol': symbol, 'result': value}, default=str) + '\n')
+                checkpoint.flush()
+            if on_result is not None:
+                on_result(symbol, value)
+        else:
+            retry_or_fail(symbol, f"{type(value).__name__}: {value}", now)
+
+    def retry_or_fail(symbol: str, error: str, now: float):
+        attempt = attempts[symbol]
+        if attempt > retries:
+            failures[symbol] = error
+            print(f"Giving up on {symbol} after {attempt} attempts: {error}")
+        else:
+            heapq.heappush(ready, (now + _backoff_delay(attempt, backoff), order[symbol], symbol))
+
+    checkpoint = open(checkpoint_path, 'a') if checkpoint_path else None
+    try:
+        while ready or running or overdue:
+            now = time.monotonic()
+            while ready and ready[0][0] <= now and len(running) + len(overdue) < max_workers:
+                _, _, symbol = heapq.heappop(ready)
+                attempts[symbol] = attempts.get(symbol, 0) + 1
+                running[symbol] = (attempts[symbol], now + timeout)
+                threading.Thread(target=run, args=(symbol, attempts[symbol]), daemon=True,
+                                 name=f"peer-{symbol}").start()
+
+            # Sleep until a result arrives, an attempt times out or a retry is due
+            wakeups = [deadline for _, deadline in (*running.values(), *overdue.values())]
+            if ready and len(running) + len(overdue) < max_workers:
+                wakeups.append(ready[0][0])
+            wait = max(min(wakeups) - time.monotonic(), 0) if wakeups else None
+            try:
+                symbol, attempt, ok, value = finished.get(timeout=wait)
+            except queue.Empty:
+                symbol = None
+
+            now = time.monotonic()
+            if symbol is not None:
+                for slots in (running, overdue):
+                    if slots.get(symbol, (None,))[0] == attempt:
+                        del slots[symbol]
+                        finish(symbol, ok, value, now)
+
+            for symbol, (attempt, deadline) in list(running.items()):
+                if deadline <= now:
+                    del running[symbol]
+                    overdue[symbol] = (attempt, now + timeout)
+            for symbol, (_, deadline) in list(overdue.items()):
+                if deadline <= now:
+                    del overdue[symbol]
+                    failures[symbol] = f"still running after {2 * timeout:g}s"
+                    print(f"Giving up on {symbol}: {failures[symbol]}")
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+
+    return {symbol: results[symbol] for symbol in symbols if symbol in results}, failures
+
+def split_download(frame: pd.DataFrame, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+    """Per-symbol frames from a multi-symbol download with (symbol, field) columns
+
+    Symbols the source returned no bars for are left out.
+    """
+    if frame is None or frame.empty:
+        return {}
+    if not isinstance(frame.columns, pd.MultiIndex):
+        frames = {symbols[0]: frame} if len(symbols) == 1 else {}
+    else:
+        level = 0 if set(symbols) & set(frame.columns.get_level_values(0)) else 1
+        frames = {symbol: frame.xs(symbol, axis=1, level=level)
+                  for symbol in symbols if symbol in frame.columns.get_level_values(level)}
+    return {symbol: df.dropna(how='all') for symbol, df in frames.items() if not df.dropna(how='all').empty}
+
+def download_prices_batched(symbols: Iterable[str], download: Callable[[List[str]], pd.DataFrame],
+                            chunk_size: int = DEFAULT_CHUNK_SIZE, max_workers: int = 4,
+                            timeout: float = DEFAULT_TIMEOUT * 4, retries: int = DEFAULT_RETRIES,
+                            backoff: float = DEFAULT_BACKOFF,
+                            on_chunk: Optional[Callable[[Dict[str, pd.DataFrame]], None]] = None
+                            ) -> Tuple[Dict[str, pd.DataFrame], List[str]]:
+    """Price histories for many symbols, ``chunk_size`` symbols per ``download`` call
+
+    ``download(chunk)`` returns one frame with (symbol, field) columns, as
+    ``yf.download(chunk, group_by='ticker')`` does. Chunks are fetched
+    concurrently with the retries and timeouts of ``collect_concurrently``,
+    and ``on_chunk`` receives each chunk's frames as it lands so they can be
+    stored before the rest finish.
+
+    Returns a frame per symbol and the symbols that came back without bars.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    chunks = {','.join(symbols[i:i + chunk_size]): symbols[i:i + chunk_size]
+              for i in range(0, len(symbols), chunk_size)}
+    prices = {}
+
+    def store(key: str, frames: Dict[str, pd.DataFrame]):
+        prices.update(frames)
+        if on_chunk is not None:
+            on_chunk(frames)
+
+    collect_concurrently(chunks, lambda key: split_download(download(chunks[key]), chunks[key]),
+                         max_workers=max_workers, timeout=timeout, retries=retries, backoff=backoff,
+                         on_result=store)
+    return {symbol: prices[symbol] for symbol in symbols if symbol in prices}, \
+        [symbol for symbol in symbols if symbol not in prices]
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_WORKERS
+    latency, timeout = 0.3, 2.0
+    rng = random.Random(0)
+    hung = set(rng.sample(range(count), max(count // 50, 1)))
+    stuck = {min(hung)}
+    hung -= stuck
+    flaky = set(rng.sample(range(count), max(count // 10, 1)))
+    calls = {}
+
+    def fetch(symbol: str):
+        # A few symbols answer only after the timeout, one never does, others fail once
+        number = int(symbol[1:])
+        calls[symbol] = calls.get(symbol, 0) + 1
+        if number in stuck:
+            time.sleep(timeout * 100)
+        if number in hung and calls[symbol] == 1:
+            time.sleep(timeout * 1.5)
+        if number in flaky and calls[symbol] == 1:
+            raise ConnectionError("connection reset")
+        time.sleep(rng.uniform(0.5, 1.5) * latency)
+        return {'symbol': symbol}
+
+    start = time.perf_counter()
+    results, failures = collect_concurrently([f"S{i:03d}" for i in range(count)], fetch, max_workers=workers,
+                                             timeout=timeout, backoff=0.2)
+    elapsed = time.perf_counter() - start
+    print(f"{len(results)}/{count} symbols with {workers} workers ({len(hung)} slow, 1 stuck, {len(flaky)} flaky): "
+          f"{elapsed:.1f}s, about {count * latency:.0f}s one at a time without hangs")
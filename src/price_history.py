@@ -0,0 +1,122 @@
+import os
+import pandas as pd
+import numpy as np
+from typing import Callable, Optional, Tuple
+
+# Stored bars re-requested on every refresh so late corrections are picked up
+DEFAULT_OVERLAP_BARS = 5
+
+# Relative difference in overlapping prices that signals a split/dividend restatement
+RESTATEMENT_TOLERANCE = 1e-4
+
+# Price columns compared on the overlap, across the yfinance/AV/FMP/Polygon layouts
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'open', 'high', 'low', 'close',
+                 'adjusted_close', 'adjClose']
+
+def _parse_index(index) -> pd.DatetimeIndex:
+    """Parse stored timestamps, including yfinance's mixed -04:00/-05:00 offsets"""
+    try:
+        return pd.DatetimeIndex(pd.to_datetime(index))
+    except (ValueError, TypeError):
+        return pd.DatetimeIndex(pd.to_datetime(index, utc=True))
+
+def _align_index(df: pd.DataFrame, tz) -> pd.DataFrame:
+    """Bring a frame's index to the given timezone (None for naive timestamps)"""
+    index = df.index
+    if index.tz is None and tz is not None:
+        index = index.tz_localize('UTC').tz_convert(tz)
+    elif index.tz is not None and tz is None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    elif index.tz is not None:
+        index = index.tz_convert(tz)
+    df = df.copy()
+    df.index = index
+    return df
+
+def load_price_history(path: str) -> pd.DataFrame:
+    """Load a stored price CSV, or an empty frame if there is none yet"""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return pd.DataFrame()
+    try:
+        df = pd.read_csv(path, index_col=0, float_precision='round_trip')
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+    if df.empty:
+        return df
+    df.index = _parse_index(df.index)
+    return df.sort_index()
+
+def incremental_start(history: pd.DataFrame, overlap_bars: int = DEFAULT_OVERLAP_BARS) -> Optional[pd.Timestamp]:
+    """First date to request so the fetch overlaps the last stored bars"""
+    if history.empty:
+        return None
+    return history.index[-min(overlap_bars, len(history))].normalize()
+
+def needs_full_refetch(history: pd.DataFrame, fresh: pd.DataFrame,
+                       tolerance: float = RESTATEMENT_TOLERANCE) -> bool:
+    """Whether new bars imply the stored history was restated
+
+    True when overlapping bars moved by more than ``tolerance`` (adjusted
+    series restated after a split or dividend), or when a new bar carries
+    a split or dividend event. The last stored bar is left out of the
+    comparison: it may have been saved mid-session and is simply replaced
+    by the fetched bar.
+    """
+    fresh = _align_index(fresh, history.index.tz)
+    overlap = history.index.intersection(fresh.index)
+    overlap = overlap[overlap < history.index[-1]]
+    columns = [c for c in PRICE_COLUMNS if c in history.columns and c in fresh.columns]
+
+    if len(overlap) and columns:
+        stored = history.loc[overlap, columns].astype(float).to_numpy()
+        latest = fresh.loc[overlap, columns].astype(float).to_numpy()
+        scale = np.maximum(np.abs(stored), 1e-12)
+        if np.nanmax(np.abs(latest - stored) / scale) > tolerance:
+            return True
+
+    new_bars = fresh.loc[~fresh.index.isin(history.index)]
+    for column, neutral in [('Stock Splits', 0.0), ('Dividends', 0.0), ('split', 1.0), ('dividend', 0.0)]:
+        if column in new_bars.columns:
+            events = pd.to_numeric(new_bars[column], errors='coerce').fillna(neutral)
+            if (events != neutral).any():
+                return True
+    return False
+
+def merge_price_history(history: pd.DataFrame, fresh: pd.DataFrame) -> pd.DataFrame:
+    """Append new bars to the stored history; fetched bars win on overlapping dates"""
+    if history.empty:
+        return fresh.sort_index()
+    history = _align_index(history, fresh.index.tz)
+    merged = pd.concat([history, fresh])
+    merged = merged[~merged.index.duplicated(keep='last')]
+    return merged.sort_index()
+
+def update_price_history(path: str, fetch: Callable[[Optional[pd.Timestamp]], pd.DataFrame],
+                         overlap_bars: int = DEFAULT_OVERLAP_BARS) -> Tuple[pd.DataFrame, str]:
+    """Refresh a stored price CSV, fetching only the bars it is missing
+
+    ``fetch(start_date)`` must return bars from ``start_date`` onwards, or the
+    full history when ``start_date`` is None. Returns the stored frame and
+    the kind of update performed: 'full', 'incremental' or 'unchanged'.
+    """
+    history = load_price_history(path)
+    start_date = incremental_start(history, overlap_bars)
+
+    if start_date is None:
+        prices, mode = fetch(None), 'full'
+    else:
+        fresh = fetch(start_date)
+        if fresh.empty:
+            return history, 'unchanged'
+        fresh.index = pd.DatetimeIndex(fresh.index)
+        if needs_full_refetch(history, fresh):
+            print(f"Price restatement detected in {os.path.basename(path)}, refetching full history")
+            prices, mode = fetch(None), 'full'
+        else:
+            prices, mode = merge_price_history(history, fresh), 'incremental'
+
+    if prices.empty and not history.empty:
+        return history, 'unchanged'
+
+    prices.to_csv(path)
+    return prices, mode
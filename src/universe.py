@@ -0,0 +1,56 @@
+"""
+Ticker universe and per-symbol dataset names
+
+Every symbol's collected data lives under the same names, derived from the
+symbol: ``nem_daily_prices.csv`` and ``nem_company_info.json`` for NEM,
+``k_to_daily_prices.csv`` for K.TO. ABX.TO keeps the ``abx_`` names it was
+first collected under.
+"""
+
+import re
+from typing import List, Optional
+
+# Gold miners and streamers tracked for peer comparison
+PEER_UNIVERSE = {
+    'ABX.TO': 'Barrick Gold Corporation',
+    'NEM': 'Newmont Corporation',
+    'AEM': 'Agnico Eagle Mines Limited',
+    'AEM.TO': 'Agnico Eagle Mines Limited (TSX)',
+    'KGC': 'Kinross Gold Corporation',
+    'K.TO': 'Kinross Gold Corporation (TSX)',
+    'AU': 'AngloGold Ashanti Limited',
+    'EGO': 'Eldorado Gold Corporation',
+    'FNV': 'Franco-Nevada Corporation',
+    'FNV.TO': 'Franco-Nevada Corporation (TSX)',
+    'WPM': 'Wheaton Precious Metals Corp',
+    'WPM.TO': 'Wheaton Precious Metals Corp (TSX)'
+}
+
+# Main peer group for benchmarking, one listing per company
+PEER_GROUP = ['ABX.TO', 'NEM', 'AEM', 'KGC', 'AU', 'EGO']
+
+# Dataset prefixes that predate the per-symbol naming
+DATASET_PREFIXES = {'ABX.TO': 'abx'}
+
+def dataset_prefix(symbol: str) -> str:
+    return DATASET_PREFIXES.get(symbol, re.sub(r'[^a-z0-9]+', '_', symbol.lower()))
+
+def price_dataset(symbol: str) -> str:
+    """Name of a symbol's daily price history, e.g. ``nem_daily_prices``"""
+    return f"{dataset_prefix(symbol)}_daily_prices"
+
+def info_dataset(symbol: str) -> str:
+    """Name of a symbol's company info document, e.g. ``nem_company_info``"""
+    return f"{dataset_prefix(symbol)}_company_info"
+
+def company_name(symbol: str) -> str:
+    return PEER_UNIVERSE.get(symbol, symbol)
+
+def short_name(name: str) -> str:
+    """Company name without its legal suffix, e.g. 'Barrick Gold'"""
+    return re.sub(r'\s+(Corporation|Corp\.?|Limited|Ltd\.?|Inc\.?)(\s+\(.*\))?$', '', name)
+
+def peer_group(symbol: str, size: Optional[int] = None) -> List[str]:
+    """``symbol`` followed by the rest of the main peer group"""
+    group = [symbol] + [s for s in PEER_GROUP if s != symbol]
+    return group[:size] if size is not None else group
@@ -7,7 +7,15 @@ from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import json
+import os
+from typing import Optional
+from src.data_loader import load_frame, load_json
+from src.instrumentation import instrumented, record_error
+from src.models.correlation import peer_correlation_summary
+from src.models.dcf import PARAMETER_LABELS
+from src.models.financial_models import FinancialAnalysisEngine
+from src.universe import company_name, info_dataset, peer_group, price_dataset, short_name
+from src.visualization.downsampling import HALF_WIDTH_PX, downsample_line, downsample_ohlc
 
 # Set professional styling
 plt.style.use('seaborn-v0_8-whitegrid')
@@ -16,29 +24,36 @@ sns.set_palette("husl")
 class ProfessionalChartEngine:
     """Professional-grade financial visualization engine"""
     
-    def __init__(self, symbol: str = "ABX.TO"):
+    def __init__(self, symbol: str = "ABX.TO", output_dir: str = 'reports'):
         self.symbol = symbol
+        self.company_name = company_name(symbol)
+        self.output_dir = output_dir
         self.load_data()
         
+    @instrumented('load', engine='charts')
     def load_data(self):
         """Load all required data for visualization"""
         try:
             # Price data
-            self.price_data = pd.read_csv('data/raw/abx_daily_prices.csv', index_col=0, parse_dates=True)
+            self.price_data = load_frame(price_dataset(self.symbol))
             
             # Company info
-            with open('data/raw/abx_company_info.json', 'r') as f:
-                self.company_info = json.load(f)
+            self.company_info = load_json(info_dataset(self.symbol))
                 
             # Peer data
-            with open('data/raw/peer_comparison_data.json', 'r') as f:
-                self.peer_data = json.load(f)
+            self.peer_data = load_json('peer_comparison_data')
                 
             print("Chart data loaded successfully")
             
         except Exception as e:
             print(f"Error loading chart data: {e}")
+            record_error(e)
             
+    def _output_path(self, filename: str) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        return os.path.join(self.output_dir, filename)
+            
+    @instrumented('render', chart='comprehensive_dashboard')
     def create_comprehensive_dashboard(self, save_html: bool = True) -> go.Figure:
         """Create comprehensive financial dashboard"""
         
@@ -81,12 +96,12 @@ class ProfessionalChartEngine:
         # 7. Price Distribution
         self._add_price_distribution(fig, row=4, col=1)
         
-        # 8. Correlation Matrix (simplified)
+        # 8. Correlation Matrix
         self._add_correlation_matrix(fig, row=4, col=2)
         
         # Update layout
         fig.update_layout(
-            title=f"Comprehensive Financial Analysis - {self.company_info.get('longName', 'Barrick Gold Corp')}",
+            title=f"Comprehensive Financial Analysis - {self.company_info.get('longName', self.company_name)}",
             height=1600,
             showlegend=True,
             template="plotly_white",
@@ -95,8 +110,9 @@ class ProfessionalChartEngine:
         )
         
         if save_html:
-            fig.write_html('reports/comprehensive_dashboard.html')
-            print("Dashboard saved to reports/comprehensive_dashboard.html")
+            path = self._output_path('comprehensive_dashboard.html')
+            fig.write_html(path)
+            print(f"Dashboard saved to {path}")
             
         return fig
         
@@ -109,14 +125,19 @@ class ProfessionalChartEngine:
         # Price data (last 2 years for clarity)
         recent_data = self.price_data.tail(504)  # ~2 years
         
+        # Candles and volume bucketed to fit the half-width subplot
+        bars = downsample_ohlc(recent_data, HALF_WIDTH_PX)
+        sma_20 = downsample_line(recent_data['SMA_20'], HALF_WIDTH_PX)
+        sma_50 = downsample_line(recent_data['SMA_50'], HALF_WIDTH_PX)
+        
         # Add candlestick
         fig.add_trace(
             go.Candlestick(
-                x=recent_data.index,
-                open=recent_data['Open'],
-                high=recent_data['High'],
-                low=recent_data['Low'],
-                close=recent_data['Close'],
+                x=bars.index,
+                open=bars['Open'],
+                high=bars['High'],
+                low=bars['Low'],
+                close=bars['Close'],
                 name='Price',
                 increasing_line_color='green',
                 decreasing_line_color='red'
@@ -127,8 +148,8 @@ class ProfessionalChartEngine:
         # Add moving averages
         fig.add_trace(
             go.Scatter(
-                x=recent_data.index,
-                y=recent_data['SMA_20'],
+                x=sma_20.index,
+                y=sma_20,
                 name='SMA 20',
                 line=dict(color='orange', width=2)
             ),
@@ -137,8 +158,8 @@ class ProfessionalChartEngine:
         
         fig.add_trace(
             go.Scatter(
-                x=recent_data.index,
-                y=recent_data['SMA_50'],
+                x=sma_50.index,
+                y=sma_50,
                 name='SMA 50',
                 line=dict(color='blue', width=2)
             ),
@@ -148,8 +169,8 @@ class ProfessionalChartEngine:
         # Add volume on secondary y-axis
         fig.add_trace(
             go.Bar(
-                x=recent_data.index,
-                y=recent_data['Volume'],
+                x=bars.index,
+                y=bars['Volume'],
                 name='Volume',
                 marker_color='lightblue',
                 opacity=0.3,
@@ -167,7 +188,7 @@ class ProfessionalChartEngine:
         rs = gain / loss
         rsi = 100 - (100 / (1 + rs))
         
-        recent_rsi = rsi.tail(504)
+        recent_rsi = downsample_line(rsi.tail(504), HALF_WIDTH_PX)
         
         fig.add_trace(
             go.Scatter(
@@ -187,7 +208,7 @@ class ProfessionalChartEngine:
         """Add peer group returns comparison"""
         # Extract 1-year returns from peer data
         peer_returns = {}
-        main_peers = ['ABX.TO', 'NEM', 'AEM', 'KGC', 'AU', 'EGO']
+        main_peers = peer_group(self.symbol)
         
         for symbol in main_peers:
             if symbol in self.peer_data:
@@ -196,7 +217,7 @@ class ProfessionalChartEngine:
         symbols = list(peer_returns.keys())
         returns = list(peer_returns.values())
         
-        colors = ['red' if symbol == 'ABX.TO' else 'lightblue' for symbol in symbols]
+        colors = ['red' if symbol == self.symbol else 'lightblue' for symbol in symbols]
         
         fig.add_trace(
             go.Bar(
@@ -214,7 +235,7 @@ class ProfessionalChartEngine:
         """Add peer valuation multiples comparison"""
         # Extract P/E ratios
         peer_pe = {}
-        main_peers = ['ABX.TO', 'NEM', 'AEM', 'KGC', 'AU', 'EGO']
+        main_peers = peer_group(self.symbol)
         
         for symbol in main_peers:
             if symbol in self.peer_data and self.peer_data[symbol]['pe_ratio'] > 0:
@@ -223,7 +244,7 @@ class ProfessionalChartEngine:
         symbols = list(peer_pe.keys())
         pe_ratios = list(peer_pe.values())
         
-        colors = ['red' if symbol == 'ABX.TO' else 'lightgreen' for symbol in symbols]
+        colors = ['red' if symbol == self.symbol else 'lightgreen' for symbol in symbols]
         
         fig.add_trace(
             go.Bar(
@@ -259,13 +280,13 @@ class ProfessionalChartEngine:
         
     def _add_financial_ratios_chart(self, fig, row, col):
         """Add financial ratios comparison"""
-        abx_data = self.peer_data.get('ABX.TO', {})
+        target_data = self.peer_data.get(self.symbol, {})
         
         ratios = {
-            'P/E': abx_data.get('pe_ratio', 0),
-            'P/B': abx_data.get('pb_ratio', 0),
-            'ROE': abx_data.get('roe', 0) * 100 if abx_data.get('roe') else 0,
-            'Profit Margin': abx_data.get('profit_margin', 0) * 100 if abx_data.get('profit_margin') else 0
+            'P/E': target_data.get('pe_ratio', 0),
+            'P/B': target_data.get('pb_ratio', 0),
+            'ROE': target_data.get('roe', 0) * 100 if target_data.get('roe') else 0,
+            'Profit Margin': target_data.get('profit_margin', 0) * 100 if target_data.get('profit_margin') else 0
         }
         
         fig.add_trace(
@@ -296,23 +317,28 @@ class ProfessionalChartEngine:
         )
         
     def _add_correlation_matrix(self, fig, row, col):
-        """Add simplified correlation matrix"""
-        # This is simplified - would normally show correlation with other assets
-        # For now, show a placeholder
+        """Add one-year daily return correlation with the peer group"""
+        correlation = peer_correlation_summary(self.symbol, peer_group(self.symbol))['correlation']
+        if correlation.empty:
+            return
         
         fig.add_trace(
-            go.Scatter(
-                x=[1, 2, 3],
-                y=[1, 2, 3],
-                mode='markers+text',
-                text=['Gold Price', 'USD Index', 'Market'],
-                textposition="middle center",
-                marker=dict(size=50, color=['gold', 'green', 'blue']),
-                name='Key Correlations'
+            go.Heatmap(
+                x=list(correlation.columns),
+                y=list(correlation.index),
+                z=correlation.to_numpy(),
+                zmin=-1, zmax=1,
+                colorscale='RdBu',
+                reversescale=True,
+                text=correlation.round(2).to_numpy(),
+                texttemplate='%{text}',
+                showscale=False,
+                name='Return Correlation'
             ),
             row=row, col=col
         )
         
+    @instrumented('render', chart='executive_summary')
     def create_executive_summary_chart(self) -> go.Figure:
         """Create executive summary chart for presentations"""
         
@@ -328,7 +354,7 @@ class ProfessionalChartEngine:
         )
         
         # Price performance comparison
-        main_peers = ['ABX.TO', 'NEM', 'AEM', 'KGC']
+        main_peers = peer_group(self.symbol, 4)
         peer_returns = [self.peer_data[p]['returns_1y'] for p in main_peers if p in self.peer_data]
         
         fig.add_trace(
@@ -342,11 +368,11 @@ class ProfessionalChartEngine:
         )
         
         # Key metrics radar chart (simplified as bar)
-        abx_data = self.peer_data.get('ABX.TO', {})
+        target_data = self.peer_data.get(self.symbol, {})
         metrics = {
-            'P/E': abx_data.get('pe_ratio', 0),
-            'ROE': abx_data.get('roe', 0) * 100 if abx_data.get('roe') else 0,
-            'Margin': abx_data.get('profit_margin', 0) * 100 if abx_data.get('profit_margin') else 0
+            'P/E': target_data.get('pe_ratio', 0),
+            'ROE': target_data.get('roe', 0) * 100 if target_data.get('roe') else 0,
+            'Margin': target_data.get('profit_margin', 0) * 100 if target_data.get('profit_margin') else 0
         }
         
         fig.add_trace(
@@ -393,20 +419,21 @@ class ProfessionalChartEngine:
         )
         
         fig.update_layout(
-            title="Executive Summary - Barrick Gold Investment Analysis",
+            title=f"Executive Summary - {short_name(self.company_name)} Investment Analysis",
             height=800,
             showlegend=False,
             template="plotly_white"
         )
         
-        fig.write_html('reports/executive_summary.html')
+        fig.write_html(self._output_path('executive_summary.html'))
         return fig
         
+    @instrumented('render', chart='peer_benchmark_analysis')
     def create_peer_benchmark_analysis(self) -> go.Figure:
         """Create detailed peer benchmarking analysis"""
         
         # Prepare peer data for comparison
-        peers = ['ABX.TO', 'NEM', 'AEM', 'KGC', 'AU', 'EGO']
+        peers = peer_group(self.symbol)
         peer_df = []
         
         for symbol in peers:
@@ -436,7 +463,7 @@ class ProfessionalChartEngine:
         )
         
         # Market Cap comparison
-        colors = ['red' if symbol == 'ABX.TO' else 'lightblue' for symbol in peer_df['Symbol']]
+        colors = ['red' if symbol == self.symbol else 'lightblue' for symbol in peer_df['Symbol']]
         
         fig.add_trace(
             go.Bar(
@@ -512,7 +539,7 @@ class ProfessionalChartEngine:
                 textposition="top center",
                 marker=dict(
                     size=15,
-                    color=['red' if symbol == 'ABX.TO' else 'blue' for symbol in peer_df['Symbol']]
+                    color=['red' if symbol == self.symbol else 'blue' for symbol in peer_df['Symbol']]
                 ),
                 name='Risk vs Return'
             ),
@@ -526,7 +553,63 @@ class ProfessionalChartEngine:
             template="plotly_white"
         )
         
-        fig.write_html('reports/peer_benchmark_analysis.html')
+        fig.write_html(self._output_path('peer_benchmark_analysis.html'))
+        return fig
+
+    @instrumented('render', chart='dcf_sensitivity')
+    def create_dcf_sensitivity_heatmap(self, analyzer: Optional[FinancialAnalysisEngine] = None,
+                                       points: int = 200) -> go.Figure:
+        """Heatmaps of DCF value per share over WACC x terminal growth and revenue growth x margin"""
+        analyzer = analyzer or FinancialAnalysisEngine(self.symbol, self.company_name)
+        grids = [analyzer.dcf_sensitivity(('wacc', 'terminal_growth'), points),
+                 analyzer.dcf_sensitivity(('revenue_growth', 'operating_margin'), points)]
+        
+        fig = make_subplots(
+            rows=1, cols=2,
+            subplot_titles=[f"{PARAMETER_LABELS[g['parameters'][0]]} vs {PARAMETER_LABELS[g['parameters'][1]]}" for g in grids],
+            horizontal_spacing=0.12
+        )
+        
+        current_price = self.price_data['Close'].iloc[-1]
+        for col, grid in enumerate(grids, start=1):
+            row_param, col_param = grid['parameters']
+            fig.add_trace(
+                go.Heatmap(
+                    x=grid['axes'][col_param] * 100,
+                    y=grid['axes'][row_param] * 100,
+                    z=grid['values'],
+                    colorscale='RdYlGn',
+                    zmid=current_price,
+                    colorbar=dict(title='$/share', x=0.44 if col == 1 else 1.0),
+                    hovertemplate=(f"{PARAMETER_LABELS[row_param]}: %{{y:.2f}}%<br>{PARAMETER_LABELS[col_param]}: %{{x:.2f}}%"
+                                   "<br>Value: $%{z:.2f}<extra></extra>"),
+                    name=f"{PARAMETER_LABELS[row_param]} x {PARAMETER_LABELS[col_param]}"
+                ),
+                row=1, col=col
+            )
+            # Mark the base case the published DCF value comes from
+            fig.add_trace(
+                go.Scatter(
+                    x=[grid['base_case'][col_param] * 100],
+                    y=[grid['base_case'][row_param] * 100],
+                    mode='markers+text',
+                    text=[f"Base ${grid['base_value']:.2f}"],
+                    textposition='top center',
+                    marker=dict(symbol='x', size=12, color='black'),
+                    showlegend=False
+                ),
+                row=1, col=col
+            )
+            fig.update_xaxes(title_text=f"{PARAMETER_LABELS[col_param]} (%)", row=1, col=col)
+            fig.update_yaxes(title_text=f"{PARAMETER_LABELS[row_param]} (%)", row=1, col=col)
+        
+        fig.update_layout(
+            title=f"DCF Sensitivity - {short_name(self.company_name)} (current price ${current_price:.2f})",
+            height=600,
+            template="plotly_white"
+        )
+        
+        fig.write_html(self._output_path('dcf_sensitivity.html'))
         return fig
 
 if __name__ == "__main__":
@@ -543,4 +626,7 @@ if __name__ == "__main__":
     print("Generating peer benchmark analysis...")
     peer_analysis = chart_engine.create_peer_benchmark_analysis()
     
+    print("Generating DCF sensitivity heatmaps...")
+    sensitivity = chart_engine.create_dcf_sensitivity_heatmap()
+    
     print("All visualizations created successfully!")
\ No newline at end of file
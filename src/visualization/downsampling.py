@@ -0,0 +1,175 @@
+"""
+Server-side downsampling for long price series
+
+Line traces are reduced with Largest-Triangle-Three-Buckets, which keeps the
+visual shape (peaks, troughs, turns) of a series at roughly one point per
+pixel. Candlestick/OHLC traces are aggregated into equal-sized buckets of bars
+(first open, highest high, lowest low, last close) so each candle keeps a
+readable width. The number of points is derived from the target pixel width of
+the chart, and series that already fit are passed through unchanged.
+
+Benchmark (payload bytes and figure build + serialization time):
+    python -m src.visualization.downsampling [dataset ...]
+"""
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+# Target widths in pixels for full-width and half-width (six-column) charts
+FULL_WIDTH_PX = 1400
+HALF_WIDTH_PX = 700
+
+# Horizontal pixels per candle, and line points per pixel
+CANDLE_PX = 4
+LINE_POINTS_PER_PX = 1
+
+def line_points(width_px: int) -> int:
+    """Number of points a line trace needs at this width"""
+    return max(3, int(width_px * LINE_POINTS_PER_PX))
+
+def candle_count(width_px: int) -> int:
+    """Number of candles that stay readable at this width"""
+    return max(1, int(width_px // CANDLE_PX))
+
+def _numeric_x(index) -> np.ndarray:
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8.astype(np.float64) / 1e9
+    return np.asarray(index, dtype=np.float64)
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Positions of the points Largest-Triangle-Three-Buckets keeps"""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Interior points split into threshold - 2 buckets; first and last are always kept
+    edges = (np.floor(np.arange(threshold - 1) * ((n - 2) / (threshold - 2))) + 1).astype(np.int64)
+    starts, sizes = edges[:-1], np.diff(edges)
+
+    # Every bucket's average is fixed up front; only the anchor chains bucket to bucket.
+    # The last bucket looks ahead to the final point (plus any rounding leftover).
+    interior = slice(0, edges[-1])
+    next_x = np.append(np.add.reduceat(x[interior], starts)[1:] / sizes[1:], x[edges[-1]:].mean())
+    next_y = np.append(np.add.reduceat(y[interior], starts)[1:] / sizes[1:], y[edges[-1]:].mean())
+
+    width = int(sizes.max())
+    offsets = np.minimum(starts[:, None] + np.arange(width), n - 2)
+    bucket_x, bucket_y = x[offsets], y[offsets]
+    padding = np.arange(width) >= sizes[:, None]
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    anchor_x, anchor_y = x[0], y[0]
+    for bucket in range(threshold - 2):
+        area = np.abs((anchor_x - next_x[bucket]) * (bucket_y[bucket] - anchor_y)
+                      - (anchor_x - bucket_x[bucket]) * (next_y[bucket] - anchor_y))
+        area[padding[bucket]] = -1.0
+        best = offsets[bucket, int(area.argmax())]
+        selected[bucket + 1] = best
+        anchor_x, anchor_y = x[best], y[best]
+    return selected
+
+def downsample_line(series: pd.Series, width_px: int = FULL_WIDTH_PX) -> pd.Series:
+    """LTTB-reduced copy of a series for a line trace ``width_px`` wide"""
+    series = series.dropna()
+    threshold = line_points(width_px)
+    if len(series) <= threshold:
+        return series
+    positions = lttb_indices(_numeric_x(series.index), series.to_numpy(dtype=np.float64), threshold)
+    return series.iloc[positions]
+
+def aggregate_ohlc(prices: pd.DataFrame, buckets: int, volume: str = 'sum',
+                   extra: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """Merge consecutive bars into at most ``buckets`` OHLC bars
+
+    Each bucket is labelled with its first timestamp. ``volume`` is 'sum' for
+    total traded volume or 'mean' for the average bar volume (which keeps the
+    scale of daily volume averages plotted alongside). ``extra`` maps other
+    columns to 'first', 'last', 'mean', 'max' or 'min'.
+    """
+    n = len(prices)
+    if n <= buckets:
+        return prices
+    starts = np.linspace(0, n, buckets + 1).astype(np.int64)[:-1]
+    starts = np.unique(starts)
+    ends = np.append(starts[1:], n) - 1
+    sizes = np.diff(np.append(starts, n))
+
+    def column(name):
+        return prices[name].to_numpy(dtype=np.float64)
+
+    reducers = {
+        'first': lambda v: v[starts],
+        'last': lambda v: v[ends],
+        'max': lambda v: np.maximum.reduceat(v, starts),
+        'min': lambda v: np.minimum.reduceat(v, starts),
+        'sum': lambda v: np.add.reduceat(v, starts),
+        'mean': lambda v: np.add.reduceat(v, starts) / sizes,
+    }
+    rules = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': volume}
+    rules.update(extra or {})
+
+    data = {name: reducers[rule](column(name)) for name, rule in rules.items() if name in prices.columns}
+    return pd.DataFrame(data, index=prices.index[starts])
+
+def downsample_ohlc(prices: pd.DataFrame, width_px: int = FULL_WIDTH_PX, **kwargs) -> pd.DataFrame:
+    """OHLC bars reduced to what fits ``width_px`` as candles"""
+    return aggregate_ohlc(prices, candle_count(width_px), **kwargs)
+
+def _benchmark_figure(prices: pd.DataFrame, width_px: Optional[int]):
+    import plotly.graph_objects as go
+
+    bars = prices if width_px is None else downsample_ohlc(prices, width_px)
+    sma = prices['Close'].rolling(20).mean()
+    line = sma if width_px is None else downsample_line(sma, width_px)
+
+    fig = go.Figure()
+    fig.add_trace(go.Candlestick(x=bars.index, open=bars['Open'], high=bars['High'],
+                                 low=bars['Low'], close=bars['Close'], name='Price'))
+    fig.add_trace(go.Scatter(x=line.index, y=line, mode='lines', name='SMA 20'))
+    return fig
+
+def benchmark(prices: pd.DataFrame, width_px: int = FULL_WIDTH_PX, repeat: int = 3) -> Dict[str, Dict[str, float]]:
+    """Payload size and build + JSON time of a candlestick chart, full vs downsampled"""
+    results = {}
+    for label, width in (('full', None), ('downsampled', width_px)):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            payload = _benchmark_figure(prices, width).to_json()
+            timings.append(time.perf_counter() - start)
+        results[label] = {'bytes': len(payload.encode()), 'seconds': min(timings)}
+    return results
+
+def synthetic_prices(bars: int = 17_500, seed: int = 0) -> pd.DataFrame:
+    """Random-walk hourly OHLCV bars (about ten years of trading hours by default)"""
+    rng = np.random.default_rng(seed)
+    close = 30 * np.exp(np.cumsum(rng.normal(0, 0.004, bars)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.002, bars)) * close
+    index = pd.date_range('2015-01-02 09:30', periods=bars, freq='h')
+    return pd.DataFrame({'Open': open_, 'High': np.maximum(open_, close) + spread,
+                         'Low': np.minimum(open_, close) - spread, 'Close': close,
+                         'Volume': rng.integers(10_000, 500_000, bars)}, index=index)
+
+if __name__ == "__main__":
+    from src.data_store import read_frame
+
+    datasets = sys.argv[1:] or ['abx_daily_prices', 'yf_hourly_prices_1y', 'synthetic']
+    print(f"Candlestick + SMA line at {FULL_WIDTH_PX}px "
+          f"({candle_count(FULL_WIDTH_PX)} candles, {line_points(FULL_WIDTH_PX)} line points)")
+    for name in datasets:
+        prices = synthetic_prices() if name == 'synthetic' else read_frame(name)
+        if prices.empty:
+            print(f"{name}: no data, skipped")
+            continue
+        results = benchmark(prices)
+        full, reduced = results['full'], results['downsampled']
+        print(f"{name} ({len(prices)} bars)")
+        print(f"  full:        {full['bytes'] / 1024:8.1f} KB  {full['seconds'] * 1000:7.1f} ms")
+        print(f"  downsampled: {reduced['bytes'] / 1024:8.1f} KB  {reduced['seconds'] * 1000:7.1f} ms  "
+              f"({full['bytes'] / reduced['bytes']:.1f}x smaller)")
@@ -1,7 +1,11 @@
 import yfinance as yf
 import pandas as pd
 import os
+import json
 from datetime import datetime, timedelta
+from data_store import write_peer_prices
+from instrumentation import instrumented
+from peer_collector import clear_checkpoint, collect_concurrently, download_prices_batched
 
 class YFinanceCollector:
     """Backup data collector using Yahoo Finance"""
@@ -96,45 +100,56 @@ class YFinanceCollector:
             
         print("Yahoo Finance data collection completed!")
         
-    def collect_peer_data(self, peers=None):
-        """Collect peer comparison data"""
+    @instrumented('collect', dataset='yf_peer_analysis')
+    def collect_peer_data(self, peers=None, max_workers=16):
+        """Collect peer comparison data
+
+        Prices come from batched multi-symbol downloads and company info from
+        concurrent per-symbol requests with timeouts and retries; finished
+        symbols are checkpointed so an interrupted run resumes.
+        """
         if peers is None:
             peers = ['NEM', 'AEM', 'KGC', 'AU', 'EGO', 'GG', 'FNV']  # Major gold miners
+        checkpoint_path = "data/raw/yf_peer_analysis.checkpoint.jsonl"
             
-        peer_data = {}
+        # Price data (1 year), stored as a columnar file per peer as each batch lands.
+        # yf.download keeps module-level state, so batches run one at a time.
+        peer_prices, missing = download_prices_batched(
+            peers,
+            lambda symbols: yf.download(symbols, period="1y", group_by='ticker', auto_adjust=True,
+                                        actions=False, progress=False, timeout=30),
+            max_workers=1,
+            on_chunk=lambda frames: write_peer_prices('yf_peer_analysis', frames, merge=True)
+        )
+        for peer_symbol in missing:
+            print(f"No price data for peer: {peer_symbol}")
         
-        for peer_symbol in peers:
-            try:
-                print(f"Collecting data for peer: {peer_symbol}")
-                peer_ticker = yf.Ticker(peer_symbol)
-                
-                # Basic info
-                peer_info = peer_ticker.info
-                
-                # Price data (1 year)
-                peer_prices = peer_ticker.history(period="1y")
-                
-                # Key financial metrics from info
-                peer_data[peer_symbol] = {
-                    'info': peer_info,
-                    'prices': peer_prices.to_dict(),
-                    'market_cap': peer_info.get('marketCap', 0),
-                    'pe_ratio': peer_info.get('forwardPE', 0),
-                    'pb_ratio': peer_info.get('priceToBook', 0),
-                    'profit_margin': peer_info.get('profitMargins', 0),
-                    'revenue_growth': peer_info.get('revenueGrowth', 0),
-                    'debt_to_equity': peer_info.get('debtToEquity', 0)
-                }
-                
-            except Exception as e:
-                print(f"Error collecting data for {peer_symbol}: {e}")
-                continue
+        def collect_peer(peer_symbol):
+            print(f"Collecting data for peer: {peer_symbol}")
+            peer_info = yf.Ticker(peer_symbol).info
+            
+            # Key financial metrics from info
+            return {
+                'info': peer_info,
+                'market_cap': peer_info.get('marketCap', 0),
+                'pe_ratio': peer_info.get('forwardPE', 0),
+                'pb_ratio': peer_info.get('priceToBook', 0),
+                'profit_margin': peer_info.get('profitMargins', 0),
+                'revenue_growth': peer_info.get('revenueGrowth', 0),
+                'debt_to_equity': peer_info.get('debtToEquity', 0)
+            }
+            
+        peer_data, failures = collect_concurrently(
+            peers, collect_peer, max_workers=max_workers, checkpoint_path=checkpoint_path
+        )
+        for peer_symbol, error in failures.items():
+            print(f"Error collecting data for {peer_symbol}: {error}")
                 
         self._save_json(peer_data, "data/raw/yf_peer_analysis.json")
+        clear_checkpoint(checkpoint_path)
         
     def _save_json(self, data, filepath):
         """Save data as JSON with proper handling"""
-        import json
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         
         def json_serializer(obj):